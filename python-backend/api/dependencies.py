@@ -3,20 +3,22 @@ from typing import AsyncIterator
 
 from fastapi import Depends
 
-from config.database import get_db
-from models.providers.anthropic_provider import AnthropicProvider
-from models.providers.openrouter_provider import OpenRouterProvider
+from models.providers.base import ModelProvider
+from models.providers.factory import create_provider, get_model_provider  # noqa: F401 (route dependency)
 
 
 async def get_db_session():
     """Yield database session."""
+    # SQLAlchemy is only needed by routes that use the database
+    from config.database import get_db
+
     async for db in get_db():  # type: ignore[misc]
         yield db
 
 
-def get_anthropic_provider() -> AnthropicProvider:
-    return AnthropicProvider()
+def get_anthropic_provider() -> ModelProvider:
+    return create_provider("anthropic")
 
 
-def get_openrouter_provider() -> OpenRouterProvider:
-    return OpenRouterProvider()
+def get_openrouter_provider() -> ModelProvider:
+    return create_provider("openrouter")
@@ -1,12 +1,14 @@
 """Aggregate API routers."""
-from api.routes import upload, jira, grounding, compliance, monitoring, diagrams, ai
+from api.routes import upload, jira, grounding, compliance, monitoring, diagrams, ai, strategic, embeddings
 
 __all__ = [
     "upload",
     "jira",
     "grounding",
     "compliance",
+    "strategic",
     "monitoring",
     "diagrams",
     "ai",
+    "embeddings",
 ]
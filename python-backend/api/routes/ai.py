@@ -1,24 +1,64 @@
 """AI model management and listing endpoints."""
 from __future__ import annotations
 
-from fastapi import APIRouter
-from typing import Dict, Any, List
+import json
 
-from models.providers.anthropic_provider import AnthropicProvider
-from models.providers.openrouter_provider import OpenRouterProvider
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from typing import AsyncIterator, Dict, Any, List, Literal, Optional
+
+from models.agents.document_agent import DocumentAgent
+from models.agents.ticket_agent import TicketAgent
+from api.dependencies import get_anthropic_provider, get_model_provider, get_openrouter_provider
+from config.settings import settings
+from models.providers.base import ModelProvider
+from services.grounding_service import GroundingService
 
 router = APIRouter()
+grounding_service = GroundingService()
+
+
+class StreamRequest(BaseModel):
+    """Request body for streaming agent output."""
+    agent: Literal["ticket", "document"] = "ticket"
+    ticket: Optional[Dict[str, Any]] = None
+    sourceData: Optional[Dict[str, Any]] = None
+    content: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
+    model: Optional[str] = None
+
+
+_DEFAULT_ONLY_PROVIDERS = {
+    "router": {
+        "name": "Router",
+        "description": "Latency-aware routing across LLM_ROUTER_BACKENDS",
+    },
+    "local": {
+        "name": "Local",
+        "description": "Offline mock model",
+    },
+}
 
 
 @router.get("/models")
-async def list_models() -> Dict[str, Any]:
+async def list_models(
+    anthropic_provider: ModelProvider = Depends(get_anthropic_provider),
+    openrouter_provider: ModelProvider = Depends(get_openrouter_provider),
+    default_provider: ModelProvider = Depends(get_model_provider),
+) -> Dict[str, Any]:
     """Get available AI models from all providers.
 
+    Args:
+        anthropic_provider: Anthropic provider
+        openrouter_provider: OpenRouter provider
+        default_provider: Provider selected by settings.DEFAULT_MODEL_PROVIDER
+
     Returns:
         Dict with providers and their available models
     """
     models_dict = {
-        "defaultProvider": "anthropic",
+        "defaultProvider": settings.DEFAULT_MODEL_PROVIDER,
         "providers": {
             "anthropic": {
                 "name": "Anthropic",
@@ -39,7 +79,6 @@ async def list_models() -> Dict[str, Any]:
 
     # Fetch Anthropic models
     try:
-        anthropic_provider = AnthropicProvider()
         anthropic_models = await anthropic_provider.list_models()
         models_dict["models"]["anthropic"] = anthropic_models
     except Exception as e:
@@ -51,7 +90,6 @@ async def list_models() -> Dict[str, Any]:
 
     # Fetch OpenRouter models (try to get from API, fallback to static list)
     try:
-        openrouter_provider = OpenRouterProvider()
         openrouter_models = await openrouter_provider.list_models()
         models_dict["models"]["openrouter"] = openrouter_models[:10]  # Limit to top 10
     except Exception as e:
@@ -61,4 +99,55 @@ async def list_models() -> Dict[str, Any]:
             {"id": "meta-llama/llama-2-70b-chat", "name": "Llama 2 70B", "recommended": False},
         ]
 
+    # Router and local providers are listed only when they are the default
+    if settings.DEFAULT_MODEL_PROVIDER in _DEFAULT_ONLY_PROVIDERS:
+        name = settings.DEFAULT_MODEL_PROVIDER
+        models_dict["providers"][name] = {**_DEFAULT_ONLY_PROVIDERS[name], "configured": True}
+        try:
+            models_dict["models"][name] = await default_provider.list_models()
+        except Exception as e:
+            print(f"Failed to load {name} models: {str(e)}")
+            models_dict["models"][name] = []
+
     return models_dict
+
+
+@router.post("/stream")
+async def stream_agent(
+    request: StreamRequest,
+    provider: ModelProvider = Depends(get_model_provider),
+) -> StreamingResponse:
+    """Stream TicketAgent refinement or DocumentAgent summary output (SSE).
+
+    Args:
+        request: Agent to run and its input
+        provider: Model provider (settings.DEFAULT_MODEL_PROVIDER)
+
+    Returns:
+        text/event-stream of "delta" events with generated text, ending with
+        one "done" (or "error") event holding the processed ticket/summary
+    """
+    options = {"model": request.model} if request.model else {}
+    if request.agent == "ticket":
+        if not request.ticket:
+            raise HTTPException(status_code=400, detail="Ticket data required")
+        agent = TicketAgent(provider, grounding_service, **options)
+        events = agent.stream_ticket(request.ticket, request.sourceData)
+    else:
+        if not request.content:
+            raise HTTPException(status_code=400, detail="Document content required")
+        agent = DocumentAgent(provider, **options)
+        events = agent.stream_summary(request.content, request.metadata)
+
+    return StreamingResponse(
+        _sse(events),
+        media_type="text/event-stream",
+        # Proxies must not buffer the stream or the first token waits for the last
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _sse(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    """Format agent stream events as server-sent events."""
+    async for event in events:
+        yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
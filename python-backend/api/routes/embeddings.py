@@ -0,0 +1,36 @@
+"""Embedding lookup endpoints."""
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, Query
+from typing import Dict, Any
+
+from services.embedding_codec import EMBEDDING_FORMATS, decode_embedding, encode_embedding
+
+router = APIRouter()
+
+
+@router.get("/{handle}")
+def resolve_embedding(
+    handle: str,
+    format: str = Query("list", description="Output format: list, float32, float16 or int8"),
+) -> Dict[str, Any]:
+    """Resolve an "omit" embedding handle to its vector.
+
+    Declared sync so the SQLite lookup runs in the threadpool.
+
+    Args:
+        handle: Handle from an embedding payload with format "omit"
+        format: Encoding of the returned vector
+
+    Returns:
+        Handle, dimension and the encoded embedding
+    """
+    if format not in EMBEDDING_FORMATS or format == "omit":
+        raise HTTPException(status_code=400, detail=f"Unsupported embedding format: {format}")
+
+    try:
+        vector = decode_embedding({"format": "omit", "handle": handle})
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Embedding handle not found: {handle}")
+
+    return {"handle": handle, "dim": int(vector.size), "embedding": encode_embedding(vector, format)}
@@ -0,0 +1,50 @@
+"""Strategic analysis endpoints (PESTLE, SWOT, MoSCoW)."""
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from typing import Dict, Any, List, Optional
+
+from services.strategic_service import StrategicAnalysisService
+
+router = APIRouter()
+strategic_service = StrategicAnalysisService()
+
+
+class BatchAnalysisRequest(BaseModel):
+    """Request body for batch strategic analysis."""
+    tickets: Optional[List[Dict[str, Any]]] = None
+
+
+@router.post("/analyze")
+async def analyze_ticket(ticket: Dict[str, Any]) -> Dict[str, Any]:
+    """Run strategic analysis on a single ticket.
+
+    Args:
+        ticket: Ticket object to analyze
+
+    Returns:
+        Ticket enriched with `_strategic` metadata
+    """
+    if not ticket:
+        raise HTTPException(status_code=400, detail="Ticket data required")
+
+    return strategic_service.analyze_ticket(ticket)
+
+
+@router.post("/batch")
+async def analyze_batch(request: BatchAnalysisRequest) -> JSONResponse:
+    """Run strategic analysis on a ticket list with a project-level rollup.
+
+    Args:
+        request: Request with tickets
+
+    Returns:
+        Per-ticket analyses and project summary
+    """
+    if not request.tickets:
+        raise HTTPException(status_code=400, detail="Tickets required for analysis")
+
+    # Plain dicts only; skip jsonable_encoder on large batches
+    return JSONResponse(strategic_service.analyze_tickets(request.tickets))
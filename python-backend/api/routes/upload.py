@@ -1,33 +1,162 @@
 """Upload API endpoints for Excel and Word documents."""
 from __future__ import annotations
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-from fastapi.responses import JSONResponse
-from typing import Any, Dict
+import json
 
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from typing import Any, AsyncIterator, Dict
+
+from config.settings import settings
 from services.grounding_service import GroundingService
 from services.monitoring_service import MonitoringService
-from utils.file_handlers import process_excel_to_tickets
+from workers.upload_executor import UploadExecutor, UploadQueueFullError
 
 router = APIRouter()
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
 # Global service instances
 grounding_service = GroundingService()
 monitoring_service = MonitoringService()
+upload_executor = UploadExecutor(grounding_service=grounding_service)
+
+
+def _queue_full_error(session_id: str, error: UploadQueueFullError) -> HTTPException:
+    """Track a rejected upload and build the 503 response."""
+    monitoring_service.track_completion(session_id, {"success": False, "error": str(error)})
+    return HTTPException(status_code=503, detail=str(error), headers={"Retry-After": "5"})
+
+
+def _wants_ndjson(request: Request, stream: bool) -> bool:
+    """Check whether the client asked for an NDJSON ticket stream."""
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def _build_metadata(
+    session_id: str,
+    total_rows: int,
+    processed_count: int,
+    average_confidence: float,
+    column_indices: Dict[str, int],
+) -> Dict[str, Any]:
+    """Build the upload `_metadata` block."""
+    return {
+        "processedBy": "python-backend",
+        "fallback": False,
+        "agentHealthy": False,
+        "sessionId": session_id,
+        "totalRows": total_rows,
+        "processedCount": processed_count,
+        "averageConfidence": average_confidence,
+        "columnIndices": column_indices,
+    }
+
+
+async def _iter_ndjson_tickets(buffer: bytes, session_id: str) -> AsyncIterator[str]:
+    """Serialize tickets as NDJSON, one chunk per processed shard.
+
+    The final line is a ``{"_metadata": {...}}`` record. The executor job
+    slot is taken when iteration starts and released when the shards are
+    done; the workbook is parsed once, by the shard reader. Errors before
+    the first chunk (full queue, invalid workbook) propagate so the route
+    can still answer 503/400. Failures after that cannot change the status
+    code, so they are reported through an ``error`` key on the trailing
+    record instead.
+    """
+    total_rows = 0
+    processed_count = 0
+    confidence_total = 0.0
+    error = None
+    header: Dict[str, Any] = {}
+    started = False
+
+    upload_executor.acquire()
+    try:
+        async for shard in upload_executor.iter_shards(
+            buffer,
+            encode=True,
+            first_shard_rows=settings.EXCEL_STREAM_WINDOW,
+            header=header,
+        ):
+            total_rows += shard["total_rows"]
+            processed_count += shard["processed_count"]
+            confidence_total += shard["confidence_sum"]
+            if shard["lines"]:
+                started = True
+                yield "\n".join(shard["lines"]) + "\n"
+    except Exception:
+        if not started:
+            raise
+        error = "Failed to process file"
+    finally:
+        upload_executor.release()
+
+    avg_confidence = confidence_total / processed_count if processed_count else 0
+
+    if error:
+        monitoring_service.track_completion(session_id, {"success": False, "error": error})
+    else:
+        monitoring_service.track_completion(
+            session_id,
+            {
+                "success": True,
+                "ticketsEvaluated": processed_count,
+                "averageScore": avg_confidence,
+                "totalProcessed": processed_count,
+            },
+        )
+
+    metadata = _build_metadata(
+        session_id,
+        total_rows,
+        processed_count,
+        avg_confidence,
+        header.get("column_indices", {}),
+    )
+    metadata["streamed"] = True
+    if error:
+        metadata["error"] = error
+
+    yield json.dumps({"_metadata": metadata}, ensure_ascii=False) + "\n"
+
+
+async def _resume_stream(first_chunk: str, chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Yield an already awaited first chunk, then the rest of the stream.
+
+    Closing this iterator (e.g. on client disconnect) closes the ticket
+    stream too, which releases its executor job slot.
+    """
+    try:
+        yield first_chunk
+        async for chunk in chunks:
+            yield chunk
+    finally:
+        await chunks.aclose()
 
 
 @router.post("/")
-async def upload_excel(file: UploadFile = File(...)):
+async def upload_excel(
+    request: Request,
+    file: UploadFile = File(...),
+    stream: bool = Query(False, description="Stream tickets as NDJSON"),
+):
     """Process uploaded Excel file and return generated tickets.
 
     This endpoint handles Excel file uploads, parses them, validates tickets
     against the knowledge base, and returns ticket objects.
 
+    When the client sends ``Accept: application/x-ndjson`` or ``?stream=true``
+    the tickets are streamed as newline-delimited JSON while rows are being
+    grounded, followed by a trailing ``_metadata`` record.
+
     Args:
+        request: Incoming request (used for content negotiation)
         file: Excel file (.xlsx)
+        stream: Force NDJSON streaming response
 
     Returns:
-        JSON response with tickets and metadata
+        JSON response with tickets and metadata, or an NDJSON stream
     """
     if not file:
         raise HTTPException(status_code=400, detail="No file uploaded")
@@ -54,18 +183,37 @@ async def upload_excel(file: UploadFile = File(...)):
         }
     )
 
+    if _wants_ndjson(request, stream):
+        file_content = await file.read()
+        chunks = _iter_ndjson_tickets(file_content, session_id)
+        try:
+            # Take the job slot and parse up to the first tickets before
+            # committing to a 200 response
+            first_chunk = await chunks.__anext__()
+        except UploadQueueFullError as e:
+            raise _queue_full_error(session_id, e)
+        except Exception as e:
+            monitoring_service.track_completion(
+                session_id, {"success": False, "error": str(e)}
+            )
+            raise HTTPException(status_code=400, detail=str(e))
+
+        return StreamingResponse(
+            _resume_stream(first_chunk, chunks),
+            media_type=NDJSON_MEDIA_TYPE,
+        )
+
     try:
         # Read file content
         file_content = await file.read()
 
-        # Process Excel to tickets
-        result = process_excel_to_tickets(file_content, grounding_service, monitoring_service)
+        # Parse and ground in the worker pool; tickets come back JSON-encoded
+        result = await upload_executor.process(file_content, encode=True)
 
         # Calculate average confidence
         avg_confidence = (
-            sum(t.get("_grounding", {}).get("confidence", 0.8) for t in result["tickets"])
-            / len(result["tickets"])
-            if result["tickets"]
+            result["confidence_sum"] / result["processed_count"]
+            if result["processed_count"]
             else 0
         )
 
@@ -74,25 +222,30 @@ async def upload_excel(file: UploadFile = File(...)):
             session_id,
             {
                 "success": True,
-                "ticketsEvaluated": len(result["tickets"]),
+                "ticketsEvaluated": result["processed_count"],
                 "averageScore": avg_confidence,
                 "totalProcessed": result["processed_count"],
             },
         )
 
-        return {
-            "tickets": result["tickets"],
-            "_metadata": {
-                "processedBy": "python-backend",
-                "fallback": False,
-                "agentHealthy": False,
-                "sessionId": session_id,
-                "totalRows": result["total_rows"],
-                "processedCount": result["processed_count"],
-                "averageConfidence": avg_confidence,
-                "columnIndices": result["column_indices"],
-            },
-        }
+        metadata = _build_metadata(
+            session_id,
+            result["total_rows"],
+            result["processed_count"],
+            avg_confidence,
+            result["column_indices"],
+        )
+        body = (
+            '{"tickets":['
+            + ",".join(result["lines"])
+            + '],"_metadata":'
+            + json.dumps(metadata, ensure_ascii=False)
+            + "}"
+        )
+        return Response(content=body, media_type="application/json")
+
+    except UploadQueueFullError as e:
+        raise _queue_full_error(session_id, e)
 
     except ValueError as e:
         # Validation error
@@ -149,7 +302,7 @@ async def upload_document(file: UploadFile = File(...)):
 
         # Determine file type and process accordingly
         if file.filename.endswith(".xlsx") or file.content_type.startswith("application/vnd.openxmlformats-officedocument.spreadsheetml"):
-            result = process_excel_to_tickets(file_content, grounding_service)
+            result = await upload_executor.process(file_content)
             return {
                 "type": "excel",
                 "tickets": result["tickets"],
@@ -168,6 +321,9 @@ async def upload_document(file: UploadFile = File(...)):
         else:
             raise ValueError("Unsupported file format")
 
+    except UploadQueueFullError as e:
+        raise _queue_full_error(session_id, e)
+
     except Exception as e:
         monitoring_service.track_completion(
             session_id, {"success": False, "error": str(e)}
@@ -176,28 +332,40 @@ async def upload_document(file: UploadFile = File(...)):
 
 
 @router.post("/agent")
-async def upload_agent(file: UploadFile = File(...)):
+async def upload_agent(
+    request: Request,
+    file: UploadFile = File(...),
+    stream: bool = Query(False, description="Stream tickets as NDJSON"),
+):
     """Process file using AI agent (placeholder for future ML integration).
 
     Currently returns same result as /api/upload. Future: integrate with LLM.
 
     Args:
+        request: Incoming request
         file: Excel file
+        stream: Force NDJSON streaming response
 
     Returns:
         Agent-processed tickets
     """
-    return await upload_excel(file)
+    return await upload_excel(request, file, stream)
 
 
 @router.post("/rule-based")
-async def upload_rule_based(file: UploadFile = File(...)):
+async def upload_rule_based(
+    request: Request,
+    file: UploadFile = File(...),
+    stream: bool = Query(False, description="Stream tickets as NDJSON"),
+):
     """Process file using only rule-based validation (no AI).
 
     Args:
+        request: Incoming request
         file: Excel file
+        stream: Force NDJSON streaming response
 
     Returns:
         Rule-based processed tickets
     """
-    return await upload_excel(file)
+    return await upload_excel(request, file, stream)
@@ -0,0 +1,83 @@
+"""Benchmark stakeholder entity resolution: exact all-pairs vs LSH candidates.
+
+Each synthetic person appears under one to four name variants ("Anna Kovacs",
+"A. Kovacs", "akovacs@corp", "anna.kovacs@corp"). Reports time and the share
+of the exact resolver's merges that the LSH resolver also makes.
+
+Usage (from python-backend/):
+    python -m benchmarks.bench_entity_resolution [sizes...]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+from typing import Dict, List, Set, Tuple
+
+from services.entity_resolution import EntityResolver
+
+SYLLABLES = ["an", "na", "ko", "vacs", "pe", "ter", "sza", "bo", "to", "th", "var", "ga", "mi", "ra", "lo", "zso"]
+
+
+def build_profiles(people: int, seed: int = 5) -> List[Dict]:
+    """Profiles for people with unique first/last names and random variants."""
+    rng = random.Random(seed)
+    seen: Set[Tuple[str, str]] = set()
+    profiles = []
+    while len(seen) < people:
+        first = "".join(rng.choices(SYLLABLES, k=2))
+        last = "".join(rng.choices(SYLLABLES, k=3))
+        if (first, last) in seen:
+            continue
+        seen.add((first, last))
+        variants = [
+            f"{first.title()} {last.title()}",
+            f"{first[0].upper()}. {last.title()}",
+            f"{first[0]}{last}@corp",
+            f"{first}.{last}@corp",
+        ]
+        for name in rng.sample(variants, rng.randint(1, 4)):
+            index = len(profiles)
+            profiles.append(
+                {
+                    "id": name.lower(),
+                    "name": name,
+                    "originalNames": [name],
+                    "mentions": [{"index": index, "snippet": name, "snippetOffsets": [0, len(name)]}],
+                    "assignments": [],
+                    "roles": [],
+                }
+            )
+    return profiles
+
+
+def merged_pairs(clusters: List[List[int]]) -> Set[Tuple[int, int]]:
+    return {(a, b) for cluster in clusters for i, a in enumerate(cluster) for b in cluster[i + 1:]}
+
+
+def run(people: int) -> None:
+    profiles = build_profiles(people)
+    count = len(profiles)
+
+    lsh = EntityResolver(exact_limit=0)
+    started = time.perf_counter()
+    lsh_pairs = merged_pairs(lsh.find_clusters(profiles))
+    lsh_time = time.perf_counter() - started
+    line = (
+        f"{count:>7} profiles | LSH {lsh_time:6.2f}s, {lsh.last_stats['candidatePairs']:>9} candidate pairs"
+    )
+
+    if count <= 20_000:
+        exact = EntityResolver(exact_limit=count)
+        started = time.perf_counter()
+        exact_pairs = merged_pairs(exact.find_clusters(profiles))
+        exact_time = time.perf_counter() - started
+        recall = len(lsh_pairs & exact_pairs) / max(1, len(exact_pairs))
+        line += f" | exact {exact_time:6.2f}s, {count * (count - 1) // 2:>10} pairs | recall {recall:.3f}"
+    print(line)
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 4_000, 20_000]
+    for size in sizes:
+        run(size)
@@ -0,0 +1,62 @@
+"""Benchmark per-ticket vs batch grounding validation.
+
+Usage (from python-backend/):
+    python -m benchmarks.bench_grounding [sizes...]
+"""
+from __future__ import annotations
+
+import sys
+import time
+from typing import Any, Dict, List
+
+from services.grounding_service import GroundingService
+
+ASSIGNEES = [f"User {i}" for i in range(30)] + ["j.doe@corp.com", "Team Alpha", "Unassigned"]
+EPICS = ["Smart Meter Rollout", "MVM-12", "Billing", "No Epic"]
+PRIORITIES = ["Critical", "High", "Medium", "Low", "Magas"]
+
+
+def build_tickets(count: int) -> List[Dict[str, Any]]:
+    """Generate tickets with the value repetition seen in real backlogs."""
+    return [
+        {
+            "id": f"MVM-{1001 + i}",
+            "summary": f"As a customer I want report number {i} to be exported",
+            "description": "User Story: detailed acceptance and review of the reporting timeline",
+            "priority": PRIORITIES[i % len(PRIORITIES)],
+            "assignee": ASSIGNEES[i % len(ASSIGNEES)],
+            "epic": EPICS[i % len(EPICS)],
+            "acceptanceCriteria": ["Dashboard renders", "CSV export works"],
+            "type": "Story",
+        }
+        for i in range(count)
+    ]
+
+
+def run(count: int) -> None:
+    service = GroundingService()
+    tickets = build_tickets(count)
+    sources = [{"rowIndex": i} for i in range(count)]
+
+    # Keep results alive in both runs so GC pressure is comparable
+    started = time.perf_counter()
+    results = [service.validate_ticket(ticket, source) for ticket, source in zip(tickets, sources)]
+    single = time.perf_counter() - started
+    del results
+
+    started = time.perf_counter()
+    results = service.validate_tickets(tickets, sources)
+    batch = time.perf_counter() - started
+    del results
+
+    print(
+        f"{count:>7} tickets | per-ticket {single:6.2f}s ({count / single:8.0f}/s)"
+        f" | batch {batch:6.2f}s ({count / batch:8.0f}/s) | speedup {single / batch:4.2f}x"
+    )
+    assert batch < single, f"batch validation is not faster than per-ticket at {count} tickets"
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    for size in sizes:
+        run(size)
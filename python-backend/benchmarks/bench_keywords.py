@@ -0,0 +1,129 @@
+"""Microbenchmark keyword scoring: per-keyword scans vs compiled matching.
+
+Measures compliance area matching alone, then all tables registered with the
+shared keyword index (compliance, strategic, stakeholder) against the
+per-table loops they replaced.
+
+Usage (from python-backend/):
+    python -m benchmarks.bench_keywords [contexts]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+from typing import Callable, Dict, List
+
+from services.compliance_service import ComplianceService
+from services import keyword_index as keyword_index_module
+from services.keyword_index import KeywordIndex, KeywordMatcher, keyword_index
+from services.stakeholder_service import StakeholderService
+from services.strategic_service import StrategicAnalysisService
+
+TABLES = {
+    "compliance.areas": ComplianceService.COMPLIANCE_AREAS,
+    "strategic.pestle": StrategicAnalysisService.PESTLE_KEYWORDS,
+    "strategic.swot": StrategicAnalysisService.SWOT_KEYWORDS,
+    "strategic.moscow": StrategicAnalysisService.MOSCOW_KEYWORDS,
+    "stakeholder.power": StakeholderService.POWER_KEYWORDS,
+    "stakeholder.interest": StakeholderService.INTEREST_KEYWORDS,
+}
+
+# Roughly one word in eight is a compliance keyword
+FILLER = (
+    "as a customer i want the smart meter billing export to show my monthly "
+    "consumption in the portal so that invoice totals can be checked against "
+    "readings the dashboard should load quickly and support csv downloads"
+).split()
+KEYWORDS = (
+    "report documentation review risk issue schedule deadline testing "
+    "stakeholder notify scope acceptance criteria validation timeline milestone"
+).split()
+WORDS = FILLER * 3 + KEYWORDS
+
+
+def build_contexts(count: int, seed: int = 7) -> List[str]:
+    """Generate lowercased ticket contexts of 20-120 words."""
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(WORDS, k=rng.randint(20, 120))) for _ in range(count)]
+
+
+def reference_counts(context: str) -> Dict[str, int]:
+    """Per-keyword substring scans, as evaluate_ticket did before."""
+    return {
+        area: sum(1 for kw in keywords if kw in context)
+        for area, keywords in ComplianceService.COMPLIANCE_AREAS.items()
+    }
+
+
+def reference_all_tables(context: str) -> Dict[str, Dict[str, int]]:
+    """One `kw in context` loop per table, as the services did before."""
+    return {
+        name: {category: sum(1 for kw in keywords if kw in context) for category, keywords in table.items()}
+        for name, table in TABLES.items()
+    }
+
+
+def time_it(label: str, func: Callable[[str], Dict[str, int]], contexts: List[str]) -> float:
+    started = time.perf_counter()
+    for context in contexts:
+        func(context)
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<22} {elapsed:6.3f}s ({len(contexts) / elapsed:9.0f} contexts/s)")
+    return elapsed
+
+
+def run(count: int) -> None:
+    contexts = build_contexts(count)
+    automaton = KeywordMatcher(ComplianceService.COMPLIANCE_AREAS)
+    fallback = KeywordMatcher(ComplianceService.COMPLIANCE_AREAS)
+    fallback._automaton = None
+
+    for context in contexts[:1000]:
+        expected = reference_counts(context)
+        assert automaton.count(context) == expected
+        assert fallback.count(context) == expected
+
+    print(f"{count} contexts")
+    time_it("per-keyword scans", reference_counts, contexts)
+    if automaton._automaton is not None:
+        time_it("matcher (automaton)", automaton.count, contexts)
+    time_it("matcher (plain scan)", fallback.count, contexts)
+
+    # All registered tables; scan cache disabled so every context is scanned
+    index = KeywordIndex(cache_size=0)
+    for name in keyword_index.tables():
+        index.register(name, TABLES[name])
+
+    def index_counts(context: str) -> Dict[str, Dict[str, int]]:
+        scan = index.scan(context)
+        return {name: scan.count(name) for name in TABLES}
+
+    for context in contexts[:1000]:
+        assert index_counts(context) == reference_all_tables(context)
+
+    print(f"{count} contexts, {len(TABLES)} tables")
+    time_it("per-table loops", reference_all_tables, contexts)
+    time_it("shared index", index_counts, contexts)
+
+    if keyword_index_module.HAS_AHOCORASICK:
+        # The same tables as they are matched without pyahocorasick installed
+        keyword_index_module.HAS_AHOCORASICK = False
+        try:
+            plain = KeywordIndex(cache_size=0)
+            for name in keyword_index.tables():
+                plain.register(name, TABLES[name])
+            plain.scan("")
+        finally:
+            keyword_index_module.HAS_AHOCORASICK = True
+
+        def plain_counts(context: str) -> Dict[str, Dict[str, int]]:
+            scan = plain.scan(context)
+            return {name: scan.count(name) for name in TABLES}
+
+        time_it("shared index (plain)", plain_counts, contexts)
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [50_000]
+    for size in sizes:
+        run(size)
@@ -0,0 +1,79 @@
+"""Load-test TicketAgent and BAWorkflow offline with the local provider.
+
+Every model call goes to LocalProvider (log-normal latency, optional error
+rate), so concurrency, packing and workflow overhead can be measured on a
+laptop without API keys or network. BAWorkflow runs only if langgraph is
+installed.
+
+Usage (from python-backend/):
+    python -m benchmarks.bench_local_load [tickets] [latency_ms] [error_rate]
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from typing import Any, Dict, List
+
+from models.agents.ticket_agent import TicketAgent
+from models.providers.local_provider import LocalProvider
+from models.providers.rate_limit import RateLimiter
+from services.compliance_service import ComplianceService
+from services.grounding_service import GroundingService
+
+try:
+    from models.workflow import BAWorkflow
+    HAS_LANGGRAPH = True
+except ImportError:
+    HAS_LANGGRAPH = False
+
+
+def make_tickets(count: int) -> List[Dict[str, Any]]:
+    return [
+        {"id": f"LOAD-{i}", "summary": f"Checkout improvement {i}", "priority": "Medium", "type": "Task"}
+        for i in range(count)
+    ]
+
+
+def make_agent(latency_ms: float, error_rate: float) -> TicketAgent:
+    provider = LocalProvider(latency_ms=latency_ms, error_rate=error_rate, seed=7)
+    return TicketAgent(provider, GroundingService(), rate_limiter=RateLimiter(), use_cache=False)
+
+
+async def run(count: int, latency_ms: float, error_rate: float) -> None:
+    tickets = make_tickets(count)
+    print(f"{count} tickets, median latency {latency_ms:.0f} ms, error rate {error_rate:.0%}")
+
+    for concurrency, packed in ((1, False), (8, False), (32, False), (8, True)):
+        agent = make_agent(latency_ms, error_rate)
+        started = time.perf_counter()
+        result = await agent.batch_process_tickets(tickets, max_concurrency=concurrency, packed=packed)
+        elapsed = time.perf_counter() - started
+        label = f"concurrency {concurrency}" + (" packed" if packed else "")
+        print(
+            f"  TicketAgent {label:<20} {elapsed:6.2f} s  calls {agent.provider.request_count:4d}  "
+            f"enhanced {result['enhanced']}/{count}"
+        )
+
+    if not HAS_LANGGRAPH:
+        print("  BAWorkflow: skipped (langgraph not installed)")
+        return
+
+    workflow = BAWorkflow(ticket_agent=make_agent(latency_ms, error_rate), compliance_service=ComplianceService())
+    started = time.perf_counter()
+    state = await workflow.run(tickets)
+    print(
+        f"  BAWorkflow {'':<21} {time.perf_counter() - started:6.2f} s  "
+        f"refined {len(state.get('refined_tickets', []))}/{count}"
+    )
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    latency_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 200.0
+    error_rate = float(sys.argv[3]) if len(sys.argv) > 3 else 0.02
+    asyncio.run(run(count, latency_ms, error_rate))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark stakeholder name extraction: per-pattern findall vs NameExtractor.
+
+Usage (from python-backend/):
+    python -m benchmarks.bench_names [sizes...]
+"""
+from __future__ import annotations
+
+import random
+import re
+import sys
+import time
+from typing import List, Set
+
+from benchmarks.bench_keywords import build_contexts
+from services.stakeholder_service import StakeholderService
+
+FIRST = ["Anna", "Peter", "Eva", "Gabor", "Zsofia", "Laszlo", "Maria", "John"]
+LAST = ["Kovacs", "Nagy", "Szabo", "Toth", "Horvath", "Smith", "Varga"]
+TEMPLATES = [
+    "Assigned to: {name}",
+    "reviewed by: {name}",
+    "Approved by: {name} and the Billing Team",
+    "mentioned {name} in the Steering Committee",
+    "Owner: {user}",
+    "{name} asked for a Quick Fix",
+]
+
+
+def build_texts(count: int, seed: int = 3) -> List[str]:
+    """Ticket contexts with names, trigger phrases and capitalized noise."""
+    rng = random.Random(seed)
+    texts = []
+    for context in build_contexts(count, seed):
+        name = f"{rng.choice(FIRST)} {rng.choice(LAST)}"
+        phrases = [
+            template.format(name=name, user=name.lower().replace(" ", "_"))
+            for template in rng.sample(TEMPLATES, 2)
+        ]
+        texts.append(f"{context[:300]}. {'. '.join(phrases)}. {context[300:]}")
+    return texts
+
+
+GENERIC_NAMES = StakeholderService.GENERIC_NAMES
+
+
+def legacy_extract_names(text: str) -> List[str]:
+    """The extractor before NameExtractor (per-pattern findall)."""
+    candidates: Set[str] = set()
+    for pattern in StakeholderService.EXTRACTION_PATTERNS:
+        for match in pattern.findall(text):
+            normalized = match.strip().lower().replace("_", " ")
+            if normalized.lower() not in GENERIC_NAMES and len(normalized.split()) <= 3:
+                candidates.add(normalized)
+
+    name_pattern = re.compile(r"([A-Z][a-z]+\s+[A-Z][a-z]+)")
+    for match in name_pattern.findall(text):
+        normalized = match.strip().lower().replace("_", " ")
+        if normalized.lower() not in GENERIC_NAMES:
+            candidates.add(normalized)
+    return list(candidates)
+
+
+def legacy_snippets(text: str) -> None:
+    """Legacy extraction plus the per-name lowercase/find snippet lookup."""
+    lower_text = None
+    for name in legacy_extract_names(text):
+        lower_text = text.lower()
+        idx = lower_text.find(name.lower())
+        if idx == -1:
+            text[:100]
+        else:
+            text[max(0, idx - 30):idx + len(name) + 30].strip()
+
+
+def run(count: int) -> None:
+    service = StakeholderService.__new__(StakeholderService)
+    service.extraction_patterns = StakeholderService.EXTRACTION_PATTERNS
+    service.name_extractor = StakeholderService(nlp_pipeline=object()).name_extractor
+    texts = build_texts(count)
+
+    for text in texts[:2000]:
+        assert set(service._extract_names_from_text(text)) == set(legacy_extract_names(text))
+
+    started = time.perf_counter()
+    for text in texts:
+        legacy_snippets(text)
+    legacy = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for text in texts:
+        for name, span in service._extract_name_spans(text).items():
+            service._get_snippet_span(text, name, span)
+    engine = time.perf_counter() - started
+
+    print(
+        f"{count:>7} tickets | per-pattern findall + find {legacy:6.2f}s"
+        f" | NameExtractor {engine:6.2f}s | speedup {legacy / engine:4.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000]
+    for size in sizes:
+        run(size)
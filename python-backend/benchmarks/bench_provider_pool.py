@@ -0,0 +1,108 @@
+"""Benchmark per-call httpx clients vs the pooled provider client.
+
+Starts a local HTTPS server (self-signed certificate via the openssl CLI) that
+answers like a model API after a fixed delay, then issues sequential POSTs
+with a fresh AsyncClient per call (the old provider code) and with one
+long-lived client using the pool's limits. Remote APIs add network RTTs to
+every handshake, so real savings are larger.
+
+Usage (from python-backend/):
+    python -m benchmarks.bench_provider_pool [requests] [delay_ms]
+"""
+from __future__ import annotations
+
+import asyncio
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+import httpx
+
+from models.providers.http_pool import ProviderClientPool
+
+BODY = b'{"content":[{"text":"{}"}],"usage":{"input_tokens":1,"output_tokens":1}}'
+
+
+def make_certificate(directory: Path) -> ssl.SSLContext:
+    cert, key = directory / "cert.pem", directory / "key.pem"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-keyout", str(key), "-out", str(cert),
+         "-days", "1", "-subj", "/CN=localhost"],
+        check=True,
+        capture_output=True,
+    )
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert, key)
+    return context
+
+
+async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, delay: float) -> None:
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            await asyncio.sleep(delay)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                + f"Content-Length: {len(BODY)}\r\n\r\n".encode()
+                + BODY
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError, ssl.SSLError):
+        pass
+    finally:
+        writer.close()
+
+
+async def timed_posts(url: str, count: int, client: httpx.AsyncClient | None) -> List[float]:
+    latencies = []
+    for _ in range(count):
+        started = time.perf_counter()
+        if client is None:
+            async with httpx.AsyncClient(verify=False) as fresh:
+                await fresh.post(url, json={"prompt": "hi"})
+        else:
+            await client.post(url, json={"prompt": "hi"})
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+async def run(count: int, delay_ms: float) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        context = make_certificate(Path(directory))
+        server = await asyncio.start_server(
+            lambda r, w: handle(r, w, delay_ms / 1000), "127.0.0.1", 0, ssl=context
+        )
+        port = server.sockets[0].getsockname()[1]
+        url = f"https://127.0.0.1:{port}/v1/messages"
+
+        per_call = await timed_posts(url, count, None)
+        pool = ProviderClientPool()
+        async with httpx.AsyncClient(verify=False, limits=pool.limits) as pooled_client:
+            pooled = await timed_posts(url, count, pooled_client)
+
+        server.close()
+        await server.wait_closed()
+
+    for label, values in (("client per call", per_call), ("pooled client", pooled)):
+        ordered = sorted(values)
+        print(
+            f"  {label:<16} p50 {statistics.median(values):6.2f} ms"
+            f"  p95 {ordered[int(len(ordered) * 0.95) - 1]:6.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    delay = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    print(f"{requests} sequential HTTPS requests, {delay} ms server time")
+    asyncio.run(run(requests, delay))
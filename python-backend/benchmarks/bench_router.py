@@ -0,0 +1,94 @@
+"""Benchmark tail latency of one provider vs the hedging router.
+
+Two simulated backends answer with a log-normal latency (median ~50 ms) and a
+slow tail: a fraction of calls take ~1 s, as when an upstream request gets
+queued. Calls go to a single backend, to the router without hedging, and to
+the router with hedging at the backend's p95.
+
+Usage (from python-backend/):
+    python -m benchmarks.bench_router [calls] [slow_fraction]
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import statistics
+import sys
+import time
+from typing import List
+
+from models.providers.base import ModelProvider
+from models.providers.router_provider import RouterProvider, RouteTarget
+
+
+class SimulatedBackend(ModelProvider):
+    def __init__(self, name: str, median: float, slow_fraction: float, seed: int):
+        super().__init__(api_key="bench")
+        self.pool_name = name
+        self.median = median
+        self.slow_fraction = slow_fraction
+        self.random = random.Random(seed)
+        self.calls = 0
+
+    async def inference(self, prompt, model, system_prompt=None, max_tokens=4000, temperature=0.7, **kwargs):
+        self.calls += 1
+        delay = self.median * self.random.lognormvariate(0, 0.25)
+        if self.random.random() < self.slow_fraction:
+            delay += 1.0
+        await asyncio.sleep(delay)
+        return {"content": "{}", "usage": {}, "model": model}
+
+    async def list_models(self):
+        return []
+
+    async def health_check(self):
+        return True
+
+
+async def measure(provider: ModelProvider, calls: int, concurrency: int = 16) -> List[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await provider.inference("prompt", "model")
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one() for _ in range(calls)))
+    return latencies
+
+
+def report(label: str, latencies: List[float], upstream_calls: int) -> None:
+    ordered = sorted(latencies)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000  # noqa: E731
+    print(
+        f"{label:<16} p50 {pick(0.5):6.1f} ms  p95 {pick(0.95):6.1f} ms  p99 {pick(0.99):6.1f} ms  "
+        f"mean {statistics.mean(latencies) * 1000:6.1f} ms  upstream calls {upstream_calls}"
+    )
+
+
+async def run(calls: int, slow_fraction: float) -> None:
+    def backends():
+        return [SimulatedBackend("a", 0.05, slow_fraction, 1), SimulatedBackend("b", 0.06, slow_fraction, 2)]
+
+    single = backends()[0]
+    report("single provider", await measure(single, calls), single.calls)
+
+    for label, hedge in (("router", False), ("router + hedge", True)):
+        pair = backends()
+        router = RouterProvider([RouteTarget(b) for b in pair], hedge=hedge, hedge_min_samples=20)
+        report(label, await measure(router, calls), sum(b.calls for b in pair))
+        if hedge:
+            stats = router.get_stats()
+            print(f"{'':<16} hedges {stats['hedges']}, won by runner-up {stats['hedge_wins']}")
+
+
+def main() -> None:
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    slow_fraction = float(sys.argv[2]) if len(sys.argv) > 2 else 0.03
+    asyncio.run(run(calls, slow_fraction))
+
+
+if __name__ == "__main__":
+    main()
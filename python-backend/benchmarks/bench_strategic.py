@@ -0,0 +1,66 @@
+"""Benchmark per-ticket vs batch strategic analysis.
+
+Usage (from python-backend/):
+    python -m benchmarks.bench_strategic [sizes...]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+from benchmarks.bench_keywords import build_contexts
+from services.strategic_service import StrategicAnalysisService
+
+STRATEGIC_PHRASES = [
+    "budget and roi review",
+    "gdpr compliance for the customer platform",
+    "risk of competitor entry",
+    "market growth opportunity",
+    "must have for go-live",
+    "nice to have enhancement",
+    "api integration with the billing system",
+    "carbon emissions reporting",
+]
+PRIORITIES = ["Critical", "High", "Medium", "Low"]
+
+
+def build_tickets(count: int, seed: int = 11) -> List[Dict[str, Any]]:
+    """Generate tickets with distinct descriptions and mixed strategic phrases."""
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"MVM-{1001 + i}",
+            "summary": f"Ticket {i}: {rng.choice(STRATEGIC_PHRASES)}",
+            "description": f"{context} {' '.join(rng.sample(STRATEGIC_PHRASES, 2))}",
+            "priority": rng.choice(PRIORITIES),
+            "type": "Story",
+        }
+        for i, context in enumerate(build_contexts(count, seed))
+    ]
+
+
+def run(count: int) -> None:
+    service = StrategicAnalysisService()
+    tickets = build_tickets(count)
+
+    started = time.perf_counter()
+    results = [service.analyze_ticket(ticket) for ticket in tickets]
+    single = time.perf_counter() - started
+    del results
+
+    started = time.perf_counter()
+    results = service.analyze_tickets(tickets)
+    batch = time.perf_counter() - started
+
+    print(
+        f"{count:>7} tickets | per-ticket {single:6.2f}s | batch {batch:6.2f}s"
+        f" ({results['summary']['distinctAnalyses']} distinct analyses) | speedup {single / batch:4.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [50_000]
+    for size in sizes:
+        run(size)
@@ -0,0 +1,100 @@
+"""Benchmark time-to-first-byte of buffered vs streamed ticket refinement.
+
+A mock transport stands in for the Anthropic Messages API. It emits the first
+token after a fixed latency and then one token per interval, either buffered
+into one JSON body (inference) or as server-sent events (stream_inference).
+TicketAgent.process_ticket returns only after the whole generation, while
+TicketAgent.stream_ticket yields the first delta after the first token.
+
+Usage (from python-backend/):
+    python -m benchmarks.bench_streaming [tokens] [first_token_ms] [token_ms]
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import time
+
+import httpx
+
+from models.agents.ticket_agent import TicketAgent
+from models.providers.anthropic_provider import AnthropicProvider
+from models.providers.rate_limit import RateLimiter
+from services.grounding_service import GroundingService
+
+REFINED = {
+    "id": "MVM-1",
+    "summary": "Refine checkout flow",
+    "description": "Customers complete checkout with saved payment methods",
+    "priority": "High",
+    "type": "Story",
+    "acceptanceCriteria": ["Saved cards are listed", "Payment succeeds"],
+}
+
+
+def make_transport(tokens: int, first_token: float, per_token: float) -> httpx.MockTransport:
+    text = json.dumps(REFINED)
+    size = max(1, len(text) // tokens)
+    pieces = [text[i:i + size] for i in range(0, len(text), size)]
+
+    async def stream():
+        await asyncio.sleep(first_token)
+        for index, piece in enumerate(pieces):
+            if index:
+                await asyncio.sleep(per_token)
+            event = {"type": "content_block_delta", "delta": {"type": "text_delta", "text": piece}}
+            yield f"event: content_block_delta\ndata: {json.dumps(event)}\n\n".encode()
+        yield b'event: message_delta\ndata: {"type": "message_delta", "delta": {"stop_reason": "end_turn"}, "usage": {"output_tokens": 1}}\n\n'
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if json.loads(request.content).get("stream"):
+            return httpx.Response(200, content=stream(), headers={"content-type": "text/event-stream"})
+        await asyncio.sleep(first_token + per_token * (len(pieces) - 1))
+        return httpx.Response(200, json={
+            "content": [{"text": text}],
+            "usage": {"input_tokens": 1, "output_tokens": len(pieces)},
+            "stop_reason": "end_turn",
+        })
+
+    return httpx.MockTransport(handler)
+
+
+async def run(tokens: int, first_token: float, per_token: float) -> None:
+    client = httpx.AsyncClient(transport=make_transport(tokens, first_token, per_token))
+    provider = AnthropicProvider(api_key="bench")
+    provider._client = lambda: client
+    ticket = {"id": "MVM-1", "summary": "Checkout", "priority": "Low"}
+
+    def agent() -> TicketAgent:
+        return TicketAgent(provider, GroundingService(), rate_limiter=RateLimiter(), use_cache=False)
+
+    started = time.perf_counter()
+    buffered = await agent().process_ticket(ticket)
+    buffered_total = time.perf_counter() - started
+
+    started = time.perf_counter()
+    first = None
+    async for event in agent().stream_ticket(ticket):
+        if first is None and event["type"] == "delta":
+            first = time.perf_counter() - started
+        if event["type"] == "done":
+            streamed = event["ticket"]
+    streamed_total = time.perf_counter() - started
+    await client.aclose()
+
+    assert buffered["summary"] == streamed["summary"] == REFINED["summary"]
+    print(f"{tokens} tokens, first token {first_token * 1000:.0f} ms, {per_token * 1000:.0f} ms/token")
+    print(f"  buffered: first byte {buffered_total * 1000:7.1f} ms  total {buffered_total * 1000:7.1f} ms")
+    print(f"  streamed: first byte {first * 1000:7.1f} ms  total {streamed_total * 1000:7.1f} ms")
+
+
+def main() -> None:
+    tokens = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    first_token = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.4
+    per_token = float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 0.02
+    asyncio.run(run(tokens, first_token, per_token))
+
+
+if __name__ == "__main__":
+    main()
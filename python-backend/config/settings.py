@@ -16,6 +16,7 @@ class Settings(BaseSettings):
     APP_NAME: str = "BA AI Demo API"
     APP_VERSION: str = "2.0.0"
     DEBUG: bool = False
+    APP_URL: str = Field(default="http://localhost:5000", description="Public app URL (sent to OpenRouter as HTTP-Referer)")
 
     # Paths
     PUBLIC_DIR: str = Field(default="../public", description="Public directory path (relative to python-backend)")
@@ -32,7 +33,41 @@ class Settings(BaseSettings):
     # AI Providers
     ANTHROPIC_API_KEY: str | None = None
     OPENROUTER_API_KEY: str | None = None
-    DEFAULT_MODEL_PROVIDER: str = "anthropic"
+    DEFAULT_MODEL_PROVIDER: str = Field(default="anthropic", description="anthropic, openrouter, router or local (offline mock)")
+    LLM_ROUTER_BACKENDS: List[str] = Field(
+        default_factory=lambda: ["anthropic", "openrouter:anthropic/claude-3.5-sonnet"],
+        description='Backends of the "router" provider as provider[:model], in preference order',
+    )
+    LLM_ROUTER_WINDOW: int = Field(default=100, description="Recent latencies kept per router backend")
+    LLM_ROUTER_MAX_FAILURES: int = Field(default=3, description="Consecutive errors before a router backend cools down")
+    LLM_ROUTER_COOLDOWN: float = Field(default=30.0, description="Seconds a failing router backend is skipped")
+    LLM_HEDGE_ENABLED: bool = Field(default=True, description="Send a hedged duplicate request when a backend exceeds its latency quantile")
+    LLM_HEDGE_QUANTILE: float = Field(default=0.95, description="Backend latency quantile after which a request is hedged")
+    LLM_HEDGE_MIN_SAMPLES: int = Field(default=20, description="Latencies a backend needs before its requests are hedged")
+
+    # Model provider HTTP connection pool
+    LLM_HTTP_MAX_CONNECTIONS: int = Field(default=100, description="Open connections per provider client")
+    LLM_HTTP_MAX_KEEPALIVE: int = Field(default=20, description="Idle keep-alive connections kept per provider client")
+    LLM_HTTP_KEEPALIVE_EXPIRY: float = Field(default=30.0, description="Seconds an idle provider connection is kept open")
+    LLM_RATE_LIMIT_RPM: int = Field(default=0, description="Provider requests per minute across all agents (0 = unlimited)")
+    LLM_RATE_LIMIT_TPM: int = Field(default=0, description="Provider input+output tokens per minute (0 = unlimited)")
+    LLM_MODEL_INFO_TTL: float = Field(default=3600.0, description="Seconds model limits fetched from a provider are reused by all agents (0 = no expiry)")
+    AGENT_CONTEXT_MAX_TOKENS: int = Field(default=0, description="Most tokens of context data sent with an agent task (0 = what the model's context window leaves)")
+    TICKET_AGENT_MAX_CONCURRENCY: int = Field(default=8, description="Tickets refined concurrently by TicketAgent.batch_process_tickets")
+    TICKET_AGENT_PACKED: bool = Field(default=False, description="Refine several tickets per model call in batch_process_tickets")
+    TICKET_AGENT_MAX_PACK: int = Field(default=20, description="Most tickets refined in one packed model call")
+    TICKET_AGENT_PACK_OUTPUT_TOKENS: int = Field(default=400, description="Output tokens reserved per ticket in a packed call")
+    LOCAL_LLM_LATENCY_MS: float = Field(default=200.0, description="Median latency of the local mock provider")
+    LOCAL_LLM_LATENCY_SIGMA: float = Field(default=0.3, description="Log-normal spread of the local mock latency (0 = constant)")
+    LOCAL_LLM_ERROR_RATE: float = Field(default=0.0, description="Share of local mock calls that fail")
+    LOCAL_LLM_OUTPUT_TOKENS: int | None = Field(default=None, description="Output tokens reported by the local mock (unset = count generated text)")
+    LOCAL_LLM_SEED: int = Field(default=0, description="Seed of the local mock's latency and error draws")
+    LLM_COALESCE_ENABLED: bool = Field(default=True, description="Share one upstream request between identical concurrent model calls")
+    LLM_CACHE_ENABLED: bool = Field(default=True, description="Serve repeated model requests from the response cache")
+    LLM_CACHE_SIZE: int = Field(default=5000, description="Model responses kept in the in-memory LRU")
+    LLM_CACHE_TTL: float = Field(default=86400.0, description="Seconds a cached model response stays valid (0 = no expiry)")
+    LLM_CACHE_PATH: str | None = Field(default=None, description="SQLite file for persistent response cache (disabled if unset)")
+    LLM_HTTP2: bool = Field(default=False, description="Negotiate HTTP/2 with providers (requires h2)")
 
     # Jira OAuth
     JIRA_BASE_URL: str = "https://your-domain.atlassian.net"
@@ -45,6 +80,39 @@ class Settings(BaseSettings):
     # Monitoring
     PROMETHEUS_METRICS_ENABLED: bool = True
 
+    # Excel ingestion
+    EXCEL_STREAM_WINDOW: int = Field(default=500, description="Rows materialized at once when streaming Excel uploads")
+
+    # Grounding
+    GROUNDING_FORMAT_CACHE_SIZE: int = Field(default=4096, description="Distinct assignee/epic values whose format check is cached per worker")
+
+    # NLP pipeline
+    NLP_NER_BATCH_SIZE: int = Field(default=64, description="Texts per spaCy nlp.pipe batch")
+    NLP_NER_N_PROCESS: int = Field(default=1, description="spaCy nlp.pipe worker processes")
+    SENTIMENT_CACHE_SIZE: int = Field(default=50000, description="Tickets whose VADER scores are cached")
+    NLP_WARMUP_ON_STARTUP: bool = Field(default=False, description="Load NLP models in a background thread at startup (readiness waits for it)")
+
+    EMBEDDING_BATCH_SIZE: int = Field(default=64, description="Texts per sentence-transformers encode batch")
+    EMBEDDING_CACHE_SIZE: int = Field(default=20000, description="Embeddings kept in the in-memory LRU")
+    EMBEDDING_FORMAT: str = Field(default="list", description="Embedding output format: list, float32, float16, int8 or omit (needs EMBEDDING_CACHE_PATH)")
+    EMBEDDING_CACHE_PATH: str | None = Field(default=None, description="SQLite file for persistent embedding cache (disabled if unset)")
+
+    # Stakeholder entity resolution
+    ENTITY_RESOLUTION_ENABLED: bool = Field(default=True, description="Merge near-duplicate stakeholder profiles")
+    ENTITY_RESOLUTION_NAME_THRESHOLD: float = Field(default=0.6, description="Minimum name embedding cosine similarity for a merge")
+    ENTITY_RESOLUTION_CONTEXT_THRESHOLD: float = Field(default=0.2, description="Minimum context embedding cosine similarity for a merge")
+    ENTITY_RESOLUTION_LSH_TABLES: int = Field(default=16, description="LSH hash tables used for candidate pairs")
+    ENTITY_RESOLUTION_EXACT_LIMIT: int = Field(default=2000, description="Profile count up to which all pairs are compared exactly")
+
+    # Keyword scoring
+    KEYWORD_SCAN_CACHE_SIZE: int = Field(default=1024, description="Distinct texts whose keyword scans are cached per worker")
+
+    # Upload executor
+    UPLOAD_EXECUTOR_MODE: str = Field(default="process", description="Upload worker pool type: process or thread")
+    UPLOAD_EXECUTOR_WORKERS: int = Field(default=0, description="Upload worker pool size (0 = CPU count)")
+    UPLOAD_SHARD_ROWS: int = Field(default=10000, description="Data rows per upload shard")
+    UPLOAD_MAX_PENDING_JOBS: int = Field(default=4, description="Uploads admitted at once before returning 503")
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
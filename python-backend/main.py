@@ -1,15 +1,36 @@
 # FastAPI application entry point
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from config.settings import settings
-from api.routes import upload, jira, grounding, compliance, monitoring, diagrams, ai
+from api.routes import upload, jira, grounding, compliance, monitoring, diagrams, ai, strategic, embeddings
+from models.providers.http_pool import provider_client_pool
+from services.model_registry import model_registry
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup/shutdown hooks."""
+    if settings.NLP_WARMUP_ON_STARTUP:
+        # Registers the default NLP models; importing it loads no model
+        import services.nlp_pipeline  # noqa: F401
+
+        model_registry.warm_up()
+    provider_client_pool.start(["anthropic", "openrouter"])
+    yield
+    await provider_client_pool.aclose()
+    upload.upload_executor.shutdown()
+
 
 app = FastAPI(
     title="BA AI Demo API",
     version="2.0.0",
-    description="Python FastAPI Backend - Microservices Architecture"
+    description="Python FastAPI Backend - Microservices Architecture",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -26,9 +47,11 @@ app.include_router(upload.router, prefix="/api/upload", tags=["upload"])
 app.include_router(jira.router, prefix="/api/jira", tags=["jira"])
 app.include_router(grounding.router, prefix="/api/grounding", tags=["grounding"])
 app.include_router(compliance.router, prefix="/api/compliance", tags=["compliance"])
+app.include_router(strategic.router, prefix="/api/strategic", tags=["strategic"])
 app.include_router(monitoring.router, prefix="/api/monitoring", tags=["monitoring"])
 app.include_router(diagrams.router, prefix="/api/diagrams", tags=["diagrams"])
 app.include_router(ai.router, prefix="/api/ai", tags=["ai"])
+app.include_router(embeddings.router, prefix="/api/embeddings", tags=["embeddings"])
 
 # Static files (optional, for compatibility with existing public assets)
 import os
@@ -43,5 +66,13 @@ async def health_check():
     return {
         "status": "OK",
         "version": "2.0.0",
-        "backend": "python"
+        "backend": "python",
+        "modelsReady": model_registry.is_ready(),
     }
+
+
+@app.get("/api/health/ready", tags=["health"])
+async def readiness_check():
+    """Readiness probe: 503 until background model warm-up has settled."""
+    status = model_registry.get_status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
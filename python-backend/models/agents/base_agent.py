@@ -1,17 +1,31 @@
 """Base agent class for LLM-powered agents."""
 from __future__ import annotations
 
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime
-import json
 
+from config.settings import settings
+from models.agents.prompt_compaction import fit_to_budget, serialize
 from models.providers.base import ModelProvider
+from models.providers.rate_limit import RateLimiter, estimate_tokens, get_rate_limiter, usage_tokens
+from models.providers.response_cache import ResponseCache, get_response_cache, response_key
+
+# Model limits assumed when the provider does not report them
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# Limits reported by providers, shared by all agents since agents and providers
+# are created per request: (pool name, model) -> (expires at, context window, output limit)
+_model_limits: Dict[Tuple[str, str], Tuple[float, Optional[int], Optional[int]]] = {}
 
 
 class BaseAgent(ABC):
     """Abstract base class for AI agents."""
 
+    # Dotted field paths left out of a context kwarg, by kwarg name
+    CONTEXT_OMIT: Dict[str, Tuple[str, ...]] = {}
+
     def __init__(
         self,
         name: str,
@@ -19,6 +33,9 @@ class BaseAgent(ABC):
         model: str = "claude-3-5-sonnet-20241022",
         temperature: float = 0.7,
         max_tokens: int = 4000,
+        rate_limiter: Optional[RateLimiter] = None,
+        response_cache: Optional[ResponseCache] = None,
+        use_cache: bool = True,
     ):
         """Initialize base agent.
 
@@ -28,12 +45,23 @@ class BaseAgent(ABC):
             model: Model ID to use
             temperature: Sampling temperature
             max_tokens: Maximum output tokens
+            rate_limiter: Request/token limiter (defaults to the one shared
+                by all agents using this provider; a disabled one when the
+                provider charges its upstream calls itself, e.g. the router)
+            response_cache: Cache of model responses (defaults to the shared
+                one; None when LLM_CACHE_ENABLED is off)
+            use_cache: Serve repeated requests from the cache
         """
         self.name = name
         self.provider = provider
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
+        if rate_limiter is None:
+            rate_limiter = RateLimiter() if provider.rate_limits_upstream else get_rate_limiter(provider.pool_name)
+        self.rate_limiter = rate_limiter
+        self.response_cache = response_cache if response_cache is not None else get_response_cache()
+        self.use_cache = use_cache
         self.execution_history: List[Dict[str, Any]] = []
         self.created_at = datetime.utcnow()
 
@@ -47,96 +75,257 @@ class BaseAgent(ABC):
         """
         return f"You are a helpful AI assistant named {self.name}."
 
-    def _build_context(self, **kwargs) -> str:
+    def _build_context(self, task: str = "", token_budget: Optional[int] = None, **kwargs) -> str:
         """Build context string from kwargs.
 
+        Values are pruned (empty fields, metadata timestamps/versions and the
+        agent's CONTEXT_OMIT paths are dropped) and serialized as compact
+        JSON. Values already contained verbatim in the task are skipped.
+
         Args:
+            task: Task prompt the context is prepended to
+            token_budget: Tokens the context may use (None = unlimited)
             **kwargs: Context data
 
         Returns:
             Formatted context string
         """
-        if not kwargs:
-            return ""
-
-        context_lines = ["## Context:\n"]
+        sections: Dict[str, str] = {}
         for key, value in kwargs.items():
-            if isinstance(value, (dict, list)):
-                context_lines.append(f"{key}: {json.dumps(value, indent=2)}")
-            else:
-                context_lines.append(f"{key}: {str(value)}")
+            text = serialize(value, self.CONTEXT_OMIT.get(key, ()))
+            if text is not None and text not in task:
+                sections[key] = text
+
+        header = "## Context:\n"
+        if token_budget is not None:
+            # Header and the blank line separating the context from the task
+            overhead = estimate_tokens(f"{header}\n\n\n")
+            sections = fit_to_budget(sections, max(0, token_budget - overhead))
+        if not sections:
+            return ""
 
+        context_lines = [header]
+        context_lines.extend(f"{key}: {text}" for key, text in sections.items())
         return "\n".join(context_lines)
 
     async def execute_task(
         self,
         task: str,
+        max_tokens: Optional[int] = None,
+        use_cache: Optional[bool] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """Execute a task.
 
         Args:
             task: Task description/prompt
+            max_tokens: Output token limit for this call (defaults to the agent's)
+            use_cache: Look the request up in the response cache (defaults to
+                the agent's use_cache); False forces a fresh call whose
+                result still refreshes the cache
             **kwargs: Additional context
 
         Returns:
             Result dict with output, model info, usage stats
         """
         try:
-            # Build full prompt
-            context = self._build_context(**kwargs)
-            full_prompt = f"{context}\n\n{task}" if context else task
-
-            # Get system prompt
-            system_prompt = self._get_system_prompt()
-
-            # Call model
-            response = await self.provider.inference(
-                prompt=full_prompt,
-                model=self.model,
-                system_prompt=system_prompt,
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-            )
-
-            # Validate output
-            validated = await self._validate_output(response)
-
-            # Track execution
-            execution_record = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "task": task,
-                "model": self.model,
-                "status": "success" if validated["valid"] else "partial",
-                "usage": response.get("usage", {}),
-                "errors": validated.get("errors", []),
-            }
-            self.execution_history.append(execution_record)
-
-            return {
-                "success": validated["valid"],
-                "output": response.get("content", ""),
-                "validation": validated,
-                "usage": response.get("usage", {}),
-                "model": self.model,
-                "timestamp": datetime.utcnow().isoformat(),
-            }
+            system_prompt, full_prompt, max_tokens = await self._prepare_task(task, max_tokens, **kwargs)
+            cache_key, response = self._cached_response(system_prompt, full_prompt, max_tokens, use_cache)
+            cached = response is not None
+
+            if not cached:
+                # Call model once the provider's rate budget allows it
+                estimated = estimate_tokens(system_prompt, full_prompt) + max_tokens
+                await self.rate_limiter.acquire(estimated)
+                response = await self.provider.inference(
+                    prompt=full_prompt,
+                    model=self.model,
+                    system_prompt=system_prompt,
+                    max_tokens=max_tokens,
+                    temperature=self.temperature,
+                )
+                self._record_usage(estimated, response.get("usage", {}))
+
+            return await self._complete_task(task, response, cache_key, cached)
 
         except Exception as e:
-            execution_record = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "task": task,
-                "status": "error",
-                "error": str(e),
-            }
-            self.execution_history.append(execution_record)
-
-            return {
-                "success": False,
-                "output": "",
-                "error": str(e),
-                "timestamp": datetime.utcnow().isoformat(),
-            }
+            return self._fail_task(task, e)
+
+    async def stream_task(
+        self,
+        task: str,
+        max_tokens: Optional[int] = None,
+        use_cache: Optional[bool] = None,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Execute a task, yielding model output as it is generated.
+
+        Args:
+            task: Task description/prompt
+            max_tokens: Output token limit for this call (defaults to the agent's)
+            use_cache: Look the request up in the response cache (see execute_task)
+            **kwargs: Additional context
+
+        Yields:
+            {"type": "delta", "text": ...} per output chunk (a cached response
+            arrives as one delta), then one {"type": "done", ...} carrying the
+            execute_task() result, or {"type": "error", ...} on failure
+        """
+        try:
+            system_prompt, full_prompt, max_tokens = await self._prepare_task(task, max_tokens, **kwargs)
+            cache_key, response = self._cached_response(system_prompt, full_prompt, max_tokens, use_cache)
+            cached = response is not None
+
+            if cached:
+                yield {"type": "delta", "text": response.get("content", "")}
+            else:
+                estimated = estimate_tokens(system_prompt, full_prompt) + max_tokens
+                await self.rate_limiter.acquire(estimated)
+                chunks: List[str] = []
+                done: Dict[str, Any] = {}
+                async for event in self.provider.stream_inference(
+                    prompt=full_prompt,
+                    model=self.model,
+                    system_prompt=system_prompt,
+                    max_tokens=max_tokens,
+                    temperature=self.temperature,
+                ):
+                    if event["type"] == "delta":
+                        chunks.append(event["text"])
+                        yield event
+                    elif event["type"] == "done":
+                        done = event
+                response = {
+                    "content": "".join(chunks),
+                    "usage": done.get("usage", {}),
+                    "model": done.get("model", self.model),
+                    "finish_reason": done.get("finish_reason"),
+                }
+                self._record_usage(estimated, response["usage"])
+
+            result = await self._complete_task(task, response, cache_key, cached)
+            yield {"type": "done", **result}
+
+        except Exception as e:
+            yield {"type": "error", **self._fail_task(task, e)}
+
+    async def _prepare_task(self, task: str, max_tokens: Optional[int], **kwargs) -> Tuple[str, str, int]:
+        """System prompt, full prompt and output limit of a task.
+
+        The context gets what is left of the model's context window after
+        the system prompt, the task and the output limit (capped by
+        settings.AGENT_CONTEXT_MAX_TOKENS).
+        """
+        system_prompt = self._get_system_prompt()
+        max_tokens = max_tokens or self.max_tokens
+        context_window, _ = await self._model_limits()
+        budget = context_window - max_tokens - estimate_tokens(system_prompt, task)
+        if settings.AGENT_CONTEXT_MAX_TOKENS:
+            budget = min(budget, settings.AGENT_CONTEXT_MAX_TOKENS)
+
+        context = self._build_context(task=task, token_budget=budget, **kwargs)
+        full_prompt = f"{context}\n\n{task}" if context else task
+        return system_prompt, full_prompt, max_tokens
+
+    async def _model_limits(self) -> Tuple[int, int]:
+        """Context window and output limit of the agent's model.
+
+        Looked up from the provider's model list at most once per
+        settings.LLM_MODEL_INFO_TTL for each provider and model; defaults
+        apply when the provider does not report them or the lookup fails.
+        """
+        key = (self.provider.pool_name, self.model)
+        now = time.monotonic()
+        entry = _model_limits.get(key)
+        if entry is None or (settings.LLM_MODEL_INFO_TTL and entry[0] <= now):
+            try:
+                info = await self.provider.get_model_info(self.model) or {}
+                entry = (now + settings.LLM_MODEL_INFO_TTL, info.get("context_window"), info.get("max_output_tokens"))
+                _model_limits[key] = entry
+            except Exception:
+                # Keep stale limits (or defaults) without caching; the next task retries
+                if entry is None:
+                    return DEFAULT_CONTEXT_WINDOW, self.max_tokens
+
+        return entry[1] or DEFAULT_CONTEXT_WINDOW, entry[2] or self.max_tokens
+
+    def _cached_response(
+        self,
+        system_prompt: str,
+        full_prompt: str,
+        max_tokens: int,
+        use_cache: Optional[bool],
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """Cache key of a request and its cached response, if any."""
+        if self.response_cache is None:
+            return None, None
+        cache_key = response_key(
+            self.provider.pool_name, self.model, system_prompt, full_prompt, self.temperature, max_tokens
+        )
+        if not (self.use_cache if use_cache is None else use_cache):
+            return cache_key, None
+        return cache_key, self.response_cache.get(cache_key)
+
+    def _record_usage(self, estimated: int, usage: Dict[str, Any]) -> None:
+        """Correct the rate limiter's token budget with the real usage."""
+        self.rate_limiter.record(estimated, usage_tokens(usage))
+
+    async def _complete_task(
+        self,
+        task: str,
+        response: Dict[str, Any],
+        cache_key: Optional[str],
+        cached: bool,
+    ) -> Dict[str, Any]:
+        """Validate a response, cache it and record the execution.
+
+        Returns:
+            Result dict with output, model info, usage stats
+        """
+        validated = await self._validate_output(response)
+
+        # Only responses that passed validation are worth replaying
+        if cache_key is not None and not cached and validated["valid"]:
+            self.response_cache.put(cache_key, response)
+
+        # Track execution
+        execution_record = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "task": task,
+            "model": self.model,
+            "status": "success" if validated["valid"] else "partial",
+            "usage": response.get("usage", {}),
+            "cached": cached,
+            "errors": validated.get("errors", []),
+        }
+        self.execution_history.append(execution_record)
+
+        return {
+            "success": validated["valid"],
+            "output": response.get("content", ""),
+            "validation": validated,
+            "usage": response.get("usage", {}),
+            "cached": cached,
+            "model": self.model,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+    def _fail_task(self, task: str, error: Exception) -> Dict[str, Any]:
+        """Record a failed execution and build its result."""
+        execution_record = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "task": task,
+            "status": "error",
+            "error": str(error),
+        }
+        self.execution_history.append(execution_record)
+
+        return {
+            "success": False,
+            "output": "",
+            "error": str(error),
+            "timestamp": datetime.utcnow().isoformat(),
+        }
 
     @abstractmethod
     async def _validate_output(self, response: Dict[str, Any]) -> Dict[str, Any]:
@@ -194,4 +383,17 @@ class BaseAgent(ABC):
                 successful / total_executions if total_executions > 0 else 0
             ),
             "provider_stats": self.provider.get_stats(),
+            "rate_limiter": self.rate_limiter.get_stats(),
+            "response_cache": self._cache_stats(),
+        }
+
+    def _cache_stats(self) -> Dict[str, Any]:
+        """Cache hits of this agent plus the shared cache's statistics."""
+        model_calls = [e for e in self.execution_history if "cached" in e]
+        agent_hits = sum(1 for e in model_calls if e["cached"])
+        return {
+            "enabled": self.response_cache is not None,
+            "agentHits": agent_hits,
+            "agentHitRate": round(agent_hits / len(model_calls), 4) if model_calls else 0.0,
+            "cache": self.response_cache.get_stats() if self.response_cache is not None else None,
         }
@@ -2,21 +2,32 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional
 
 from models.agents.base_agent import BaseAgent
 from models.providers.base import ModelProvider
+from models.providers.rate_limit import RateLimiter
+from models.providers.response_cache import ResponseCache
 
 
 class DocumentAgent(BaseAgent):
     """Agent that summarizes documents and extracts action items."""
 
+    SUMMARY_TASK = (
+        "Analyze the following document and respond with JSON containing "
+        "the keys: summary (string), risks (array of strings), "
+        "recommendations (array of strings)."
+    )
+
     def __init__(
         self,
         provider: ModelProvider,
         model: str = "claude-3-5-haiku-20241022",
         temperature: float = 0.4,
         max_tokens: int = 1500,
+        rate_limiter: Optional[RateLimiter] = None,
+        response_cache: Optional[ResponseCache] = None,
+        use_cache: bool = True,
     ) -> None:
         super().__init__(
             name="DocumentAgent",
@@ -24,6 +35,9 @@ class DocumentAgent(BaseAgent):
             model=model,
             temperature=temperature,
             max_tokens=max_tokens,
+            rate_limiter=rate_limiter,
+            response_cache=response_cache,
+            use_cache=use_cache,
         )
 
     def _get_system_prompt(self) -> str:
@@ -48,18 +62,39 @@ class DocumentAgent(BaseAgent):
                 "ai_enhanced": False,
             }
 
-        task = (
-            "Analyze the following document and respond with JSON containing "
-            "the keys: summary (string), risks (array of strings), "
-            "recommendations (array of strings)."
-        )
-
         result = await self.execute_task(
-            task,
+            self.SUMMARY_TASK,
             document=content[:8000],
             metadata=metadata or {},
         )
+        return self._summary_result(result, content, metadata)
+
+    async def stream_summary(
+        self,
+        content: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Summarize a document, yielding model output as it is generated.
+
+        The final "done" or "error" event also carries the "summary" that
+        summarize_document() would return.
+        """
+        async for event in self.stream_task(
+            self.SUMMARY_TASK,
+            document=content[:8000],
+            metadata=metadata or {},
+        ):
+            if event["type"] != "delta":
+                event["summary"] = self._summary_result(event, content, metadata)
+            yield event
 
+    def _summary_result(
+        self,
+        result: Dict[str, Any],
+        content: str,
+        metadata: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Summary dict from a summarization task result."""
         if not result.get("success"):
             return {
                 "summary": content[:280],
@@ -0,0 +1,102 @@
+"""Compact serialization of agent prompt context.
+
+Agents pass tickets, validation results and metadata to the model as JSON.
+Pretty-printing, empty fields and bookkeeping metadata (timestamps, versions)
+cost input tokens without telling the model anything, so context is pruned
+and serialized without whitespace, and trimmed when it would not fit the
+model's context window.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Iterable, Optional
+
+from models.providers.rate_limit import estimate_tokens
+
+# Bookkeeping keys dropped inside "_"-prefixed metadata such as _grounding
+METADATA_NOISE = frozenset({"timestamp", "version"})
+
+TRUNCATION_MARKER = "…[truncated]"
+
+
+def compact_json(value: Any) -> str:
+    """Serialize value as JSON without insignificant whitespace."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def prune(value: Any, omit: Iterable[str] = (), _metadata: bool = False) -> Any:
+    """Copy of value without empty fields, metadata noise and omitted paths.
+
+    Args:
+        value: JSON-like value (dicts, lists, scalars)
+        omit: Dotted key paths to drop, e.g. "compliance.areas"; paths reach
+            through lists of dicts
+        _metadata: Whether value sits inside "_"-prefixed metadata
+
+    Returns:
+        Pruned copy (None and empty strings, lists and dicts are dropped
+        from dicts and lists)
+    """
+    omit = list(omit)
+    if isinstance(value, dict):
+        pruned: Dict[str, Any] = {}
+        for key, item in value.items():
+            if key in omit or (_metadata and key in METADATA_NOISE):
+                continue
+            nested = [path[len(key) + 1:] for path in omit if path.startswith(f"{key}.")]
+            item = prune(item, nested, _metadata or str(key).startswith("_"))
+            if not _is_empty(item):
+                pruned[key] = item
+        return pruned
+    if isinstance(value, (list, tuple)):
+        items = [prune(item, omit, _metadata) for item in value]
+        return [item for item in items if not _is_empty(item)]
+    return value
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or (isinstance(value, (str, list, dict)) and not value)
+
+
+def fit_to_budget(sections: Dict[str, str], token_budget: int) -> Dict[str, str]:
+    """Trim sections so their estimated total fits token_budget.
+
+    The longest section is cut first, so short fields (ids, scores) survive
+    and a long document loses its tail. Sections that cannot keep anything
+    useful are dropped.
+
+    Args:
+        sections: Serialized context values by name, in prompt order
+        token_budget: Tokens the sections may use
+
+    Returns:
+        Sections in the same order, trimmed or dropped to fit
+    """
+    trimmed = dict(sections)
+    sizes = {name: _section_tokens(name, text) for name, text in trimmed.items()}
+
+    while trimmed and sum(sizes.values()) > token_budget:
+        name = max(trimmed, key=lambda n: sizes[n])
+        target = sizes[name] - (sum(sizes.values()) - token_budget)
+        keep_chars = target * 4 - len(name) - len(TRUNCATION_MARKER) - 8
+        text = trimmed[name][:keep_chars] + TRUNCATION_MARKER if keep_chars >= 16 else ""
+        if not text or _section_tokens(name, text) >= sizes[name]:
+            del trimmed[name], sizes[name]
+        else:
+            trimmed[name] = text
+            sizes[name] = _section_tokens(name, text)
+
+    return trimmed
+
+
+def _section_tokens(name: str, text: str) -> int:
+    return estimate_tokens(f"{name}: {text}\n")
+
+
+def serialize(value: Any, omit: Iterable[str] = ()) -> Optional[str]:
+    """Pruned, compact text of a context value (None if nothing is left)."""
+    if isinstance(value, (dict, list, tuple)):
+        value = prune(value, omit)
+        return compact_json(value) if value else None
+    text = str(value) if value is not None else ""
+    return text or None
@@ -1,17 +1,52 @@
 """TicketAgent for ML-powered ticket refinement and validation."""
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
 import json
 
+from config.settings import settings
 from models.agents.base_agent import BaseAgent
+from models.agents.prompt_compaction import compact_json, prune
 from models.providers.base import ModelProvider
+from models.providers.rate_limit import RateLimiter, estimate_tokens
+from models.providers.response_cache import ResponseCache
 from services.grounding_service import GroundingService
 
 
+REFINED_TICKET_SCHEMA = """{{
+  "id": "Ticket ID (keep original if valid, suggest if not)",
+  "summary": "Clear, concise title (10-50 chars recommended)",
+  "description": "Detailed description with business context and requirements",
+  "priority": "One of: Critical, High, Medium, Low",
+  "type": "One of: Bug, Feature, Enhancement, Task, Story, Epic",
+  "assignee": "Suggested assignee if identifiable, or 'Unassigned'",
+  "epic": "Epic name or 'No Epic'",
+  "acceptanceCriteria": ["Testable criteria as a list"],
+  "stakeholders": ["List of identified stakeholders"],
+  "estimatedEffort": "XS/S/M/L/XL (if estimable)"{extra}
+}}"""
+
+PACKED_TICKET_SCHEMA = REFINED_TICKET_SCHEMA.format(
+    extra=',\n  "ref": "The ref of the ticket being refined, unchanged"'
+)
+
+
 class TicketAgent(BaseAgent):
     """Agent specialized in ticket processing and refinement."""
 
+    # Issues and warnings are listed in the refinement prompt itself, and
+    # the per-area coverage repeats the compliance gaps
+    CONTEXT_OMIT = {
+        "validation_feedback": (
+            "issues",
+            "warnings",
+            "sources",
+            "compliance.areas",
+            "compliance.recommendations.impact",
+        ),
+    }
+
     def __init__(
         self,
         provider: ModelProvider,
@@ -19,6 +54,9 @@ class TicketAgent(BaseAgent):
         model: str = "claude-3-5-sonnet-20241022",
         temperature: float = 0.5,
         max_tokens: int = 2000,
+        rate_limiter: Optional[RateLimiter] = None,
+        response_cache: Optional[ResponseCache] = None,
+        use_cache: bool = True,
     ):
         """Initialize TicketAgent.
 
@@ -28,6 +66,9 @@ class TicketAgent(BaseAgent):
             model: Model ID to use
             temperature: Lower temperature for consistency (0.5)
             max_tokens: Max output tokens (2000)
+            rate_limiter: Optional request/token limiter (provider's shared one by default)
+            response_cache: Optional response cache (shared one by default)
+            use_cache: Serve repeated requests from the cache
         """
         super().__init__(
             name="TicketAgent",
@@ -35,6 +76,9 @@ class TicketAgent(BaseAgent):
             model=model,
             temperature=temperature,
             max_tokens=max_tokens,
+            rate_limiter=rate_limiter,
+            response_cache=response_cache,
+            use_cache=use_cache,
         )
         self.grounding_service = grounding_service
 
@@ -90,31 +134,62 @@ Always respond with valid JSON containing the refined ticket structure."""
             validation_feedback=rule_validation,
         )
 
-        if result["success"]:
-            try:
-                # Parse AI response
-                refined = json.loads(result["output"])
+        return self._refined_ticket(result, ticket, rule_validation, source_data)
 
-                # Validate refined ticket
-                refined_validation = self.grounding_service.validate_ticket(
-                    refined, source_data or {}
-                )
+    async def stream_ticket(
+        self,
+        ticket: Dict[str, Any],
+        source_data: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Refine a ticket, yielding model output as it is generated.
 
-                # Merge with grounding
-                enhanced = self.grounding_service.enhance_with_grounding(
-                    refined, source_data or {}
-                )
+        Args:
+            ticket: Original ticket dict
+            source_data: Optional source data for context
 
-                enhanced["_refinement"] = {
-                    "ai_enhanced": True,
-                    "original_confidence": rule_validation["confidence"],
-                    "refined_confidence": refined_validation["confidence"],
-                    "improvements": refined_validation.get("warnings", []),
-                }
+        Yields:
+            Stream events from stream_task(); the final "done" or "error"
+            event also carries the processed "ticket"
+        """
+        rule_validation = self.grounding_service.validate_ticket(
+            ticket, source_data or {}
+        )
+        refinement_prompt = self._build_refinement_prompt(ticket, rule_validation)
 
-                return enhanced
+        async for event in self.stream_task(
+            refinement_prompt,
+            original_ticket=ticket,
+            validation_feedback=rule_validation,
+        ):
+            if event["type"] != "delta":
+                event["ticket"] = self._refined_ticket(event, ticket, rule_validation, source_data)
+            yield event
 
-            except json.JSONDecodeError as e:
+    def _refined_ticket(
+        self,
+        result: Dict[str, Any],
+        ticket: Dict[str, Any],
+        rule_validation: Dict[str, Any],
+        source_data: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Processed ticket from a refinement task result.
+
+        Args:
+            result: execute_task() result
+            ticket: Original ticket dict
+            rule_validation: Rule-based validation of the original ticket
+            source_data: Optional source data
+
+        Returns:
+            Refined ticket, or the rule-based result if the model call failed
+        """
+        if result["success"]:
+            try:
+                # Parse AI response
+                refined = json.loads(result["output"])
+                return self._finalize_refinement(refined, rule_validation, source_data)
+
+            except json.JSONDecodeError:
                 # Fallback to rule-based if AI output is invalid
                 return self.grounding_service.enhance_with_grounding(
                     ticket, source_data or {}
@@ -125,6 +200,41 @@ Always respond with valid JSON containing the refined ticket structure."""
                 ticket, source_data or {}
             )
 
+    def _finalize_refinement(
+        self,
+        refined: Dict[str, Any],
+        rule_validation: Dict[str, Any],
+        source_data: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Ground a refined ticket and attach refinement metadata.
+
+        Args:
+            refined: Ticket returned by the model
+            rule_validation: Rule-based validation of the original ticket
+            source_data: Optional source data
+
+        Returns:
+            Enhanced ticket
+        """
+        # Validate refined ticket
+        refined_validation = self.grounding_service.validate_ticket(
+            refined, source_data or {}
+        )
+
+        # Merge with grounding
+        enhanced = self.grounding_service.enhance_with_grounding(
+            refined, source_data or {}
+        )
+
+        enhanced["_refinement"] = {
+            "ai_enhanced": True,
+            "original_confidence": rule_validation["confidence"],
+            "refined_confidence": refined_validation["confidence"],
+            "improvements": refined_validation.get("warnings", []),
+        }
+
+        return enhanced
+
     def _build_refinement_prompt(
         self, ticket: Dict[str, Any], validation: Dict[str, Any]
     ) -> str:
@@ -146,7 +256,7 @@ Always respond with valid JSON containing the refined ticket structure."""
         prompt = f"""Please refine the following ticket to improve clarity, completeness, and business alignment.
 
 Original Ticket:
-{json.dumps(ticket, indent=2)}
+{compact_json(prune(ticket))}
 
 Validation Issues (must fix):
 {issues_text}
@@ -155,23 +265,40 @@ Suggestions to Improve (nice to have):
 {warnings_text}
 
 Please provide the refined ticket as valid JSON with the following structure:
-{{
-  "id": "Ticket ID (keep original if valid, suggest if not)",
-  "summary": "Clear, concise title (10-50 chars recommended)",
-  "description": "Detailed description with business context and requirements",
-  "priority": "One of: Critical, High, Medium, Low",
-  "type": "One of: Bug, Feature, Enhancement, Task, Story, Epic",
-  "assignee": "Suggested assignee if identifiable, or 'Unassigned'",
-  "epic": "Epic name or 'No Epic'",
-  "acceptanceCriteria": ["Testable criteria as a list"],
-  "stakeholders": ["List of identified stakeholders"],
-  "estimatedEffort": "XS/S/M/L/XL (if estimable)"
-}}
+{REFINED_TICKET_SCHEMA.format(extra="")}
 
 Focus on making the ticket actionable and clear for the development team."""
 
         return prompt
 
+    def _build_packed_prompt(self, entries: List[Dict[str, Any]]) -> str:
+        """Build one prompt refining several tickets.
+
+        Args:
+            entries: Items with "ref", "ticket", "issues" and "suggestions"
+
+        Returns:
+            Packed refinement prompt asking for a JSON array
+        """
+        return f"""Please refine each of the following tickets to improve clarity, completeness, and business alignment.
+Each entry has a "ref", the original ticket, validation issues (must fix) and suggestions (nice to have).
+
+Tickets:
+{compact_json(entries)}
+
+Respond with a JSON array containing exactly one object per ticket, each with the following structure:
+{PACKED_TICKET_SCHEMA}
+
+Focus on making the tickets actionable and clear for the development team."""
+
+    def _pack_entry(self, ref: str, ticket: Dict[str, Any], validation: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "ref": ref,
+            "ticket": prune(ticket),
+            "issues": validation.get("issues", []),
+            "suggestions": validation.get("warnings", []),
+        }
+
     async def _validate_output(self, response: Dict[str, Any]) -> Dict[str, Any]:
         """Validate AI output for ticket refinement.
 
@@ -196,6 +323,45 @@ Focus on making the ticket actionable and clear for the development team."""
             warnings.append("Response is not valid JSON, attempting to extract structure")
             return {"valid": False, "errors": errors, "warnings": warnings}
 
+        # Packed responses hold one refined ticket per slot
+        if isinstance(parsed, list):
+            for position, item in enumerate(parsed):
+                item_errors, item_warnings = self._check_refined_ticket(item)
+                errors.extend(f"[{position}] {e}" for e in item_errors)
+                warnings.extend(f"[{position}] {w}" for w in item_warnings)
+            return {
+                "valid": len(errors) == 0,
+                "errors": errors,
+                "warnings": warnings,
+                "parsed": parsed,
+            }
+
+        item_errors, item_warnings = self._check_refined_ticket(parsed)
+        errors.extend(item_errors)
+        warnings.extend(item_warnings)
+
+        return {
+            "valid": len(errors) == 0,
+            "errors": errors,
+            "warnings": warnings,
+            "parsed": parsed,
+        }
+
+    @staticmethod
+    def _check_refined_ticket(parsed: Any) -> Tuple[List[str], List[str]]:
+        """Check one refined ticket's fields.
+
+        Args:
+            parsed: Parsed ticket object
+
+        Returns:
+            (errors, warnings)
+        """
+        errors: List[str] = []
+        warnings: List[str] = []
+        if not isinstance(parsed, dict):
+            return ["Refined ticket is not a JSON object"], warnings
+
         # Check required fields
         required_fields = [
             "summary",
@@ -237,50 +403,190 @@ Focus on making the ticket actionable and clear for the development team."""
         elif len(ac) > 10:
             warnings.append(f"Too many acceptance criteria ({len(ac)}), consider consolidating")
 
-        return {
-            "valid": len(errors) == 0,
-            "errors": errors,
-            "warnings": warnings,
-            "parsed": parsed,
-        }
+        return errors, warnings
 
     async def batch_process_tickets(
         self,
         tickets: list[Dict[str, Any]],
         source_data: Optional[Dict[str, Any]] = None,
+        max_concurrency: Optional[int] = None,
+        packed: Optional[bool] = None,
     ) -> Dict[str, Any]:
-        """Process multiple tickets.
+        """Process multiple tickets concurrently.
+
+        At most ``max_concurrency`` model calls are in flight at once; model
+        calls additionally wait on the provider's rate limiter. Results keep
+        the input order and a failing ticket does not affect the others.
 
         Args:
             tickets: List of tickets
             source_data: Optional source data
+            max_concurrency: Calls made at once (defaults to
+                settings.TICKET_AGENT_MAX_CONCURRENCY)
+            packed: Refine several tickets per model call (defaults to
+                settings.TICKET_AGENT_PACKED)
 
         Returns:
             Batch processing result
         """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency or settings.TICKET_AGENT_MAX_CONCURRENCY))
+        if packed is None:
+            packed = settings.TICKET_AGENT_PACKED
+        if packed:
+            outcomes = await self._process_packed(tickets, source_data, semaphore)
+            return self._summarize_batch(tickets, outcomes)
+
+        async def process(ticket: Dict[str, Any]) -> tuple[bool, Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    return True, await self.process_ticket(ticket, source_data)
+                except Exception as e:
+                    return False, {
+                        "id": ticket.get("id"),
+                        "error": str(e),
+                        "status": "failed",
+                    }
+
+        outcomes = await asyncio.gather(*(process(ticket) for ticket in tickets))
+        return self._summarize_batch(tickets, outcomes)
+
+    def _summarize_batch(
+        self, tickets: List[Dict[str, Any]], outcomes: List[Tuple[bool, Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Build the batch result from per-ticket (ok, result) outcomes."""
         results = {
             "total": len(tickets),
             "processed": 0,
             "enhanced": 0,
             "failed": 0,
-            "tickets": [],
+            "tickets": [result for _, result in outcomes],
         }
 
-        for ticket in tickets:
-            try:
-                result = await self.process_ticket(ticket, source_data)
-                results["tickets"].append(result)
-                results["processed"] += 1
-
-                if result.get("_refinement", {}).get("ai_enhanced"):
-                    results["enhanced"] += 1
-
-            except Exception as e:
+        for ok, result in outcomes:
+            if not ok:
                 results["failed"] += 1
-                results["tickets"].append({
-                    "id": ticket.get("id"),
-                    "error": str(e),
-                    "status": "failed",
-                })
+                continue
+
+            results["processed"] += 1
+            if result.get("_refinement", {}).get("ai_enhanced"):
+                results["enhanced"] += 1
 
         return results
+
+    def _plan_packs(
+        self, entries: List[Dict[str, Any]], context_window: int, max_output_tokens: int
+    ) -> List[List[int]]:
+        """Group entries greedily so each pack fits the model's limits.
+
+        Args:
+            entries: Packed prompt entries, in ticket order
+            context_window: Model context window in tokens
+            max_output_tokens: Model output limit in tokens
+
+        Returns:
+            Lists of entry indices
+        """
+        overhead = estimate_tokens(self._get_system_prompt(), self._build_packed_prompt([]))
+        max_pack = max(1, settings.TICKET_AGENT_MAX_PACK)
+
+        packs: List[List[int]] = []
+        current: List[int] = []
+        input_tokens = output_tokens = 0
+        for index, entry in enumerate(entries):
+            entry_input = estimate_tokens(compact_json(entry))
+            entry_output = max(settings.TICKET_AGENT_PACK_OUTPUT_TOKENS, estimate_tokens(compact_json(entry["ticket"])))
+            fits = (
+                len(current) < max_pack
+                and output_tokens + entry_output <= max_output_tokens
+                and overhead + input_tokens + entry_input + output_tokens + entry_output <= context_window
+            )
+            if current and not fits:
+                packs.append(current)
+                current, input_tokens, output_tokens = [], 0, 0
+            current.append(index)
+            input_tokens += entry_input
+            output_tokens += entry_output
+        if current:
+            packs.append(current)
+        return packs
+
+    async def _process_packed(
+        self,
+        tickets: List[Dict[str, Any]],
+        source_data: Optional[Dict[str, Any]],
+        semaphore: asyncio.Semaphore,
+    ) -> List[Tuple[bool, Dict[str, Any]]]:
+        """Refine tickets several per model call.
+
+        Slots that are missing or fail validation are re-split into halves
+        and retried; a ticket that still fails on its own keeps the
+        rule-based grounding result, as in process_ticket().
+        """
+        validations = [self.grounding_service.validate_ticket(t, source_data or {}) for t in tickets]
+        entries = [self._pack_entry(f"T{i + 1}", t, v) for i, (t, v) in enumerate(zip(tickets, validations))]
+        context_window, max_output_tokens = await self._model_limits()
+        outcomes: List[Optional[Tuple[bool, Dict[str, Any]]]] = [None] * len(tickets)
+
+        async def run_pack(indices: List[int]) -> None:
+            async with semaphore:
+                refined = await self._refine_pack([entries[i] for i in indices], max_output_tokens)
+
+            retry = []
+            for index in indices:
+                slot = refined.get(entries[index]["ref"])
+                if slot is None:
+                    retry.append(index)
+                    continue
+                try:
+                    outcomes[index] = (True, self._finalize_refinement(slot, validations[index], source_data))
+                except Exception:
+                    retry.append(index)
+
+            if not retry:
+                return
+            if len(indices) == 1:
+                outcomes[retry[0]] = self._rule_based_outcome(tickets[retry[0]], source_data)
+                return
+            middle = (len(retry) + 1) // 2
+            halves = [retry[:middle], retry[middle:]] if len(retry) > 1 else [retry]
+            await asyncio.gather(*(run_pack(half) for half in halves))
+
+        packs = self._plan_packs(entries, context_window, max_output_tokens)
+        await asyncio.gather(*(run_pack(pack) for pack in packs))
+        return outcomes  # type: ignore[return-value]
+
+    async def _refine_pack(self, entries: List[Dict[str, Any]], max_output_tokens: int) -> Dict[str, Dict[str, Any]]:
+        """Run one packed model call.
+
+        Returns:
+            Valid refined tickets keyed by ref (invalid slots are left out)
+        """
+        result = await self.execute_task(
+            self._build_packed_prompt(entries),
+            max_tokens=max_output_tokens,
+        )
+        try:
+            parsed = json.loads(result.get("output") or "null")
+        except json.JSONDecodeError:
+            return {}
+        if not isinstance(parsed, list):
+            return {}
+
+        refs = {entry["ref"] for entry in entries}
+        refined: Dict[str, Dict[str, Any]] = {}
+        for item in parsed:
+            if not isinstance(item, dict) or item.get("ref") not in refs:
+                continue
+            errors, _ = self._check_refined_ticket(item)
+            if not errors:
+                slot = dict(item)
+                refined[slot.pop("ref")] = slot
+        return refined
+
+    def _rule_based_outcome(
+        self, ticket: Dict[str, Any], source_data: Optional[Dict[str, Any]]
+    ) -> Tuple[bool, Dict[str, Any]]:
+        try:
+            return True, self.grounding_service.enhance_with_grounding(ticket, source_data or {})
+        except Exception as e:
+            return False, {"id": ticket.get("id"), "error": str(e), "status": "failed"}
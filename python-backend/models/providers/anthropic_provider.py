@@ -1,17 +1,19 @@
 """Anthropic Claude API provider implementation."""
 from __future__ import annotations
 
-import httpx
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime
+import json
 
 from config.settings import settings
-from models.providers.base import ModelProvider
+from models.providers.base import ModelProvider, iter_sse
 
 
 class AnthropicProvider(ModelProvider):
     """Anthropic Claude model provider."""
 
+    pool_name = "anthropic"
+
     def __init__(self, api_key: Optional[str] = None):
         """Initialize Anthropic provider.
 
@@ -46,54 +48,134 @@ class AnthropicProvider(ModelProvider):
             Response dict with content, usage, model, finish_reason
         """
         try:
-            async with httpx.AsyncClient() as client:
-                headers = {
-                    "x-api-key": self.api_key,
-                    "anthropic-version": "2023-06-01",
-                    "content-type": "application/json",
-                }
-
-                payload = {
-                    "model": model,
-                    "max_tokens": max_tokens,
-                    "temperature": temperature,
-                    "messages": [{"role": "user", "content": prompt}],
-                }
-
-                if system_prompt:
-                    payload["system"] = system_prompt
-
-                response = await client.post(
-                    f"{self.base_url}/messages",
-                    headers=headers,
-                    json=payload,
-                    timeout=60,
+            client = self._client()
+            headers, payload = self._build_request(prompt, model, system_prompt, max_tokens, temperature)
+
+            response = await client.post(
+                f"{self.base_url}/messages",
+                headers=headers,
+                json=payload,
+                timeout=60,
+            )
+
+            if response.status_code != 200:
+                self._track_request(success=False)
+                raise ValueError(
+                    f"Anthropic API error: {response.status_code} - {response.text}"
                 )
 
-                if response.status_code != 200:
-                    self._track_request(success=False)
-                    raise ValueError(
-                        f"Anthropic API error: {response.status_code} - {response.text}"
-                    )
-
-                data = response.json()
-                self._track_request(success=True)
-
-                return {
-                    "content": data["content"][0]["text"],
-                    "usage": {
-                        "input_tokens": data["usage"]["input_tokens"],
-                        "output_tokens": data["usage"]["output_tokens"],
-                    },
-                    "model": model,
-                    "finish_reason": data.get("stop_reason", "end_turn"),
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
+            data = response.json()
+            self._track_request(success=True)
+
+            return {
+                "content": data["content"][0]["text"],
+                "usage": {
+                    "input_tokens": data["usage"]["input_tokens"],
+                    "output_tokens": data["usage"]["output_tokens"],
+                },
+                "model": model,
+                "finish_reason": data.get("stop_reason", "end_turn"),
+                "timestamp": datetime.utcnow().isoformat(),
+            }
 
         except Exception as e:
             self._track_request(success=False)
             raise ValueError(f"Anthropic inference failed: {str(e)}")
 
+    async def stream_inference(
+        self,
+        prompt: str,
+        model: str = "claude-3-5-sonnet-20241022",
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream a Claude response as server-sent events arrive.
+
+        Args:
+            prompt: User prompt
+            model: Model ID (default: Claude 3.5 Sonnet)
+            system_prompt: Optional system message
+            max_tokens: Maximum tokens in response
+            temperature: Sampling temperature
+            **kwargs: Additional parameters
+
+        Yields:
+            Text deltas, then a "done" event with usage and finish_reason
+        """
+        headers, payload = self._build_request(prompt, model, system_prompt, max_tokens, temperature)
+        payload["stream"] = True
+        usage = {"input_tokens": 0, "output_tokens": 0}
+        finish_reason = "end_turn"
+
+        try:
+            async with self._client().stream(
+                "POST",
+                f"{self.base_url}/messages",
+                headers=headers,
+                json=payload,
+                timeout=60,
+            ) as response:
+                if response.status_code != 200:
+                    body = (await response.aread()).decode("utf-8", errors="replace")
+                    raise ValueError(f"Anthropic API error: {response.status_code} - {body}")
+
+                async for event, data in iter_sse(response):
+                    message = json.loads(data)
+                    kind = message.get("type", event)
+                    if kind == "content_block_delta":
+                        text = message.get("delta", {}).get("text")
+                        if text:
+                            yield {"type": "delta", "text": text}
+                    elif kind == "message_start":
+                        usage["input_tokens"] = message["message"].get("usage", {}).get("input_tokens", 0)
+                    elif kind == "message_delta":
+                        usage["output_tokens"] = message.get("usage", {}).get("output_tokens", usage["output_tokens"])
+                        finish_reason = message.get("delta", {}).get("stop_reason") or finish_reason
+                    elif kind == "error":
+                        raise ValueError(f"Anthropic API error: {message.get('error', {}).get('message', data)}")
+
+        except Exception as e:
+            self._track_request(success=False)
+            raise ValueError(f"Anthropic streaming failed: {str(e)}")
+
+        self._track_request(success=True)
+        yield {
+            "type": "done",
+            "usage": usage,
+            "model": model,
+            "finish_reason": finish_reason,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+    def _build_request(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+    ) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """Headers and JSON payload of a Messages API call."""
+        headers = {
+            "x-api-key": self.api_key,
+            "anthropic-version": "2023-06-01",
+            "content-type": "application/json",
+        }
+
+        payload = {
+            "model": model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+
+        if system_prompt:
+            payload["system"] = system_prompt
+
+        return headers, payload
+
     async def list_models(self) -> List[Dict[str, Any]]:
         """List available Claude models.
 
@@ -165,22 +247,22 @@ class AnthropicProvider(ModelProvider):
             True if API is accessible
         """
         try:
-            async with httpx.AsyncClient() as client:
-                headers = {
-                    "x-api-key": self.api_key,
-                    "anthropic-version": "2023-06-01",
-                }
-                # Quick test with minimal input
-                response = await client.post(
-                    f"{self.base_url}/messages",
-                    headers=headers,
-                    json={
-                        "model": "claude-3-5-haiku-20241022",
-                        "max_tokens": 10,
-                        "messages": [{"role": "user", "content": "Hi"}],
-                    },
-                    timeout=10,
-                )
-                return response.status_code == 200
+            client = self._client()
+            headers = {
+                "x-api-key": self.api_key,
+                "anthropic-version": "2023-06-01",
+            }
+            # Quick test with minimal input
+            response = await client.post(
+                f"{self.base_url}/messages",
+                headers=headers,
+                json={
+                    "model": "claude-3-5-haiku-20241022",
+                    "max_tokens": 10,
+                    "messages": [{"role": "user", "content": "Hi"}],
+                },
+                timeout=10,
+            )
+            return response.status_code == 200
         except Exception:
             return False
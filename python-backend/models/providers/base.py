@@ -2,13 +2,50 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime
 
+import httpx
+
+from models.providers.http_pool import provider_client_pool
+
+
+async def iter_sse(response: httpx.Response) -> AsyncIterator[Tuple[str, str]]:
+    """Parse a server-sent events body into (event, data) pairs.
+
+    Args:
+        response: Streaming HTTP response
+
+    Yields:
+        Event name ("message" if unnamed) and its data lines joined by newlines
+    """
+    event, data = "message", []
+    async for line in response.aiter_lines():
+        if not line:
+            if data:
+                yield event, "\n".join(data)
+            event, data = "message", []
+        elif line.startswith(":"):
+            # Comment / keep-alive line
+            continue
+        elif line.startswith("event:"):
+            event = line[6:].strip()
+        elif line.startswith("data:"):
+            data.append(line[5:].removeprefix(" "))
+    if data:
+        yield event, "\n".join(data)
+
 
 class ModelProvider(ABC):
     """Abstract base class for AI model providers (Anthropic, OpenRouter, Local)."""
 
+    # Key of this provider's client in the shared HTTP connection pool
+    pool_name = "default"
+
+    # True if the provider charges each upstream request to a rate limiter
+    # itself, so callers should not charge it again
+    rate_limits_upstream = False
+
     def __init__(self, api_key: Optional[str] = None):
         """Initialize model provider.
 
@@ -45,6 +82,48 @@ class ModelProvider(ABC):
         """
         pass
 
+    async def stream_inference(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Run inference, yielding output as the model generates it.
+
+        Providers without native streaming yield the complete response as a
+        single delta.
+
+        Args:
+            prompt: User prompt/query
+            model: Model ID/name to use
+            system_prompt: Optional system message
+            max_tokens: Maximum tokens in response
+            temperature: Sampling temperature (0-1)
+            **kwargs: Additional provider-specific arguments
+
+        Yields:
+            {"type": "delta", "text": ...} per output chunk, then one
+            {"type": "done", "usage": ..., "model": ..., "finish_reason": ...}
+        """
+        response = await self.inference(
+            prompt=prompt,
+            model=model,
+            system_prompt=system_prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            **kwargs,
+        )
+        yield {"type": "delta", "text": response.get("content", "")}
+        yield {
+            "type": "done",
+            "usage": response.get("usage", {}),
+            "model": response.get("model", model),
+            "finish_reason": response.get("finish_reason"),
+        }
+
     @abstractmethod
     async def list_models(self) -> List[Dict[str, Any]]:
         """List available models from provider.
@@ -90,6 +169,10 @@ class ModelProvider(ABC):
                 return m
         return None
 
+    def _client(self) -> httpx.AsyncClient:
+        """Pooled keep-alive HTTP client shared by all instances of this provider."""
+        return provider_client_pool.get(self.pool_name)
+
     def _track_request(self, success: bool = True):
         """Track API request statistics.
 
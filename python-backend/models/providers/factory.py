@@ -0,0 +1,77 @@
+"""Model provider selection."""
+from __future__ import annotations
+
+from typing import List, Optional
+
+from config.settings import settings
+from models.providers.anthropic_provider import AnthropicProvider
+from models.providers.base import ModelProvider
+from models.providers.local_provider import LocalProvider
+from models.providers.openrouter_provider import OpenRouterProvider
+from models.providers.router_provider import RouteTarget, RouterProvider
+from models.providers.single_flight import CoalescingProvider
+
+
+def create_provider(name: str) -> ModelProvider:
+    """Create a provider by name.
+
+    Args:
+        name: "anthropic", "openrouter", "local" (offline mock) or
+            "router" (routes across settings.LLM_ROUTER_BACKENDS)
+
+    Returns:
+        ModelProvider instance
+
+    Raises:
+        ValueError: If the provider name is unknown
+    """
+    if name == "anthropic":
+        return AnthropicProvider()
+    if name == "openrouter":
+        return OpenRouterProvider()
+    if name == "local":
+        return LocalProvider()
+    if name == "router":
+        return create_router(settings.LLM_ROUTER_BACKENDS)
+    raise ValueError(f"Unknown model provider: {name}")
+
+
+def create_router(backends: List[str]) -> RouterProvider:
+    """Create a router over backends given as "provider[:model]".
+
+    Args:
+        backends: Backend specs in preference order
+
+    Returns:
+        RouterProvider instance
+    """
+    targets = []
+    for spec in backends:
+        name, _, model = spec.partition(":")
+        if name == "router":
+            raise ValueError("Router backends cannot be routers")
+        targets.append(RouteTarget(create_provider(name), model or None))
+    return RouterProvider(targets)
+
+
+_shared_router: Optional[RouterProvider] = None
+
+
+def get_model_provider() -> ModelProvider:
+    """Provider selected by settings.DEFAULT_MODEL_PROVIDER (usable with Depends).
+
+    The router is shared process-wide so its latency statistics accumulate
+    across requests. With LLM_COALESCE_ENABLED the provider is wrapped so
+    identical concurrent calls (from any request) share one upstream call.
+    """
+    global _shared_router
+    if settings.DEFAULT_MODEL_PROVIDER == "router":
+        if _shared_router is None:
+            _shared_router = create_router(settings.LLM_ROUTER_BACKENDS)
+        provider: ModelProvider = _shared_router
+    else:
+        provider = create_provider(settings.DEFAULT_MODEL_PROVIDER)
+
+    if settings.LLM_COALESCE_ENABLED:
+        return CoalescingProvider(provider)
+    return provider
@@ -0,0 +1,124 @@
+"""Long-lived HTTP clients shared by model providers.
+
+Opening an ``httpx.AsyncClient`` per request pays a TCP and TLS handshake on
+every LLM call. The pool keeps one client per provider with keep-alive
+connections; clients are created on first use (or at app startup) and closed
+by the app's shutdown hook.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import httpx
+
+from config.settings import settings
+
+try:
+    import h2  # noqa: F401
+    HAS_H2 = True
+except ImportError:
+    HAS_H2 = False
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderClientPool:
+    """One pooled ``httpx.AsyncClient`` per provider name."""
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        http2: Optional[bool] = None,
+    ):
+        """Configure pool limits (defaults come from settings).
+
+        Args:
+            max_connections: Connections per provider client
+            max_keepalive_connections: Idle connections kept open per client
+            keepalive_expiry: Seconds an idle connection is kept
+            http2: Negotiate HTTP/2 (needs the ``h2`` package)
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections or settings.LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=max_keepalive_connections or settings.LLM_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=keepalive_expiry if keepalive_expiry is not None else settings.LLM_HTTP_KEEPALIVE_EXPIRY,
+        )
+        self.http2 = settings.LLM_HTTP2 if http2 is None else http2
+        if self.http2 and not HAS_H2:
+            logger.warning("LLM_HTTP2 is enabled but h2 is not installed; using HTTP/1.1")
+            self.http2 = False
+
+        # Clients are bound to the event loop they were created on
+        self._clients: Dict[str, Tuple[httpx.AsyncClient, Any]] = {}
+        self._created = 0
+        self._replaced = 0
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """Return the provider's client, creating it on first use.
+
+        A client created on another event loop (or already closed) is
+        replaced; the old one is closed so its connections are not leaked.
+
+        Args:
+            name: Provider name, e.g. "anthropic"
+
+        Returns:
+            Shared AsyncClient (do not close it)
+        """
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(name)
+        if entry is not None and not entry[0].is_closed and entry[1] is loop:
+            return entry[0]
+        if entry is not None:
+            self._retire(name, *entry)
+
+        client = httpx.AsyncClient(limits=self.limits, http2=self.http2)
+        self._clients[name] = (client, loop)
+        self._created += 1
+        return client
+
+    def _retire(self, name: str, client: httpx.AsyncClient, owner: Any) -> None:
+        """Close a replaced client on the event loop that owns its connections."""
+        if client.is_closed:
+            return
+        self._replaced += 1
+        if not owner.is_closed():
+            asyncio.run_coroutine_threadsafe(client.aclose(), owner)
+        else:
+            # The loop is gone, so nothing can await the close; sockets are
+            # released when the client is garbage collected
+            logger.debug("Dropping %s HTTP client of a closed event loop", name)
+
+    def start(self, names: Iterable[str]) -> None:
+        """Create clients for the given providers ahead of the first request."""
+        for name in names:
+            self.get(name)
+
+    async def aclose(self) -> None:
+        """Close every client (app shutdown)."""
+        clients, self._clients = self._clients, {}
+        for name, (client, loop) in clients.items():
+            if loop is asyncio.get_running_loop():
+                await client.aclose()
+            else:
+                self._retire(name, client, loop)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics."""
+        return {
+            "clients": sorted(self._clients),
+            "clientsCreated": self._created,
+            "clientsReplaced": self._replaced,
+            "maxConnections": self.limits.max_connections,
+            "maxKeepaliveConnections": self.limits.max_keepalive_connections,
+            "keepaliveExpiry": self.limits.keepalive_expiry,
+            "http2": self.http2,
+        }
+
+
+# Shared pool; closed in main.py's lifespan hook
+provider_client_pool = ProviderClientPool()
@@ -1,20 +1,274 @@
-"""Local model provider placeholder."""
+"""Offline model provider for load tests and local development.
+
+LocalProvider never touches the network. It answers TicketAgent (single and
+packed) and DocumentAgent prompts with schema-valid JSON derived from the
+prompt, after a simulated latency. Latency distribution, error rate and token
+counts are configurable, and both the random draws (seeded) and the generated
+content (derived from the prompt) are deterministic, so benchmark runs are
+repeatable.
+"""
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import asyncio
+import hashlib
+import json
+import random
+import re
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
 
+from config.settings import settings
 from models.providers.base import ModelProvider
+from models.providers.rate_limit import estimate_tokens
+
+PRIORITIES = ["Critical", "High", "Medium", "Low"]
+TICKET_TYPES = ["Bug", "Feature", "Enhancement", "Task", "Story", "Epic"]
+EFFORTS = ["XS", "S", "M", "L", "XL"]
+RISK_WORDS = ("risk", "delay", "depend", "issue", "block", "constraint", "deadline", "budget")
+
+LOCAL_MODEL = {
+    "id": "local-mock",
+    "name": "Local Mock",
+    "description": "Offline deterministic provider for load tests",
+    "context_window": 200000,
+    "max_output_tokens": 4096,
+    "recommended": False,
+    "capabilities": ["text"],
+    "pricing": {"input_tokens": 0.0, "output_tokens": 0.0},
+}
 
 
 class LocalProvider(ModelProvider):
-    def __init__(self):
-        raise NotImplementedError("Local provider not yet implemented")
+    """Deterministic offline provider with simulated latency and errors."""
+
+    pool_name = "local"
+
+    # Share of the latency spent before the first streamed token
+    FIRST_TOKEN_SHARE = 0.3
+
+    def __init__(
+        self,
+        latency_ms: Optional[float] = None,
+        latency_sigma: Optional[float] = None,
+        error_rate: Optional[float] = None,
+        output_tokens: Optional[int] = None,
+        seed: Optional[int] = None,
+        latency_sampler: Optional[Callable[[random.Random], float]] = None,
+    ):
+        """Initialize local provider (defaults come from settings).
+
+        Args:
+            latency_ms: Median simulated latency per call
+            latency_sigma: Log-normal spread of the latency (0 = constant)
+            error_rate: Probability that a call fails (0-1)
+            output_tokens: Output tokens reported per call (None counts the
+                generated text)
+            seed: Seed of the latency and error draws
+            latency_sampler: Custom latency distribution returning seconds
+                (overrides latency_ms/latency_sigma)
+        """
+        super().__init__(api_key=None)
+        self.latency_ms = settings.LOCAL_LLM_LATENCY_MS if latency_ms is None else latency_ms
+        self.latency_sigma = settings.LOCAL_LLM_LATENCY_SIGMA if latency_sigma is None else latency_sigma
+        self.error_rate = settings.LOCAL_LLM_ERROR_RATE if error_rate is None else error_rate
+        self.output_tokens = settings.LOCAL_LLM_OUTPUT_TOKENS if output_tokens is None else output_tokens
+        self.random = random.Random(settings.LOCAL_LLM_SEED if seed is None else seed)
+        self.latency_sampler = latency_sampler
+
+    def _sample_latency(self) -> float:
+        if self.latency_sampler is not None:
+            return max(0.0, self.latency_sampler(self.random))
+        if not self.latency_ms:
+            return 0.0
+        return self.latency_ms / 1000 * self.random.lognormvariate(0, self.latency_sigma)
+
+    async def inference(
+        self,
+        prompt: str,
+        model: str = "local-mock",
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Answer a prompt after a simulated latency.
+
+        Args:
+            prompt: User prompt
+            model: Model ID (any ID is accepted)
+            system_prompt: Optional system message
+            max_tokens: Maximum tokens in response
+            temperature: Ignored
+            **kwargs: Ignored
+
+        Returns:
+            Response dict with content, usage, model, finish_reason
+
+        Raises:
+            ValueError: For simulated errors (probability error_rate)
+        """
+        latency = self._sample_latency()
+        failed = self.random.random() < self.error_rate
+        await asyncio.sleep(latency)
+        if failed:
+            self._track_request(success=False)
+            raise ValueError("Local provider simulated error")
+
+        self._track_request(success=True)
+        return self._response(prompt, model, system_prompt, max_tokens)
+
+    async def stream_inference(
+        self,
+        prompt: str,
+        model: str = "local-mock",
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream the answer in chunks spread over the simulated latency."""
+        latency = self._sample_latency()
+        failed = self.random.random() < self.error_rate
+        await asyncio.sleep(latency * self.FIRST_TOKEN_SHARE)
+        if failed:
+            self._track_request(success=False)
+            raise ValueError("Local provider simulated error")
+
+        response = self._response(prompt, model, system_prompt, max_tokens)
+        content = response["content"]
+        chunks = [content[i:i + 16] for i in range(0, len(content), 16)] or [""]
+        pause = latency * (1 - self.FIRST_TOKEN_SHARE) / len(chunks)
+        for index, chunk in enumerate(chunks):
+            if index:
+                await asyncio.sleep(pause)
+            yield {"type": "delta", "text": chunk}
+
+        self._track_request(success=True)
+        yield {
+            "type": "done",
+            "usage": response["usage"],
+            "model": model,
+            "finish_reason": response["finish_reason"],
+            "timestamp": response["timestamp"],
+        }
+
+    def _response(self, prompt: str, model: str, system_prompt: Optional[str], max_tokens: int) -> Dict[str, Any]:
+        content = self.generate(prompt)
+        output_tokens = self.output_tokens or estimate_tokens(content)
+        return {
+            "content": content,
+            "usage": {
+                "input_tokens": estimate_tokens(system_prompt, prompt),
+                "output_tokens": min(output_tokens, max_tokens),
+            },
+            "model": model,
+            "finish_reason": "max_tokens" if output_tokens > max_tokens else "end_turn",
+            "timestamp": datetime.utcnow().isoformat(),
+        }
 
-    async def inference(self, prompt: str, model: str, *, system_prompt: str | None = None, **kwargs: Any) -> Dict[str, Any]:
-        raise NotImplementedError("Local provider inference not implemented")
+    def generate(self, prompt: str) -> str:
+        """Deterministic answer to a TicketAgent or DocumentAgent prompt.
+
+        Args:
+            prompt: User prompt (including agent context)
+
+        Returns:
+            JSON text: a refined ticket, an array of refined tickets (packed
+            prompts), a document summary, or {"response": ...} otherwise
+        """
+        entries = _json_after(prompt, "Tickets:")
+        if isinstance(entries, list) and "JSON array" in prompt:
+            return json.dumps([
+                {**_refine(entry.get("ticket") or {}), "ref": entry.get("ref")}
+                for entry in entries
+                if isinstance(entry, dict)
+            ])
+
+        ticket = _json_after(prompt, "Original Ticket:")
+        if isinstance(ticket, dict):
+            return json.dumps(_refine(ticket))
+
+        if "Analyze the following document" in prompt:
+            match = re.search(r"^document: (.*?)(?=^\w+: |\n\nAnalyze the following document|\Z)", prompt, re.S | re.M)
+            return json.dumps(_summarize(match.group(1) if match else prompt))
+
+        return json.dumps({"response": f"Local response to: {prompt[:200]}"})
 
     async def list_models(self) -> List[Dict[str, Any]]:
-        return []
+        """List the local model."""
+        return [dict(LOCAL_MODEL)]
+
+    async def get_model_info(self, model: str) -> Optional[Dict[str, Any]]:
+        """The local model answers for every model ID agents request."""
+        return {**LOCAL_MODEL, "id": model}
 
     async def health_check(self) -> bool:
-        return False
+        return True
+
+
+def _json_after(text: str, marker: str) -> Any:
+    """Parse the JSON value following marker in text (None if absent)."""
+    start = text.find(marker)
+    if start < 0:
+        return None
+    match = re.compile(r"[\[{]").search(text, start + len(marker))
+    if not match:
+        return None
+    try:
+        value, _ = json.JSONDecoder().raw_decode(text, match.start())
+    except json.JSONDecodeError:
+        return None
+    return value
+
+
+def _pick(options: List[str], seed: str) -> str:
+    digest = hashlib.sha1(seed.encode("utf-8")).digest()
+    return options[digest[0] % len(options)]
+
+
+def _refine(ticket: Dict[str, Any]) -> Dict[str, Any]:
+    """Refined ticket satisfying TicketAgent's output schema."""
+    ticket_id = str(ticket.get("id") or "LOCAL-" + hashlib.sha1(json.dumps(ticket, sort_keys=True).encode()).hexdigest()[:6])
+    summary = str(ticket.get("summary") or ticket.get("title") or "Untitled ticket").strip()
+    if len(summary) < 10:
+        summary = f"{summary} - refined requirement"
+    summary = summary[:50]
+    description = str(ticket.get("description") or "").strip()
+    if len(description) < 40:
+        description = f"{description} As a stakeholder, I need '{summary}' delivered so that the business goal is met.".strip()
+
+    priority = ticket.get("priority") if ticket.get("priority") in PRIORITIES else _pick(PRIORITIES[1:], ticket_id)
+    ticket_type = ticket.get("type") if ticket.get("type") in TICKET_TYPES else "Story"
+    criteria = ticket.get("acceptanceCriteria")
+    if not isinstance(criteria, list) or not criteria:
+        criteria = [
+            f"Given the {summary.lower()} is implemented, when a user uses it, then it behaves as described",
+            "Given invalid input, when it is submitted, then a clear validation message is shown",
+            "Given the change is deployed, when regression tests run, then they pass",
+        ]
+
+    return {
+        "id": ticket_id,
+        "summary": summary,
+        "description": description,
+        "priority": priority,
+        "type": ticket_type,
+        "assignee": ticket.get("assignee") or "Unassigned",
+        "epic": ticket.get("epic") or "No Epic",
+        "acceptanceCriteria": criteria,
+        "stakeholders": ticket.get("stakeholders") or [],
+        "estimatedEffort": _pick(EFFORTS, ticket_id + summary),
+    }
+
+
+def _summarize(document: str) -> Dict[str, Any]:
+    """Document summary satisfying DocumentAgent's output schema."""
+    sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+", document.strip()) if s.strip()]
+    summary = " ".join(sentences[:2])[:280] or "Empty document"
+    risks = [s[:200] for s in sentences if any(word in s.lower() for word in RISK_WORDS)][:3]
+    return {
+        "summary": summary,
+        "risks": risks,
+        "recommendations": [f"Review and mitigate: {risk[:120]}" for risk in risks]
+        or ["Confirm scope and owners with stakeholders"],
+    }
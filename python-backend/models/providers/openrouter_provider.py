@@ -1,17 +1,19 @@
 """OpenRouter LLM aggregator provider implementation."""
 from __future__ import annotations
 
-import httpx
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime
+import json
 
 from config.settings import settings
-from models.providers.base import ModelProvider
+from models.providers.base import ModelProvider, iter_sse
 
 
 class OpenRouterProvider(ModelProvider):
     """OpenRouter multi-model LLM aggregator provider."""
 
+    pool_name = "openrouter"
+
     def __init__(self, api_key: Optional[str] = None):
         """Initialize OpenRouter provider.
 
@@ -47,64 +49,151 @@ class OpenRouterProvider(ModelProvider):
             Response dict with content, usage, model, finish_reason
         """
         try:
-            async with httpx.AsyncClient() as client:
-                headers = {
-                    "Authorization": f"Bearer {self.api_key}",
-                    "HTTP-Referer": settings.APP_URL,
-                    "X-Title": self.app_name,
-                    "Content-Type": "application/json",
-                }
-
-                messages = []
-                if system_prompt:
-                    messages.append({"role": "system", "content": system_prompt})
-                messages.append({"role": "user", "content": prompt})
-
-                payload = {
-                    "model": model,
-                    "messages": messages,
-                    "max_tokens": max_tokens,
-                    "temperature": temperature,
-                }
-
-                # Add any provider-specific settings
-                if "top_p" in kwargs:
-                    payload["top_p"] = kwargs["top_p"]
-                if "top_k" in kwargs:
-                    payload["top_k"] = kwargs["top_k"]
-
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers=headers,
-                    json=payload,
-                    timeout=60,
+            client = self._client()
+            headers, payload = self._build_request(prompt, model, system_prompt, max_tokens, temperature, **kwargs)
+
+            response = await client.post(
+                f"{self.base_url}/chat/completions",
+                headers=headers,
+                json=payload,
+                timeout=60,
+            )
+
+            if response.status_code != 200:
+                self._track_request(success=False)
+                raise ValueError(
+                    f"OpenRouter API error: {response.status_code} - {response.text}"
                 )
 
-                if response.status_code != 200:
-                    self._track_request(success=False)
-                    raise ValueError(
-                        f"OpenRouter API error: {response.status_code} - {response.text}"
-                    )
+            data = response.json()
+            self._track_request(success=True)
 
-                data = response.json()
-                self._track_request(success=True)
-
-                return {
-                    "content": data["choices"][0]["message"]["content"],
-                    "usage": {
-                        "input_tokens": data["usage"]["prompt_tokens"],
-                        "output_tokens": data["usage"]["completion_tokens"],
-                        "total_tokens": data["usage"]["total_tokens"],
-                    },
-                    "model": data.get("model", model),
-                    "finish_reason": data["choices"][0].get("finish_reason", "stop"),
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
+            return {
+                "content": data["choices"][0]["message"]["content"],
+                "usage": {
+                    "input_tokens": data["usage"]["prompt_tokens"],
+                    "output_tokens": data["usage"]["completion_tokens"],
+                    "total_tokens": data["usage"]["total_tokens"],
+                },
+                "model": data.get("model", model),
+                "finish_reason": data["choices"][0].get("finish_reason", "stop"),
+                "timestamp": datetime.utcnow().isoformat(),
+            }
 
         except Exception as e:
             self._track_request(success=False)
             raise ValueError(f"OpenRouter inference failed: {str(e)}")
 
+    async def stream_inference(
+        self,
+        prompt: str,
+        model: str = "openrouter/auto",
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream an OpenRouter response as server-sent events arrive.
+
+        Args:
+            prompt: User prompt
+            model: Model ID (default: openrouter/auto - best available)
+            system_prompt: Optional system message
+            max_tokens: Maximum tokens in response
+            temperature: Sampling temperature
+            **kwargs: Additional parameters
+
+        Yields:
+            Text deltas, then a "done" event with usage and finish_reason
+        """
+        headers, payload = self._build_request(prompt, model, system_prompt, max_tokens, temperature, **kwargs)
+        payload["stream"] = True
+        usage = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
+        finish_reason = "stop"
+        served_model = model
+
+        try:
+            async with self._client().stream(
+                "POST",
+                f"{self.base_url}/chat/completions",
+                headers=headers,
+                json=payload,
+                timeout=60,
+            ) as response:
+                if response.status_code != 200:
+                    body = (await response.aread()).decode("utf-8", errors="replace")
+                    raise ValueError(f"OpenRouter API error: {response.status_code} - {body}")
+
+                async for _, data in iter_sse(response):
+                    if data == "[DONE]":
+                        break
+                    chunk = json.loads(data)
+                    if "error" in chunk:
+                        raise ValueError(f"OpenRouter API error: {chunk['error'].get('message', data)}")
+
+                    served_model = chunk.get("model", served_model)
+                    for choice in chunk.get("choices", []):
+                        text = choice.get("delta", {}).get("content")
+                        if text:
+                            yield {"type": "delta", "text": text}
+                        finish_reason = choice.get("finish_reason") or finish_reason
+                    if chunk.get("usage"):
+                        usage = {
+                            "input_tokens": chunk["usage"].get("prompt_tokens", 0),
+                            "output_tokens": chunk["usage"].get("completion_tokens", 0),
+                            "total_tokens": chunk["usage"].get("total_tokens", 0),
+                        }
+
+        except Exception as e:
+            self._track_request(success=False)
+            raise ValueError(f"OpenRouter streaming failed: {str(e)}")
+
+        self._track_request(success=True)
+        yield {
+            "type": "done",
+            "usage": usage,
+            "model": served_model,
+            "finish_reason": finish_reason,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+    def _build_request(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        **kwargs
+    ) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """Headers and JSON payload of a chat completions call."""
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "HTTP-Referer": settings.APP_URL,
+            "X-Title": self.app_name,
+            "Content-Type": "application/json",
+        }
+
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        payload = {
+            "model": model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        }
+
+        # Add any provider-specific settings
+        if "top_p" in kwargs:
+            payload["top_p"] = kwargs["top_p"]
+        if "top_k" in kwargs:
+            payload["top_k"] = kwargs["top_k"]
+
+        return headers, payload
+
     async def list_models(self) -> List[Dict[str, Any]]:
         """List available models from OpenRouter.
 
@@ -122,44 +211,44 @@ class OpenRouterProvider(ModelProvider):
             return self.models_cache
 
         try:
-            async with httpx.AsyncClient() as client:
-                headers = {
-                    "Authorization": f"Bearer {self.api_key}",
-                    "HTTP-Referer": settings.APP_URL,
-                }
-
-                response = await client.get(
-                    f"{self.base_url}/models",
-                    headers=headers,
-                    timeout=10,
-                )
+            client = self._client()
+            headers = {
+                "Authorization": f"Bearer {self.api_key}",
+                "HTTP-Referer": settings.APP_URL,
+            }
+
+            response = await client.get(
+                f"{self.base_url}/models",
+                headers=headers,
+                timeout=10,
+            )
 
-                if response.status_code == 200:
-                    data = response.json()
-                    models = []
-
-                    # Process models from API
-                    for model in data.get("data", []):
-                        models.append({
-                            "id": model.get("id"),
-                            "name": model.get("id", "").split("/")[-1],
-                            "description": model.get("description", ""),
-                            "context_window": model.get("context_length", 4096),
-                            "max_output_tokens": model.get("max_tokens", 4096),
-                            "recommended": False,
-                            "pricing": {
-                                "input_tokens": model.get("pricing", {}).get(
-                                    "prompt", 0
-                                ),
-                                "output_tokens": model.get("pricing", {}).get(
-                                    "completion", 0
-                                ),
-                            },
-                        })
-
-                    self.models_cache = models
-                    self.cache_updated_at = datetime.utcnow()
-                    return models
+            if response.status_code == 200:
+                data = response.json()
+                models = []
+
+                # Process models from API
+                for model in data.get("data", []):
+                    models.append({
+                        "id": model.get("id"),
+                        "name": model.get("id", "").split("/")[-1],
+                        "description": model.get("description", ""),
+                        "context_window": model.get("context_length", 4096),
+                        "max_output_tokens": model.get("max_tokens", 4096),
+                        "recommended": False,
+                        "pricing": {
+                            "input_tokens": model.get("pricing", {}).get(
+                                "prompt", 0
+                            ),
+                            "output_tokens": model.get("pricing", {}).get(
+                                "completion", 0
+                            ),
+                        },
+                    })
+
+                self.models_cache = models
+                self.cache_updated_at = datetime.utcnow()
+                return models
 
         except Exception as e:
             print(f"Failed to fetch OpenRouter models: {str(e)}")
@@ -203,17 +292,17 @@ class OpenRouterProvider(ModelProvider):
             True if API is accessible
         """
         try:
-            async with httpx.AsyncClient() as client:
-                headers = {
-                    "Authorization": f"Bearer {self.api_key}",
-                    "HTTP-Referer": settings.APP_URL,
-                }
-
-                response = await client.get(
-                    f"{self.base_url}/models",
-                    headers=headers,
-                    timeout=10,
-                )
-                return response.status_code == 200
+            client = self._client()
+            headers = {
+                "Authorization": f"Bearer {self.api_key}",
+                "HTTP-Referer": settings.APP_URL,
+            }
+
+            response = await client.get(
+                f"{self.base_url}/models",
+                headers=headers,
+                timeout=10,
+            )
+            return response.status_code == 200
         except Exception:
             return False
@@ -0,0 +1,132 @@
+"""Client-side request and token rate limiting for model providers.
+
+Provider accounts are limited in requests per minute and tokens per minute.
+Concurrent callers share one limiter per provider, so raising concurrency
+queues requests locally instead of turning them into 429 responses.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, Optional
+
+from config.settings import settings
+
+
+def estimate_tokens(*texts: Optional[str]) -> int:
+    """Rough token count of prompt texts (~4 characters per token)."""
+    return sum(len(text) for text in texts if text) // 4 + 1
+
+
+def usage_tokens(usage: Dict[str, Any]) -> int:
+    """Input + output tokens reported in a provider response's usage."""
+    return usage.get("total_tokens") or usage.get("input_tokens", 0) + usage.get("output_tokens", 0)
+
+
+class RateLimiter:
+    """Token buckets for requests/min and tokens/min (0 disables a limit)."""
+
+    def __init__(
+        self,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Any] = asyncio.sleep,
+    ):
+        """Initialize limiter with full buckets.
+
+        Args:
+            requests_per_minute: Request budget per minute
+            tokens_per_minute: Input + output token budget per minute
+            clock: Monotonic clock in seconds
+            sleep: Async sleep used while waiting for budget
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._clock = clock
+        self._sleep = sleep
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = clock()
+        self.acquired = 0
+        self.waits = 0
+        self.waited_seconds = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.requests_per_minute or self.tokens_per_minute)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.requests_per_minute:
+            self._requests = min(self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60)
+        if self.tokens_per_minute:
+            self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+
+    async def acquire(self, tokens: int = 0) -> float:
+        """Wait until one request of about ``tokens`` tokens fits the budget.
+
+        Args:
+            tokens: Estimated input + output tokens of the request
+
+        Returns:
+            Seconds spent waiting
+        """
+        if not self.enabled:
+            return 0.0
+
+        # Never wait for more tokens than a full bucket holds
+        tokens = min(tokens, self.tokens_per_minute) if self.tokens_per_minute else 0
+        waited = 0.0
+        while True:
+            self._refill()
+            wait = 0.0
+            if self.requests_per_minute and self._requests < 1:
+                wait = (1 - self._requests) * 60 / self.requests_per_minute
+            if self.tokens_per_minute and self._tokens < tokens:
+                wait = max(wait, (tokens - self._tokens) * 60 / self.tokens_per_minute)
+
+            if wait <= 0:
+                # Check and take happen without an await, so callers on the
+                # same event loop cannot both take the last unit of budget
+                if self.requests_per_minute:
+                    self._requests -= 1
+                self._tokens -= tokens
+                self.acquired += 1
+                if waited:
+                    self.waits += 1
+                    self.waited_seconds += waited
+                return waited
+
+            await self._sleep(wait)
+            waited += wait
+
+    def record(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """Correct the token budget once the real usage of a request is known."""
+        if self.tokens_per_minute:
+            self._tokens -= actual_tokens - min(estimated_tokens, self.tokens_per_minute)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limiter statistics."""
+        return {
+            "requestsPerMinute": self.requests_per_minute,
+            "tokensPerMinute": self.tokens_per_minute,
+            "acquired": self.acquired,
+            "waits": self.waits,
+            "waitedSeconds": round(self.waited_seconds, 3),
+        }
+
+
+_limiters: Dict[str, RateLimiter] = {}
+
+
+def get_rate_limiter(provider_name: str) -> RateLimiter:
+    """Limiter shared by every caller of one provider (limits from settings)."""
+    if provider_name not in _limiters:
+        _limiters[provider_name] = RateLimiter(
+            requests_per_minute=settings.LLM_RATE_LIMIT_RPM,
+            tokens_per_minute=settings.LLM_RATE_LIMIT_TPM,
+        )
+    return _limiters[provider_name]
@@ -0,0 +1,177 @@
+"""Fingerprint-keyed cache of model responses.
+
+Re-uploading the same spreadsheet produces the same prompts; serving those
+from cache avoids paying for identical completions again. Responses are keyed
+by a hash of everything that shapes the completion (provider, model, system
+prompt, prompt, temperature, max_tokens). The memory tier is an LRU; an
+optional SQLite file keeps responses across restarts and worker processes.
+Entries expire after a TTL.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config.settings import settings
+
+
+def response_key(
+    provider: str,
+    model: str,
+    system_prompt: Optional[str],
+    prompt: str,
+    temperature: float,
+    max_tokens: int,
+) -> str:
+    """Cache key for one inference request."""
+    fingerprint = json.dumps(
+        [provider, model, system_prompt or "", prompt, float(temperature), int(max_tokens)],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier (memory LRU + optional SQLite) store of inference responses."""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        disk_path: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize cache.
+
+        Args:
+            max_entries: Responses kept in memory (defaults to settings.LLM_CACHE_SIZE)
+            ttl_seconds: Seconds a response stays valid (defaults to
+                settings.LLM_CACHE_TTL; 0 keeps responses until evicted)
+            disk_path: SQLite file for the persistent tier (None disables it)
+            clock: Wall clock in seconds (expiry times are shared with disk)
+        """
+        self.max_entries = max_entries if max_entries is not None else settings.LLM_CACHE_SIZE
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.LLM_CACHE_TTL
+        self.disk_path = disk_path
+        self._clock = clock
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.expired = 0
+
+        if disk_path:
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, response TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a response, promoting disk hits into memory.
+
+        Args:
+            key: Key from response_key()
+
+        Returns:
+            Copy of the cached response, or None if missing or expired
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if self._is_live(entry[0], now):
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return dict(entry[1])
+                del self._memory[key]
+                self.expired += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT response, expires_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    if self._is_live(row[1], now):
+                        response = json.loads(row[0])
+                        self._remember(key, row[1], response)
+                        self.disk_hits += 1
+                        return dict(response)
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._db.commit()
+                    if entry is None:
+                        self.expired += 1
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        """Store a response in memory and, if enabled, on disk."""
+        expires_at = self._clock() + self.ttl_seconds if self.ttl_seconds else 0.0
+        response = dict(response)
+        with self._lock:
+            self._remember(key, expires_at, response)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(response), expires_at),
+                )
+                self._db.commit()
+
+    @staticmethod
+    def _is_live(expires_at: float, now: float) -> bool:
+        return not expires_at or expires_at > now
+
+    def _remember(self, key: str, expires_at: float, response: Dict[str, Any]) -> None:
+        self._memory[key] = (expires_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop the memory tier and reset counters (disk tier is kept)."""
+        with self._lock:
+            self._memory.clear()
+            self.hits = self.disk_hits = self.misses = self.expired = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._memory),
+            "maxEntries": self.max_entries,
+            "ttlSeconds": self.ttl_seconds,
+            "hits": self.hits,
+            "diskHits": self.disk_hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hitRate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "diskPath": self.disk_path,
+        }
+
+    def close(self) -> None:
+        """Close the disk tier."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+_shared_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Process-wide cache shared by every agent (None if LLM_CACHE_ENABLED is off)."""
+    global _shared_cache
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    if _shared_cache is None:
+        _shared_cache = ResponseCache(disk_path=settings.LLM_CACHE_PATH or None)
+    return _shared_cache
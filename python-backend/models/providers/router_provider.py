@@ -0,0 +1,349 @@
+"""Composite provider routing calls across several backends.
+
+Each backend is a provider (optionally pinned to a model). The router keeps
+rolling latency and error statistics per backend, sends every call to the
+fastest healthy one, fails over to the next on errors and, when the chosen
+backend is slower than its own p95, starts a hedged duplicate on the runner-up
+and returns whichever answers first. Tail latency from an occasional slow
+upstream response is then bounded by the p95 plus the second backend's time.
+Streams are ranked by their own time-to-first-chunk window, since a full
+stream duration says more about the answer's length than about the backend.
+Every upstream call (failovers and hedges included) is charged to the rate
+limiter of the backend's own provider pool.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Sequence
+
+from config.settings import settings
+from models.providers.base import ModelProvider
+from models.providers.rate_limit import RateLimiter, estimate_tokens, get_rate_limiter, usage_tokens
+
+
+class RouteTarget:
+    """One backend with its rolling latency and health statistics."""
+
+    def __init__(
+        self,
+        provider: ModelProvider,
+        model: Optional[str] = None,
+        name: Optional[str] = None,
+        window: Optional[int] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        """Initialize target.
+
+        Args:
+            provider: Backend provider
+            model: Model sent to this backend (None keeps the caller's model)
+            name: Label used in stats (defaults to "pool_name[:model]")
+            window: Successful call latencies kept per window (defaults to
+                settings.LLM_ROUTER_WINDOW)
+            rate_limiter: Limiter calls to this backend are charged to
+                (defaults to the one shared by the provider's pool)
+        """
+        self.provider = provider
+        self.model = model
+        self.name = name or (f"{provider.pool_name}:{model}" if model else provider.pool_name)
+        self.rate_limiter = rate_limiter or get_rate_limiter(provider.pool_name)
+        self.latencies: Deque[float] = deque(maxlen=window or settings.LLM_ROUTER_WINDOW)
+        # Time to first chunk of streamed calls, kept apart from full call latencies
+        self.first_chunk_latencies: Deque[float] = deque(maxlen=window or settings.LLM_ROUTER_WINDOW)
+        self.requests = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.wins = 0
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+
+    def record_success(self, latency: float, stream: bool = False) -> None:
+        self.requests += 1
+        (self.first_chunk_latencies if stream else self.latencies).append(latency)
+        self.consecutive_failures = 0
+
+    def record_failure(self, now: float) -> None:
+        self.requests += 1
+        self.errors += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= settings.LLM_ROUTER_MAX_FAILURES:
+            self.unhealthy_until = now + settings.LLM_ROUTER_COOLDOWN
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.unhealthy_until
+
+    def quantile(self, q: float, stream: bool = False) -> Optional[float]:
+        """Latency quantile over the window (None without samples).
+
+        Args:
+            q: Quantile between 0 and 1
+            stream: Use the time-to-first-chunk window of streamed calls
+        """
+        window = self.first_chunk_latencies if stream else self.latencies
+        if not window:
+            return None
+        ordered = sorted(window)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def get_stats(self, now: float) -> Dict[str, Any]:
+        p50, p95 = self.quantile(0.5), self.quantile(0.95)
+        first_chunk = self.quantile(0.5, stream=True)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "wins": self.wins,
+            "healthy": self.healthy(now),
+            "p50Ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95Ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "firstChunkP50Ms": round(first_chunk * 1000, 1) if first_chunk is not None else None,
+        }
+
+
+class RouterProvider(ModelProvider):
+    """Routes each call to the fastest healthy backend, with failover and hedging."""
+
+    pool_name = "router"
+    rate_limits_upstream = True
+
+    def __init__(
+        self,
+        targets: Sequence[RouteTarget],
+        hedge: Optional[bool] = None,
+        hedge_quantile: Optional[float] = None,
+        hedge_min_samples: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize router.
+
+        Args:
+            targets: Backends in order of preference while no latencies are known
+            hedge: Send a hedged duplicate to the runner-up when the chosen
+                backend exceeds its latency quantile (defaults to settings.LLM_HEDGE_ENABLED)
+            hedge_quantile: Quantile used as hedge delay (defaults to settings.LLM_HEDGE_QUANTILE)
+            hedge_min_samples: Latencies needed before hedging (defaults to
+                settings.LLM_HEDGE_MIN_SAMPLES)
+            clock: Monotonic clock in seconds
+        """
+        super().__init__()
+        if not targets:
+            raise ValueError("RouterProvider needs at least one target")
+        self.targets = list(targets)
+        self.hedge = settings.LLM_HEDGE_ENABLED if hedge is None else hedge
+        self.hedge_quantile = hedge_quantile or settings.LLM_HEDGE_QUANTILE
+        self.hedge_min_samples = hedge_min_samples or settings.LLM_HEDGE_MIN_SAMPLES
+        self._clock = clock
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.failovers = 0
+
+    def _ranked_targets(self, stream: bool = False) -> List[RouteTarget]:
+        """Healthy targets, fastest median first (unmeasured ones are tried first).
+
+        When every target is cooling down, all of them are returned so a call
+        is still attempted.
+
+        Args:
+            stream: Rank by time to first chunk instead of full call latency
+        """
+        now = self._clock()
+        healthy = [t for t in self.targets if t.healthy(now)] or list(self.targets)
+        order = {id(t): i for i, t in enumerate(self.targets)}
+        return sorted(healthy, key=lambda t: (t.quantile(0.5, stream) or 0.0, order[id(t)]))
+
+    def _hedge_delay(self, target: RouteTarget) -> Optional[float]:
+        if not self.hedge or len(target.latencies) < self.hedge_min_samples:
+            return None
+        return target.quantile(self.hedge_quantile)
+
+    @staticmethod
+    def _estimate(kwargs: Dict[str, Any]) -> int:
+        """Rate limit estimate of one upstream call (prompt plus output limit)."""
+        return estimate_tokens(kwargs.get("system_prompt"), kwargs.get("prompt")) + kwargs.get("max_tokens", 0)
+
+    async def _call(self, target: RouteTarget, model: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        estimated = self._estimate(kwargs)
+        try:
+            await target.rate_limiter.acquire(estimated)
+            started = self._clock()
+            response = await target.provider.inference(model=target.model or model, **kwargs)
+        except asyncio.CancelledError:
+            # Lost a hedge race; says nothing about the backend's health
+            target.cancelled += 1
+            raise
+        except Exception:
+            target.record_failure(self._clock())
+            raise
+        target.record_success(self._clock() - started)
+        target.rate_limiter.record(estimated, usage_tokens(response.get("usage", {})))
+        return response
+
+    async def inference(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Run inference on the best backend.
+
+        Args:
+            prompt: User prompt/query
+            model: Requested model (targets pinned to a model override it)
+            system_prompt: Optional system message
+            max_tokens: Maximum tokens in response
+            temperature: Sampling temperature (0-1)
+            **kwargs: Additional provider-specific arguments
+
+        Returns:
+            Response dict of the backend that answered, plus "provider"
+            naming that backend
+
+        Raises:
+            ValueError: If every backend failed
+        """
+        call_kwargs = dict(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            **kwargs,
+        )
+        queue = self._ranked_targets()
+        pending: Dict["asyncio.Task[Dict[str, Any]]", RouteTarget] = {}
+        errors: List[str] = []
+        hedged = False
+
+        def launch() -> RouteTarget:
+            target = queue.pop(0)
+            pending[asyncio.ensure_future(self._call(target, model, call_kwargs))] = target
+            return target
+
+        primary = launch()
+        try:
+            while pending:
+                timeout = None
+                if not hedged and queue and len(pending) == 1:
+                    timeout = self._hedge_delay(primary)
+
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # The chosen backend is slower than usual: race the runner-up
+                    hedged = True
+                    self.hedges += 1
+                    launch()
+                    continue
+
+                for task in done:
+                    target = pending.pop(task)
+                    if task.exception() is None:
+                        self._track_request(success=True)
+                        target.wins += 1
+                        if hedged and target is not primary:
+                            self.hedge_wins += 1
+                        return {**task.result(), "provider": target.name}
+                    errors.append(f"{target.name}: {task.exception()}")
+
+                if not pending and queue:
+                    self.failovers += 1
+                    primary = launch()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        self._track_request(success=False)
+        raise ValueError(f"All model providers failed: {'; '.join(errors)}")
+
+    async def stream_inference(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream from the best backend, failing over until the first delta.
+
+        Streams are not hedged: once output has reached the caller a second
+        backend cannot take over. Backends are ranked and measured by time to
+        first chunk.
+        """
+        errors: List[str] = []
+        estimated = self._estimate({"system_prompt": system_prompt, "prompt": prompt, "max_tokens": max_tokens})
+        for index, target in enumerate(self._ranked_targets(stream=True)):
+            if index:
+                self.failovers += 1
+            first_chunk: Optional[float] = None
+            streamed = False
+            try:
+                await target.rate_limiter.acquire(estimated)
+                started = self._clock()
+                async for event in target.provider.stream_inference(
+                    prompt=prompt,
+                    model=target.model or model,
+                    system_prompt=system_prompt,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    **kwargs,
+                ):
+                    if event["type"] == "done":
+                        target.rate_limiter.record(estimated, usage_tokens(event.get("usage", {})))
+                        event = {**event, "provider": target.name}
+                    if first_chunk is None:
+                        first_chunk = self._clock() - started
+                    streamed = True
+                    yield event
+            except Exception as e:
+                target.record_failure(self._clock())
+                if streamed:
+                    self._track_request(success=False)
+                    raise
+                errors.append(f"{target.name}: {e}")
+                continue
+
+            target.record_success(first_chunk if first_chunk is not None else self._clock() - started, stream=True)
+            target.wins += 1
+            self._track_request(success=True)
+            return
+
+        self._track_request(success=False)
+        raise ValueError(f"All model providers failed: {'; '.join(errors)}")
+
+    async def list_models(self) -> List[Dict[str, Any]]:
+        """Models of every backend (first occurrence of an id wins)."""
+        models: Dict[str, Dict[str, Any]] = {}
+        for target in self.targets:
+            try:
+                for entry in await target.provider.list_models():
+                    models.setdefault(entry["id"], entry)
+            except Exception:
+                continue
+        return list(models.values())
+
+    async def health_check(self) -> bool:
+        """True if any backend is healthy."""
+        for target in self._ranked_targets():
+            try:
+                if await target.provider.health_check():
+                    return True
+            except Exception:
+                continue
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Router statistics plus per-backend latency and health."""
+        now = self._clock()
+        return {
+            **super().get_stats(),
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "failovers": self.failovers,
+            "targets": {target.name: target.get_stats(now) for target in self.targets},
+        }
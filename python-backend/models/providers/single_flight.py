@@ -0,0 +1,171 @@
+"""Single-flight coalescing of identical in-flight model calls.
+
+When several users upload the same spreadsheet, or the frontend retries,
+identical inference calls run at the same time and each is billed. Calls with
+the same request fingerprint that overlap in time share one upstream request.
+Nothing is kept once the request completes; repeated calls later in time are
+the response cache's job.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from models.providers.base import ModelProvider
+from models.providers.response_cache import response_key
+
+
+class _Flight:
+    """One upstream request and the callers waiting on it."""
+
+    def __init__(self, task: "asyncio.Task[Any]", loop: asyncio.AbstractEventLoop):
+        self.task = task
+        self.loop = loop
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time; overlapping callers share it."""
+
+    def __init__(self) -> None:
+        self._flights: Dict[str, _Flight] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.abandoned = 0
+
+    async def do(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Await call(), or the identical call already in flight.
+
+        The upstream call runs in its own task, so cancelling the caller that
+        started it (the leader) does not cancel it for the others. It is
+        cancelled only once every waiting caller has gone away.
+
+        Args:
+            key: Request fingerprint
+            call: Zero-argument coroutine factory making the upstream call
+
+        Returns:
+            The call's result (shared by every caller of the flight)
+        """
+        loop = asyncio.get_running_loop()
+        flight = self._flights.get(key)
+        if flight is None or flight.loop is not loop or flight.task.done():
+            flight = _Flight(asyncio.ensure_future(call()), loop)
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _, f=flight: self._forget(key, f))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            # shield: a cancelled waiter must not cancel the shared task
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+                self.abandoned += 1
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.task.cancelled():
+            # Mark the exception retrieved even if every waiter was cancelled
+            flight.task.exception()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics."""
+        calls = self.leaders + self.coalesced
+        return {
+            "inFlight": len(self._flights),
+            "upstreamCalls": self.leaders,
+            "coalesced": self.coalesced,
+            "abandoned": self.abandoned,
+            "coalescedRate": round(self.coalesced / calls, 4) if calls else 0.0,
+        }
+
+
+_groups: Dict[str, SingleFlight] = {}
+
+
+def get_single_flight(provider_name: str) -> SingleFlight:
+    """Coalescing group shared by every caller of one provider."""
+    if provider_name not in _groups:
+        _groups[provider_name] = SingleFlight()
+    return _groups[provider_name]
+
+
+class CoalescingProvider(ModelProvider):
+    """Wraps a provider so identical concurrent inference calls share one request."""
+
+    def __init__(self, provider: ModelProvider, group: Optional[SingleFlight] = None):
+        """Initialize wrapper.
+
+        Args:
+            provider: Provider making the upstream calls
+            group: Coalescing group (defaults to the one shared by the
+                provider's pool_name)
+        """
+        super().__init__(provider.api_key)
+        self.provider = provider
+        # Same pool, rate limiter and response cache keys as the wrapped provider
+        self.pool_name = provider.pool_name
+        self.rate_limits_upstream = provider.rate_limits_upstream
+        self.group = group or get_single_flight(provider.pool_name)
+
+    async def inference(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Run inference, joining an identical call already in flight.
+
+        Args:
+            prompt: User prompt/query
+            model: Model ID/name to use
+            system_prompt: Optional system message
+            max_tokens: Maximum tokens in response
+            temperature: Sampling temperature (0-1)
+            **kwargs: Additional provider-specific arguments
+
+        Returns:
+            Response dict (a copy per caller)
+        """
+        key = response_key(self.pool_name, model, system_prompt, prompt, temperature, max_tokens)
+        if kwargs:
+            extra = json.dumps(kwargs, sort_keys=True, default=str)
+            key = hashlib.sha256(f"{key}\0{extra}".encode("utf-8")).hexdigest()
+
+        response = await self.group.do(
+            key,
+            lambda: self.provider.inference(
+                prompt=prompt,
+                model=model,
+                system_prompt=system_prompt,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                **kwargs,
+            ),
+        )
+        return dict(response)
+
+    def stream_inference(self, *args: Any, **kwargs: Any) -> AsyncIterator[Dict[str, Any]]:
+        """Streams are passed through; each caller consumes its own."""
+        return self.provider.stream_inference(*args, **kwargs)
+
+    async def list_models(self) -> List[Dict[str, Any]]:
+        return await self.provider.list_models()
+
+    async def health_check(self) -> bool:
+        return await self.provider.health_check()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Wrapped provider's statistics plus coalescing counters."""
+        return {**self.provider.get_stats(), "coalescing": self.group.get_stats()}
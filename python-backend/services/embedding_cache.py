@@ -0,0 +1,150 @@
+"""Content-hash keyed cache for sentence embeddings.
+
+Vectors are keyed by a hash of the model name and the exact input text, so an
+unchanged context is never re-embedded. The memory tier is an LRU; an optional
+SQLite file keeps vectors across restarts and between worker processes.
+"""
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from config.settings import settings
+
+
+def content_key(model_name: str, text: str) -> str:
+    """Cache key for a model/text pair."""
+    return hashlib.sha256(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Two-tier (memory LRU + optional SQLite) store of float32 vectors."""
+
+    def __init__(self, max_entries: Optional[int] = None, disk_path: Optional[str] = None):
+        """Initialize cache.
+
+        Args:
+            max_entries: Vectors kept in memory (defaults to settings.EMBEDDING_CACHE_SIZE)
+            disk_path: SQLite file for the persistent tier (None disables it)
+        """
+        self.max_entries = max_entries if max_entries is not None else settings.EMBEDDING_CACHE_SIZE
+        self.disk_path = disk_path
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if disk_path:
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._db.commit()
+
+    @property
+    def persistent(self) -> bool:
+        """Whether stored vectors are also written to the SQLite tier."""
+        return self._db is not None
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Look up vectors, promoting disk hits into memory.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Mapping of found keys to (read-only) vectors
+        """
+        found: Dict[str, np.ndarray] = {}
+        missing: List[str] = []
+
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is None:
+                    missing.append(key)
+                else:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+            self.hits += len(found)
+
+            if missing and self._db is not None:
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start:start + 500]
+                    rows = self._db.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                        chunk,
+                    ).fetchall()
+                    for key, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float32)
+                        found[key] = vector
+                        self._remember(key, vector)
+                        self.disk_hits += 1
+
+            self.misses += sum(1 for key in missing if key not in found)
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        """Store vectors in memory and, if enabled, on disk."""
+        if not items:
+            return
+
+        with self._lock:
+            for key, vector in items.items():
+                vector = np.ascontiguousarray(vector, dtype=np.float32)
+                vector.setflags(write=False)
+                self._remember(key, vector)
+
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    [(key, np.asarray(v, dtype=np.float32).tobytes()) for key, v in items.items()],
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop the memory tier and reset counters (disk tier is kept)."""
+        with self._lock:
+            self._memory.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            "entries": len(self._memory),
+            "maxEntries": self.max_entries,
+            "hits": self.hits,
+            "diskHits": self.disk_hits,
+            "misses": self.misses,
+            "diskPath": self.disk_path,
+        }
+
+    def close(self) -> None:
+        """Close the disk tier."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+_shared_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Process-wide cache shared by every EmbeddingGenerator."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = EmbeddingCache(disk_path=settings.EMBEDDING_CACHE_PATH or None)
+    return _shared_cache
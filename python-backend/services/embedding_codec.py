@@ -0,0 +1,108 @@
+"""Compact wire formats for embedding vectors.
+
+Formats:
+    list     JSON list of floats (legacy, largest)
+    float32  base64 of little-endian float32 bytes (lossless)
+    float16  base64 of little-endian float16 bytes
+    int8     base64 of int8 values plus a per-vector scale (v ~= q * scale)
+    omit     no vector, only a handle into the persistent embedding cache
+             (resolved by GET /api/embeddings/{handle})
+"""
+from __future__ import annotations
+
+import base64
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+
+from services.embedding_cache import EmbeddingCache, get_embedding_cache
+
+EMBEDDING_FORMATS = ("list", "float32", "float16", "int8", "omit")
+
+_DTYPES = {"float32": "<f4", "float16": "<f2"}
+
+
+def encode_embedding(vector: np.ndarray, fmt: str = "list", handle: Optional[str] = None) -> Any:
+    """Encode one embedding vector for an API response.
+
+    Args:
+        vector: 1-D embedding
+        fmt: One of EMBEDDING_FORMATS
+        handle: Cache key of the vector (required for "omit")
+
+    Returns:
+        List of floats for "list", otherwise a dict payload
+
+    Raises:
+        ValueError: If the format is unknown or "omit" has no handle
+    """
+    vector = np.asarray(vector, dtype=np.float32)
+
+    if fmt == "list":
+        return vector.tolist()
+
+    if fmt in _DTYPES:
+        data = vector.astype(_DTYPES[fmt]).tobytes()
+        return {"format": fmt, "dim": int(vector.size), "data": base64.b64encode(data).decode("ascii")}
+
+    if fmt == "int8":
+        peak = float(np.abs(vector).max()) if vector.size else 0.0
+        scale = peak / 127.0 if peak else 1.0
+        quantized = np.clip(np.rint(vector / scale), -127, 127).astype(np.int8)
+        return {
+            "format": "int8",
+            "dim": int(vector.size),
+            "scale": scale,
+            "data": base64.b64encode(quantized.tobytes()).decode("ascii"),
+        }
+
+    if fmt == "omit":
+        if not handle:
+            raise ValueError("Embedding handle required for 'omit' format")
+        return {"format": "omit", "dim": int(vector.size), "handle": handle}
+
+    raise ValueError(f"Unsupported embedding format: {fmt}")
+
+
+def decode_embedding(payload: Any, cache: Optional[EmbeddingCache] = None) -> np.ndarray:
+    """Decode any encode_embedding() payload back to a float32 vector.
+
+    Args:
+        payload: Encoded embedding
+        cache: Cache used to resolve "omit" handles (shared cache by default)
+
+    Returns:
+        float32 vector (int8 payloads are dequantized)
+
+    Raises:
+        KeyError: If an "omit" handle is no longer cached
+        ValueError: If the payload format is unknown
+    """
+    if isinstance(payload, list):
+        return np.asarray(payload, dtype=np.float32)
+
+    fmt = payload.get("format")
+    if fmt in _DTYPES:
+        return np.frombuffer(base64.b64decode(payload["data"]), dtype=_DTYPES[fmt]).astype(np.float32)
+
+    if fmt == "int8":
+        quantized = np.frombuffer(base64.b64decode(payload["data"]), dtype=np.int8)
+        return quantized.astype(np.float32) * np.float32(payload["scale"])
+
+    if fmt == "omit":
+        handle = payload["handle"]
+        found = (cache or get_embedding_cache()).get_many([handle])
+        if handle not in found:
+            raise KeyError(f"Embedding handle not found: {handle}")
+        return np.asarray(found[handle], dtype=np.float32)
+
+    raise ValueError(f"Unsupported embedding format: {fmt}")
+
+
+def decode_embeddings(payloads: Sequence[Any], cache: Optional[EmbeddingCache] = None) -> np.ndarray:
+    """Decode several payloads into one float32 matrix (for similarity search)."""
+    vectors: List[np.ndarray] = [decode_embedding(payload, cache) for payload in payloads]
+    if not vectors:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.ascontiguousarray(np.vstack(vectors), dtype=np.float32)
+
@@ -0,0 +1,354 @@
+"""Entity resolution for stakeholder profiles.
+
+Profiles are keyed by a lightly normalized name, so "J. Smith", "John Smith"
+and "jsmith@corp" end up as separate stakeholders. The resolver embeds every
+profile name into a hashed character/token feature space, finds candidate
+pairs with a random-hyperplane LSH index (no all-pairs comparison), and
+merges pairs whose name similarity, name structure and context embedding
+similarity all agree.
+"""
+from __future__ import annotations
+
+import math
+import re
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from config.settings import settings
+
+# Punctuation and separators dropped when canonicalizing a name
+NAME_SEPARATOR_PATTERN = re.compile(r"[\s._\-]+")
+
+# Rows compared per block in exact mode, so memory stays at block x n
+EXACT_BLOCK_ROWS = 256
+
+
+def name_tokens(name: str) -> List[str]:
+    """Canonical tokens of a name ("J. Smith" -> ["j", "smith"], "jsmith@corp" -> ["jsmith"])."""
+    local = name.strip().lower().split("@", 1)[0]
+    return [token for token in NAME_SEPARATOR_PATTERN.split(local) if token]
+
+
+def name_match_strength(a: Sequence[str], b: Sequence[str]) -> int:
+    """How strongly two tokenized names can refer to the same person.
+
+    Returns:
+        2 for the same tokens or a handle spelling out first+last (or
+        last+first); 1 for matches that rely on an initial ("J. Smith" and
+        "jsmith" vs "John Smith"); 0 if incompatible. Full names must share
+        the last token.
+    """
+    if list(a) == list(b):
+        return 2
+    if not a or not b or (len(a) == 1 and len(b) == 1):
+        return 0
+
+    if len(a) == 1 or len(b) == 1:
+        handle, full = (a[0], b) if len(a) == 1 else (b[0], a)
+        first, last = full[0], full[-1]
+        if handle in {first + last, last + first}:
+            return 2
+        return 1 if handle in {first[0] + last, last + first[0]} else 0
+
+    if a[-1] != b[-1]:
+        return 0
+    first_a, first_b = a[0], b[0]
+    if first_a == first_b:
+        return 2
+    if (len(first_a) == 1 and first_b.startswith(first_a)) or (len(first_b) == 1 and first_a.startswith(first_b)):
+        return 1
+    return 0
+
+
+def names_compatible(a: Sequence[str], b: Sequence[str]) -> bool:
+    """Whether two tokenized names can refer to the same person."""
+    return name_match_strength(a, b) > 0
+
+
+def name_vectors(names: Sequence[str], dim: int = 256) -> np.ndarray:
+    """Hashed feature embeddings of names, L2-normalized.
+
+    Features are tokens and their character trigrams plus heavily weighted
+    surname and initial+surname keys, which every variant of a name shares
+    ("Anna Kovacs", "A. Kovacs" and "akovacs" have cosine ~0.94).
+
+    Args:
+        names: Raw names
+        dim: Embedding dimension
+
+    Returns:
+        float32 matrix of shape (len(names), dim)
+    """
+    matrix = np.zeros((len(names), dim), dtype=np.float32)
+    for row, name in enumerate(names):
+        tokens = name_tokens(name)
+        features: List[Tuple[str, float]] = []
+        for token in tokens:
+            features.append((f"t:{token}", 0.5))
+            padded = f"^{token}$"
+            features.extend((f"g:{padded[i:i + 3]}", 0.3) for i in range(len(padded) - 2))
+        if len(tokens) > 1:
+            first, last = tokens[0], tokens[-1]
+            features.extend([(f"s:{last}", 3.0), (f"k:{first[0]}{last}", 3.0), (f"k:{first}{last}", 1.0)])
+        elif tokens:
+            # Handles are usually initial + surname ("akovacs")
+            features.extend([(f"k:{tokens[0]}", 3.0), (f"s:{tokens[0][1:]}", 3.0)])
+
+        for feature, weight in features:
+            matrix[row, zlib.crc32(feature.encode("utf-8")) % dim] += weight
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+class LSHIndex:
+    """Random-hyperplane LSH over unit vectors (approximate cosine neighbours)."""
+
+    def __init__(self, num_tables: int = 16, num_bits: Optional[int] = None, seed: int = 13):
+        """Configure index.
+
+        Args:
+            num_tables: Independent hash tables (more tables, higher recall)
+            num_bits: Hyperplanes per table; None picks ~log2(n / 8) at build
+                time so buckets stay small as n grows
+            seed: Seed for the random hyperplanes
+        """
+        self.num_tables = num_tables
+        self.num_bits = num_bits
+        self.seed = seed
+        self._codes: List[np.ndarray] = []
+        self._count = 0
+
+    def build(self, vectors: np.ndarray) -> "LSHIndex":
+        """Hash every row of vectors into each table (rows should be unit length)."""
+        count, dim = vectors.shape
+        bits = self.num_bits or min(16, max(4, math.ceil(math.log2(max(count, 1) / 8))))
+        planes = np.random.default_rng(self.seed).standard_normal((self.num_tables, dim, bits)).astype(np.float32)
+        weights = 1 << np.arange(bits, dtype=np.int64)
+
+        self._count = count
+        self._codes = [((vectors @ planes[table]) > 0).astype(np.int64) @ weights for table in range(self.num_tables)]
+        return self
+
+    def candidate_pairs(self) -> np.ndarray:
+        """Distinct row pairs (i < j) sharing a bucket in at least one table.
+
+        Returns:
+            int64 array of shape (pairs, 2)
+        """
+        keys = []
+        triangles: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        for codes in self._codes:
+            order = np.argsort(codes, kind="stable")
+            bounds = np.flatnonzero(np.diff(codes[order])) + 1
+            for members in np.split(order, bounds):
+                size = len(members)
+                if size > 1:
+                    if size not in triangles:
+                        triangles[size] = np.triu_indices(size, k=1)
+                    rows, cols = triangles[size]
+                    keys.append(members[rows] * self._count + members[cols])
+
+        if not keys:
+            return np.zeros((0, 2), dtype=np.int64)
+        merged = np.sort(np.concatenate(keys))
+        unique = merged[np.concatenate(([True], merged[1:] != merged[:-1]))]
+        return np.stack([unique // self._count, unique % self._count], axis=1)
+
+
+class EntityResolver:
+    """Merges stakeholder profiles that refer to the same person."""
+
+    def __init__(
+        self,
+        embedder: Any = None,
+        name_threshold: Optional[float] = None,
+        context_threshold: Optional[float] = None,
+        num_tables: Optional[int] = None,
+        exact_limit: Optional[int] = None,
+    ):
+        """Initialize resolver.
+
+        Args:
+            embedder: EmbeddingGenerator for context similarity (None skips
+                the context check)
+            name_threshold: Minimum cosine similarity of name embeddings
+            context_threshold: Minimum cosine similarity of context embeddings
+                (applied when both profiles have a context embedding)
+            num_tables: LSH hash tables
+            exact_limit: Profile count up to which all pairs are compared
+                exactly instead of using the LSH index
+        """
+        self.embedder = embedder
+        self.name_threshold = name_threshold if name_threshold is not None else settings.ENTITY_RESOLUTION_NAME_THRESHOLD
+        self.context_threshold = (
+            context_threshold if context_threshold is not None else settings.ENTITY_RESOLUTION_CONTEXT_THRESHOLD
+        )
+        self.num_tables = num_tables or settings.ENTITY_RESOLUTION_LSH_TABLES
+        self.exact_limit = exact_limit if exact_limit is not None else settings.ENTITY_RESOLUTION_EXACT_LIMIT
+        self.last_stats: Dict[str, Any] = {}
+
+    def resolve(self, profiles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Merge near-duplicate profiles.
+
+        Args:
+            profiles: Profiles built by StakeholderService (before enrichment)
+
+        Returns:
+            Profiles with duplicates folded into the first (most frequent)
+            profile of each cluster, in their original order
+        """
+        clusters = self.find_clusters(profiles)
+        resolved = []
+        for members in clusters:
+            ranked = sorted(members, key=lambda i: (-self._weight(profiles[i]), i))
+            resolved.append((min(members), self._merge([profiles[i] for i in ranked])))
+
+        self.last_stats["merged"] = len(profiles) - len(clusters)
+        return [profile for _, profile in sorted(resolved, key=lambda item: item[0])]
+
+    def find_clusters(self, profiles: List[Dict[str, Any]]) -> List[List[int]]:
+        """Group profile indices that refer to the same person."""
+        count = len(profiles)
+        self.last_stats = {"profiles": count, "candidatePairs": 0, "mode": "exact" if count <= self.exact_limit else "lsh"}
+        if count < 2:
+            return [[i] for i in range(count)]
+
+        names = [profile.get("name") or profile["id"] for profile in profiles]
+        tokens = [name_tokens(name) for name in names]
+        vectors = name_vectors(names)
+
+        if count <= self.exact_limit:
+            parts = []
+            for start in range(0, count, EXACT_BLOCK_ROWS):
+                # Each row only against itself and later rows (upper triangle)
+                block = vectors[start:start + EXACT_BLOCK_ROWS] @ vectors[start:].T
+                block_rows, block_cols = np.nonzero(np.triu(block >= self.name_threshold, k=1))
+                parts.append((block_rows + start, block_cols + start, block[block_rows, block_cols]))
+            rows, cols, similarity = (np.concatenate(part) for part in zip(*parts))
+            self.last_stats["candidatePairs"] = count * (count - 1) // 2
+        else:
+            pairs = LSHIndex(self.num_tables).build(vectors).candidate_pairs()
+            rows, cols = pairs[:, 0], pairs[:, 1]
+            similarity = np.concatenate(
+                [
+                    np.einsum("ij,ij->i", vectors[rows[start:start + 65536]], vectors[cols[start:start + 65536]])
+                    for start in range(0, len(pairs), 65536)
+                ]
+                or [np.zeros(0, dtype=np.float32)]
+            )
+            keep = similarity >= self.name_threshold
+            rows, cols, similarity = rows[keep], cols[keep], similarity[keep]
+            self.last_stats["candidatePairs"] = len(pairs)
+
+        candidates = []
+        for score, i, j in zip(similarity.tolist(), rows.tolist(), cols.tolist()):
+            strength = name_match_strength(tokens[i], tokens[j])
+            if strength:
+                candidates.append((strength, score, i, j))
+        if not candidates:
+            return [[i] for i in range(count)]
+
+        contexts = self._context_vectors(profiles, {c[2] for c in candidates} | {c[3] for c in candidates})
+        candidates = [c for c in candidates if self._context_match(contexts, c[2], c[3])]
+
+        parent = list(range(count))
+        members: Dict[int, List[int]] = {i: [i] for i in range(count)}
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        def union(i: int, j: int) -> None:
+            root_i, root_j = find(i), find(j)
+            if root_i == root_j:
+                return
+            # Every member of both clusters must stay compatible, so a merged
+            # cluster never holds both "John Smith" and "Jane Smith"
+            if all(names_compatible(tokens[a], tokens[b]) for a in members[root_i] for b in members[root_j]):
+                parent[root_j] = root_i
+                members[root_i].extend(members.pop(root_j))
+
+        # Unambiguous matches first, strongest pairs first
+        for _, _, i, j in sorted((c for c in candidates if c[0] == 2), key=lambda c: (-c[1], c[2], c[3])):
+            union(i, j)
+
+        # An initial-based match merges only if every other candidate of the
+        # abbreviated name already belongs to one cluster
+        partners: Dict[int, Set[int]] = {}
+        for _, _, i, j in candidates:
+            partners.setdefault(i, set()).add(j)
+            partners.setdefault(j, set()).add(i)
+        for _, _, i, j in sorted((c for c in candidates if c[0] == 1), key=lambda c: (-c[1], c[2], c[3])):
+            short = i if self._abbreviated(tokens[i], tokens[j]) else j
+            if len({find(p) for p in partners[short]} - {find(short)}) == 1:
+                union(i, j)
+
+        return [sorted(group) for group in sorted(members.values(), key=min)]
+
+    @staticmethod
+    def _abbreviated(a: Sequence[str], b: Sequence[str]) -> bool:
+        """Whether a is the shorter (initial or handle) form in an initial-based match."""
+        return len(a) < len(b) or (len(a) == len(b) and len(a[0]) < len(b[0]))
+
+    def _context_vectors(self, profiles: List[Dict[str, Any]], rows: Set[int]) -> Dict[int, np.ndarray]:
+        """Unit context embeddings of the given profiles (empty if unavailable)."""
+        if self.embedder is None:
+            return {}
+
+        rows_list = sorted(rows)
+        # Same text the NLP stage embeds later, so the cache is reused
+        texts = [" ".join(m["snippet"] for m in profiles[i].get("mentions", []))[:2000] for i in rows_list]
+        matrix = self.embedder.embed_many(texts)
+        if not matrix.shape[1]:
+            return {}
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+        return {i: matrix[row] for row, i in enumerate(rows_list) if norms[row, 0] > 0}
+
+    def _context_match(self, contexts: Dict[int, np.ndarray], i: int, j: int) -> bool:
+        if i not in contexts or j not in contexts:
+            return True
+        return float(contexts[i] @ contexts[j]) >= self.context_threshold
+
+    @staticmethod
+    def _weight(profile: Dict[str, Any]) -> int:
+        return len(profile.get("mentions", [])) + len(profile.get("assignments", []))
+
+    @staticmethod
+    def _merge(ranked: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Fold profiles into the first one, de-duplicating mentions, assignments and roles."""
+        merged = ranked[0]
+        if len(ranked) == 1:
+            return merged
+
+        seen_mentions = {(m["index"], tuple(m.get("snippetOffsets", ()))) for m in merged["mentions"]}
+        seen_assignments = {a.get("ticketId") for a in merged["assignments"] if a.get("ticketId") is not None}
+        aliases = merged.setdefault("aliases", [])
+
+        for profile in ranked[1:]:
+            aliases.append(profile["id"])
+            aliases.extend(profile.get("aliases", []))
+            merged["originalNames"].extend(profile["originalNames"])
+            merged["roles"].extend(profile.get("roles", []))
+            for mention in profile["mentions"]:
+                key = (mention["index"], tuple(mention.get("snippetOffsets", ())))
+                if key not in seen_mentions:
+                    seen_mentions.add(key)
+                    merged["mentions"].append(mention)
+            for assignment in profile["assignments"]:
+                ticket_id = assignment.get("ticketId")
+                if ticket_id is None or ticket_id not in seen_assignments:
+                    seen_assignments.add(ticket_id)
+                    merged["assignments"].append(assignment)
+
+        merged["roles"] = list(dict.fromkeys(merged["roles"]))
+        merged["mentions"].sort(key=lambda m: m["index"])
+        merged["frequency"] = len(merged["mentions"]) + len(merged["assignments"])
+        return merged
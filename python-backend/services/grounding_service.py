@@ -6,8 +6,10 @@ from __future__ import annotations
 
 import re
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence
 
+from config.settings import settings
 from services.compliance_service import ComplianceService
 
 
@@ -107,6 +109,148 @@ class GroundingService:
         Returns:
             Validation result with confidence score
         """
+        assignee = ticket.get("assignee", "Unassigned")
+        epic = ticket.get("epic", "No Epic")
+
+        return self._validate_ticket(
+            ticket,
+            source_data,
+            now=datetime.utcnow(),
+            valid_priorities=self.knowledge_base["ticket_priorities"],
+            valid_types=self.knowledge_base["ticket_types"],
+            assignee_valid=self._is_valid_assignee(assignee),
+            epic_valid=self._is_valid_epic(epic),
+            evaluate_compliance=self.compliance_service.evaluate_ticket,
+        )
+
+    def validate_tickets(
+        self,
+        tickets: Sequence[Dict[str, Any]],
+        source_data: Sequence[Dict[str, Any] | None] | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Validate a batch of tickets column by column.
+
+        Gives the same results as calling validate_ticket() per ticket, but
+        pulls each field into a column first, classifies every distinct
+        assignee/epic once, evaluates compliance once per distinct normalized
+        context (see ComplianceService.batch_evaluator, so tickets may share
+        one compliance dict), uses set lookups for priorities and types and
+        takes a single timestamp for the whole batch.
+
+        Args:
+            tickets: Generated ticket objects
+            source_data: Per-ticket source data, aligned with tickets
+
+        Returns:
+            Validation results in ticket order
+        """
+        if not tickets:
+            return []
+
+        sources = source_data if source_data is not None else [None] * len(tickets)
+        if len(sources) != len(tickets):
+            raise ValueError("source_data must be aligned with tickets")
+
+        now = datetime.utcnow()
+        valid_priorities = frozenset(self.knowledge_base["ticket_priorities"])
+        valid_types = frozenset(self.knowledge_base["ticket_types"])
+
+        assignees = [ticket.get("assignee", "Unassigned") for ticket in tickets]
+        epics = [ticket.get("epic", "No Epic") for ticket in tickets]
+        assignee_results = self._classify_distinct(assignees, self._is_valid_assignee)
+        epic_results = self._classify_distinct(epics, self._is_valid_epic)
+        evaluate_compliance = self.compliance_service.batch_evaluator()
+
+        return [
+            self._validate_ticket(
+                ticket,
+                source,
+                now=now,
+                valid_priorities=valid_priorities,
+                valid_types=valid_types,
+                assignee_valid=(
+                    assignee_results[assignee]
+                    if isinstance(assignee, str)
+                    else self._is_valid_assignee(assignee)
+                ),
+                epic_valid=(
+                    epic_results[epic] if isinstance(epic, str) else self._is_valid_epic(epic)
+                ),
+                evaluate_compliance=evaluate_compliance,
+            )
+            for ticket, source, assignee, epic in zip(tickets, sources, assignees, epics)
+        ]
+
+    @staticmethod
+    def _classify_distinct(values: List[Any], classify: Any) -> Dict[str, bool]:
+        """Run a format check once per distinct string value."""
+        return {value: classify(value) for value in set(v for v in values if isinstance(v, str))}
+
+    def _is_valid_assignee(self, assignee: Any) -> bool:
+        """Check assignee format ("Unassigned" is always valid)."""
+        if assignee == "Unassigned":
+            return True
+        return self._match_assignee_format(assignee)
+
+    def _is_valid_epic(self, epic: Any) -> bool:
+        """Check epic format ("No Epic" is always valid)."""
+        if epic == "No Epic":
+            return True
+        return self._match_epic_format(epic)
+
+    # Format checks are cached at class level so every GroundingService in the
+    # worker (route singletons, upload pool workers) shares one bounded cache.
+    @staticmethod
+    @lru_cache(maxsize=settings.GROUNDING_FORMAT_CACHE_SIZE)
+    def _match_assignee_format(assignee: str) -> bool:
+        return any(pattern.match(assignee) for pattern in GroundingService.ASSIGNEE_PATTERNS)
+
+    @staticmethod
+    @lru_cache(maxsize=settings.GROUNDING_FORMAT_CACHE_SIZE)
+    def _match_epic_format(epic: str) -> bool:
+        return any(pattern.match(epic) for pattern in GroundingService.EPIC_PATTERNS)
+
+    @classmethod
+    def get_format_cache_stats(cls) -> Dict[str, Any]:
+        """Get hit/miss counters of the assignee and epic format caches.
+
+        Returns:
+            Cache statistics keyed by field
+        """
+        stats: Dict[str, Any] = {}
+        for field, cached in (
+            ("assignee", cls._match_assignee_format),
+            ("epic", cls._match_epic_format),
+        ):
+            info = cached.cache_info()
+            lookups = info.hits + info.misses
+            stats[field] = {
+                "hits": info.hits,
+                "misses": info.misses,
+                "hitRate": round(info.hits / lookups, 4) if lookups else 0.0,
+                "size": info.currsize,
+                "maxSize": info.maxsize,
+            }
+        return stats
+
+    @classmethod
+    def clear_format_cache(cls) -> None:
+        """Drop cached format checks and reset their counters."""
+        cls._match_assignee_format.cache_clear()
+        cls._match_epic_format.cache_clear()
+
+    def _validate_ticket(
+        self,
+        ticket: Dict[str, Any],
+        source_data: Dict[str, Any] | None,
+        now: datetime,
+        valid_priorities: Any,
+        valid_types: Any,
+        assignee_valid: bool,
+        epic_valid: bool,
+        evaluate_compliance: Callable[[Dict[str, Any]], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Validate one ticket with format checks already resolved."""
         validation = {
             "isValid": True,
             "confidence": 1.0,
@@ -117,12 +261,12 @@ class GroundingService:
         }
 
         # Validate priority
-        if ticket.get("priority") not in self.knowledge_base["ticket_priorities"]:
+        if ticket.get("priority") not in valid_priorities:
             validation["issues"].append(f"Invalid priority: {ticket.get('priority')}")
             validation["confidence"] -= 0.2
 
         # Validate ticket type
-        if ticket.get("type") not in self.knowledge_base["ticket_types"]:
+        if ticket.get("type") not in valid_types:
             validation["issues"].append(f"Invalid ticket type: {ticket.get('type')}")
             validation["confidence"] -= 0.15
 
@@ -134,32 +278,28 @@ class GroundingService:
             validation["confidence"] -= 0.1
 
         # Validate assignee format
-        assignee = ticket.get("assignee", "Unassigned")
-        if assignee != "Unassigned":
-            is_valid_assignee = any(
-                pattern.match(assignee) for pattern in self.ASSIGNEE_PATTERNS
+        if not assignee_valid:
+            validation["warnings"].append(
+                f"Assignee format may be invalid: {ticket.get('assignee', 'Unassigned')}"
             )
-            if not is_valid_assignee:
-                validation["warnings"].append(f"Assignee format may be invalid: {assignee}")
-                validation["confidence"] -= 0.05
+            validation["confidence"] -= 0.05
 
         # Validate epic format
-        epic = ticket.get("epic", "No Epic")
-        if epic != "No Epic":
-            is_valid_epic = any(pattern.match(epic) for pattern in self.EPIC_PATTERNS)
-            if not is_valid_epic:
-                validation["warnings"].append(f"Epic format may be invalid: {epic}")
-                validation["confidence"] -= 0.05
+        if not epic_valid:
+            validation["warnings"].append(
+                f"Epic format may be invalid: {ticket.get('epic', 'No Epic')}"
+            )
+            validation["confidence"] -= 0.05
 
         # Check for hallucinations
-        hallucination_check = self.detect_hallucination(ticket, source_data or {})
+        hallucination_check = self.detect_hallucination(ticket, source_data or {}, now=now)
         if hallucination_check["detected"]:
             validation["issues"].append(f"Potential hallucination: {hallucination_check['reason']}")
             validation["confidence"] -= 0.3
 
         # Standards compliance validation
         try:
-            compliance = self.compliance_service.evaluate_ticket(ticket)
+            compliance = evaluate_compliance(ticket)
             validation["compliance"] = compliance
 
             if compliance.get("status") == "gap":
@@ -176,7 +316,7 @@ class GroundingService:
             validation["sources"].append(
                 {
                     "type": "excel_data",
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": now.isoformat(),
                     "row": source_data.get("rowIndex", -1),
                 }
             )
@@ -186,13 +326,17 @@ class GroundingService:
         return validation
 
     def detect_hallucination(
-        self, ticket: Dict[str, Any], source_data: Dict[str, Any] | None = None
+        self,
+        ticket: Dict[str, Any],
+        source_data: Dict[str, Any] | None = None,
+        now: Optional[datetime] = None,
     ) -> Dict[str, Any]:
         """Detect potential hallucinations in AI-generated ticket.
 
         Args:
             ticket: Generated ticket
             source_data: Original source data
+            now: Reference time for timestamp checks (defaults to current UTC time)
 
         Returns:
             Hallucination detection result
@@ -220,7 +364,7 @@ class GroundingService:
         if created_at_str:
             try:
                 created_at = datetime.fromisoformat(created_at_str.replace("Z", "+00:00"))
-                now = datetime.utcnow()
+                now = now or datetime.utcnow()
                 one_day_ago = now - timedelta(days=1)
 
                 if created_at > now or created_at < one_day_ago:
@@ -260,6 +404,39 @@ class GroundingService:
             },
         }
 
+    def enhance_tickets_with_grounding(
+        self,
+        tickets: Sequence[Dict[str, Any]],
+        source_data: Sequence[Dict[str, Any] | None] | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Batch version of enhance_with_grounding() built on validate_tickets().
+
+        Args:
+            tickets: Original tickets
+            source_data: Per-ticket source data, aligned with tickets
+
+        Returns:
+            Enhanced tickets with _grounding metadata, in input order
+        """
+        validations = self.validate_tickets(tickets, source_data)
+        timestamp = datetime.utcnow().isoformat()
+
+        return [
+            {
+                **ticket,
+                "_grounding": {
+                    "validated": validation["isValid"],
+                    "confidence": validation["confidence"],
+                    "issues": validation["issues"],
+                    "warnings": validation["warnings"],
+                    "sources": validation["sources"],
+                    "timestamp": timestamp,
+                    "version": "1.0.0",
+                },
+            }
+            for ticket, validation in zip(tickets, validations)
+        ]
+
     def get_grounding_stats(self) -> Dict[str, Any]:
         """Get grounding statistics.
 
@@ -273,6 +450,7 @@ class GroundingService:
                 "priorities": self.knowledge_base["ticket_priorities"],
                 "types": self.knowledge_base["ticket_types"],
             },
+            "formatCache": self.get_format_cache_stats(),
             "lastUpdated": datetime.utcnow().isoformat(),
         }
 
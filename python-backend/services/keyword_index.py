@@ -0,0 +1,225 @@
+"""Compiled multi-keyword matching for rule-based scoring.
+
+Services that score text by counting ``kw in text`` over keyword tables use
+KeywordMatcher to find every keyword occurrence in a single scan. Matching
+keeps plain substring semantics, so hit counts are identical to the loops it
+replaces.
+
+Services register their tables with the shared ``keyword_index`` so that one
+scan of a text answers every registered table, and repeated scans of the same
+text (e.g. one ticket context scored by several rules) are served from cache.
+"""
+from __future__ import annotations
+
+import threading
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, List, Mapping, Optional, Set
+
+from config.settings import settings
+
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+
+class KeywordMatcher:
+    """Finds which keywords of a fixed table occur in a text in one pass.
+
+    Uses a pyahocorasick automaton when available. Otherwise each distinct
+    keyword is checked once with a plain substring scan, which beats both a
+    per-run memo and a regex alternation in pure Python (see
+    benchmarks/bench_keywords.py).
+    """
+
+    def __init__(self, categories: Mapping[Hashable, Iterable[str]]):
+        """Compile keyword table.
+
+        Args:
+            categories: Mapping of category name to its keywords
+        """
+        self.categories: Dict[Hashable, List[str]] = {
+            category: list(keywords) for category, keywords in categories.items()
+        }
+
+        # Keyword -> categories it counts towards (repeated if listed twice)
+        self._keyword_categories: Dict[str, List[Hashable]] = {}
+        for category, keywords in self.categories.items():
+            for keyword in keywords:
+                if keyword:
+                    self._keyword_categories.setdefault(keyword, []).append(category)
+
+        self.keywords: FrozenSet[str] = frozenset(self._keyword_categories)
+
+        self._automaton = None
+        if HAS_AHOCORASICK and self.keywords:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+
+        self._scan_order = tuple(sorted(self.keywords))
+
+    def find(self, text: str) -> Set[str]:
+        """Return the keywords that occur in text (substring match).
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Set of matched keywords
+        """
+        if not text or not self.keywords:
+            return set()
+
+        if self._automaton is not None:
+            return {keyword for _, keyword in self._automaton.iter(text)}
+
+        return {kw for kw in self._scan_order if kw in text}
+
+    def count(self, text: str) -> Dict[Hashable, int]:
+        """Count matched keywords per category.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Mapping of every category to the number of its keywords found
+        """
+        return self.count_found(self.find(text))
+
+    def count_found(self, found: Iterable[str]) -> Dict[Hashable, int]:
+        """Count per category from an already computed find() result."""
+        counts = dict.fromkeys(self.categories, 0)
+        for keyword in found:
+            for category in self._keyword_categories.get(keyword, ()):
+                counts[category] += 1
+        return counts
+
+
+class KeywordScan:
+    """Result of scanning one text against every registered keyword table."""
+
+    def __init__(self, tables: Mapping[str, Mapping[str, List[str]]], matcher: KeywordMatcher, found: FrozenSet[str]):
+        self.found = found
+        self._tables = tables
+        self._matcher = matcher
+        self._counts: Optional[Dict[Hashable, int]] = None
+
+    def count(self, table: str) -> Dict[str, int]:
+        """Number of keywords found per category of a table.
+
+        Args:
+            table: Registered table name
+
+        Returns:
+            Mapping of category to hit count (same as ``sum(kw in text)``)
+        """
+        if self._counts is None:
+            self._counts = self._matcher.count_found(self.found)
+        return {category: self._counts[(table, category)] for category in self._tables[table]}
+
+    def matched(self, table: str, category: str) -> List[str]:
+        """Keywords of a category found in the text, in table order."""
+        return [kw for kw in self._tables[table][category] if kw in self.found]
+
+    def first_category(self, table: str) -> Optional[str]:
+        """First category (in table order) with at least one hit."""
+        for category, count in self.count(table).items():
+            if count:
+                return category
+        return None
+
+    def union(self, others: Iterable["KeywordScan"]) -> "KeywordScan":
+        """Combine scans of several texts (keywords found in any of them).
+
+        Equivalent to scanning the texts joined together, except for
+        keywords that would only match across a join boundary.
+        """
+        found = set(self.found)
+        for other in others:
+            found |= other.found
+        return KeywordScan(self._tables, self._matcher, frozenset(found))
+
+
+class KeywordIndex:
+    """Registry of keyword tables compiled into a single matcher."""
+
+    def __init__(self, cache_size: Optional[int] = None):
+        """Initialize empty index.
+
+        Args:
+            cache_size: Distinct texts whose scans are cached (defaults to
+                settings.KEYWORD_SCAN_CACHE_SIZE)
+        """
+        self.cache_size = cache_size if cache_size is not None else settings.KEYWORD_SCAN_CACHE_SIZE
+        self._tables: Dict[str, Dict[str, List[str]]] = {}
+        self._lock = threading.Lock()
+        self._compiled: Any = None
+
+    def register(self, name: str, table: Mapping[str, Iterable[str]]) -> str:
+        """Register (or replace) a category -> keywords table.
+
+        Args:
+            name: Table name, e.g. "strategic.pestle"
+            table: Mapping of category to keywords
+
+        Returns:
+            The table name, for use with KeywordScan lookups
+        """
+        with self._lock:
+            self._tables[name] = {category: list(keywords) for category, keywords in table.items()}
+            self._compiled = None
+        return name
+
+    def tables(self) -> List[str]:
+        """Registered table names."""
+        return list(self._tables)
+
+    def _compile(self) -> Any:
+        with self._lock:
+            if self._compiled is None:
+                tables = dict(self._tables)
+                matcher = KeywordMatcher(
+                    {
+                        (name, category): keywords
+                        for name, table in tables.items()
+                        for category, keywords in table.items()
+                    }
+                )
+
+                def scan(text: str) -> KeywordScan:
+                    return KeywordScan(tables, matcher, frozenset(matcher.find(text)))
+
+                self._compiled = lru_cache(maxsize=self.cache_size)(scan)
+            return self._compiled
+
+    def scan(self, text: str) -> KeywordScan:
+        """Scan text once against every registered table.
+
+        Args:
+            text: Text to scan (case-sensitive, callers lowercase as before)
+
+        Returns:
+            KeywordScan answering per-table queries
+        """
+        return (self._compiled or self._compile())(text)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index and scan cache statistics."""
+        compiled = self._compiled or self._compile()
+        info = compiled.cache_info()
+        return {
+            "tables": self.tables(),
+            "keywords": len({kw for table in self._tables.values() for kws in table.values() for kw in kws}),
+            "cacheHits": info.hits,
+            "cacheMisses": info.misses,
+            "cacheSize": info.currsize,
+            "cacheMaxSize": info.maxsize,
+            "automaton": HAS_AHOCORASICK,
+        }
+
+
+# Shared index; services register their tables at import time
+keyword_index = KeywordIndex()
@@ -0,0 +1,151 @@
+"""Lazy registry for heavy NLP models.
+
+spaCy pipelines, the VADER lexicon and sentence-transformers models are slow
+to import and load. Services register a loader per model and fetch the model
+on first use; at startup the registry can load them in a background thread so
+the first request does not pay for it. The health endpoint reports readiness
+from the model states kept here.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+UNAVAILABLE = "unavailable"
+FAILED = "failed"
+
+
+class _ModelEntry:
+    """Loader, loaded model and load state of one registered model."""
+
+    def __init__(self, loader: Callable[[], Any], warm: bool):
+        self.loader = loader
+        self.warm = warm
+        self.model: Any = None
+        self.state = PENDING
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.lock = threading.Lock()
+
+
+class ModelRegistry:
+    """Loads each registered model once, on demand or during warm-up."""
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, _ModelEntry] = {}
+        self._lock = threading.Lock()
+        self._warmup_thread: Optional[threading.Thread] = None
+        # Models the last warm_up() set out to load; readiness waits on these only
+        self._warming: Tuple[str, ...] = ()
+
+    def register(self, name: str, loader: Callable[[], Any], warm: bool = True) -> str:
+        """Register a model loader (ignored if the name is already registered).
+
+        Args:
+            name: Model key, e.g. "spacy:en_core_web_sm"
+            loader: Zero-argument callable returning the model; ImportError
+                marks the model unavailable, any other error failed
+            warm: Whether warm_up() loads this model by default
+
+        Returns:
+            The model key
+        """
+        with self._lock:
+            self._entries.setdefault(name, _ModelEntry(loader, warm))
+        return name
+
+    def get(self, name: str) -> Optional[Any]:
+        """Return a model, loading it on first use.
+
+        Args:
+            name: Registered model key
+
+        Returns:
+            The loaded model, or None if it is unavailable or failed to load
+
+        Raises:
+            KeyError: If no loader is registered under name
+        """
+        entry = self._entries[name]
+        if entry.state == READY:
+            return entry.model
+
+        with entry.lock:
+            if entry.state in (PENDING, LOADING):
+                entry.state = LOADING
+                started = time.perf_counter()
+                try:
+                    entry.model = entry.loader()
+                    entry.state = READY
+                except ImportError as exc:
+                    entry.state, entry.error = UNAVAILABLE, str(exc)
+                    logger.warning("Model '%s' unavailable: %s", name, exc)
+                except Exception as exc:
+                    entry.state, entry.error = FAILED, str(exc)
+                    logger.warning("Failed to load model '%s': %s", name, exc)
+                entry.load_seconds = round(time.perf_counter() - started, 3)
+        return entry.model
+
+    def warm_up(self, names: Optional[Iterable[str]] = None, background: bool = True) -> Optional[threading.Thread]:
+        """Load models ahead of the first request.
+
+        Args:
+            names: Model keys to load (defaults to all registered with warm=True)
+            background: Load in a daemon thread instead of blocking
+
+        Returns:
+            The warm-up thread when running in the background
+        """
+        if names is None:
+            names = [name for name, entry in self._entries.items() if entry.warm]
+        names = list(names)
+        self._warming = tuple(names)
+
+        def run() -> None:
+            for name in names:
+                self.get(name)
+
+        if not background:
+            run()
+            return None
+
+        self._warmup_thread = threading.Thread(target=run, name="model-warmup", daemon=True)
+        self._warmup_thread.start()
+        return self._warmup_thread
+
+    def is_ready(self) -> bool:
+        """True once no model picked by warm_up() is still pending or loading.
+
+        Models registered after warm-up started are loaded on first use and
+        do not hold readiness back. Unavailable and failed models count as
+        settled: the services that use them degrade instead of blocking.
+        """
+        if self._warmup_thread is None:
+            return True
+        return all(self._entries[name].state not in (PENDING, LOADING) for name in self._warming)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Readiness and per-model load state."""
+        return {
+            "ready": self.is_ready(),
+            "warmupStarted": self._warmup_thread is not None,
+            "models": {
+                name: {
+                    "state": entry.state,
+                    "loadSeconds": entry.load_seconds,
+                    "error": entry.error,
+                }
+                for name, entry in self._entries.items()
+            },
+        }
+
+
+# Shared registry used by the NLP pipeline and the health endpoint
+model_registry = ModelRegistry()
@@ -1,62 +1,113 @@
 """NLP pipeline utilities for stakeholder analysis and document processing."""
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Hashable, List, Optional, Sequence, Tuple
 
-try:
-    import spacy
-    from spacy.language import Language
-except ImportError:  # pragma: no cover - optional dependency
-    spacy = None  # type: ignore
-    Language = None  # type: ignore
+import numpy as np
 
-import nltk
-from nltk.sentiment import SentimentIntensityAnalyzer
+from config.settings import settings
+from services.embedding_cache import EmbeddingCache, content_key, get_embedding_cache
+from services.embedding_codec import EMBEDDING_FORMATS, encode_embedding
+from services.model_registry import model_registry
 
-try:
+if TYPE_CHECKING:  # pragma: no cover - heavy optional imports are loaded lazily
+    from spacy.language import Language
     from sentence_transformers import SentenceTransformer
-except ImportError:  # pragma: no cover - optional dependency
-    SentenceTransformer = None  # type: ignore
 
 logger = logging.getLogger(__name__)
 
 
 def _ensure_vader_loaded() -> None:
     """Ensure the VADER lexicon is available for sentiment analysis."""
+    import nltk
+
     try:
         nltk.data.find("sentiment/vader_lexicon.zip")
     except LookupError:  # pragma: no cover - network call
         nltk.download("vader_lexicon")
 
 
+def _load_spacy(model_name: str) -> "Language":
+    import spacy
+
+    try:
+        nlp = spacy.load(model_name)
+    except OSError:
+        logger.warning("spaCy model '%s' not found. Falling back to blank English model.", model_name)
+        nlp = spacy.blank("en")
+
+    return nlp
+
+
+def _load_vader() -> Any:
+    _ensure_vader_loaded()
+    from nltk.sentiment import SentimentIntensityAnalyzer
+
+    return SentimentIntensityAnalyzer()
+
+
+def _load_sentence_transformer(model_name: str) -> "SentenceTransformer":
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_name)
+
+
+def register_default_models() -> None:
+    """Register the models used by the default pipeline for warm-up."""
+    model_registry.register("nltk:vader", _load_vader)
+    model_registry.register(f"spacy:{NERPipeline.DEFAULT_MODEL}", lambda: _load_spacy(NERPipeline.DEFAULT_MODEL))
+    model_registry.register(
+        f"sentence-transformers:{EmbeddingGenerator.DEFAULT_MODEL}",
+        lambda: _load_sentence_transformer(EmbeddingGenerator.DEFAULT_MODEL),
+    )
+
+
 class NERPipeline:
     """Named entity recognition pipeline built on spaCy."""
 
-    def __init__(self, model_name: str = "en_core_web_sm") -> None:
+    # Pipeline components that produce doc.ents; everything else is skipped
+    ENTITY_COMPONENTS = ("ner", "entity_ruler")
+    DEFAULT_MODEL = "en_core_web_sm"
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL,
+        batch_size: Optional[int] = None,
+        n_process: Optional[int] = None,
+    ) -> None:
         self.model_name = model_name
+        self.batch_size = batch_size or settings.NLP_NER_BATCH_SIZE
+        self.n_process = n_process or settings.NLP_NER_N_PROCESS
         self._nlp: Optional[Language] = None
+        self._model_key = model_registry.register(f"spacy:{model_name}", lambda: _load_spacy(model_name))
 
     def _load_model(self) -> Optional[Language]:
-        if self._nlp is not None:
-            return self._nlp
-
-        if spacy is None:  # pragma: no cover - optional dependency
-            logger.warning("spaCy is not installed; NERPipeline will be disabled")
-            return None
-
-        try:
-            self._nlp = spacy.load(self.model_name)
-        except OSError:
-            logger.warning(
-                "spaCy model '%s' not found. Falling back to blank English model.",
-                self.model_name,
-            )
-            self._nlp = spacy.blank("en")
+        if self._nlp is None:
+            # None if spaCy is not installed; NER is then disabled
+            self._nlp = model_registry.get(self._model_key)
         return self._nlp
 
+    @classmethod
+    def _unused_components(cls, nlp: Language) -> List[str]:
+        """Components other than the entity ones (and a tok2vec they listen to).
+
+        They are skipped per call rather than disabled on the model, which is
+        shared through the model registry with every other caller.
+        """
+        keep = set(cls.ENTITY_COMPONENTS)
+        if "tok2vec" in nlp.pipe_names and keep & set(
+            getattr(nlp.get_pipe("tok2vec"), "listening_components", [])
+        ):
+            keep.add("tok2vec")
+
+        return [name for name in nlp.pipe_names if name not in keep]
+
     def extract_entities(self, text: str) -> List[Dict[str, Any]]:
         """Extract named entities from text.
 
@@ -73,67 +124,223 @@ class NERPipeline:
         if nlp is None:
             return []
 
-        doc = nlp(text)
-        entities = []
-        for ent in doc.ents:
-            entities.append(
-                {
-                    "text": ent.text,
-                    "label": ent.label_,
-                    "start": ent.start_char,
-                    "end": ent.end_char,
-                }
-            )
-        return entities
+        return self._doc_entities(nlp(text, disable=self._unused_components(nlp)))
+
+    def extract_entities_batch(self, texts: Sequence[str]) -> List[List[Dict[str, Any]]]:
+        """Extract named entities from many texts with one ``nlp.pipe`` run.
+
+        Args:
+            texts: Source texts
+
+        Returns:
+            Entity lists aligned with texts
+        """
+        results: List[List[Dict[str, Any]]] = [[] for _ in texts]
+        indices = [i for i, text in enumerate(texts) if text]
+        if not indices:
+            return results
+
+        nlp = self._load_model()
+        if nlp is None:
+            return results
+
+        docs = nlp.pipe(
+            (texts[i] for i in indices),
+            batch_size=self.batch_size,
+            n_process=self.n_process,
+            disable=self._unused_components(nlp),
+        )
+        for i, doc in zip(indices, docs):
+            results[i] = self._doc_entities(doc)
+        return results
+
+    @staticmethod
+    def _doc_entities(doc: Any) -> List[Dict[str, Any]]:
+        return [
+            {
+                "text": ent.text,
+                "label": ent.label_,
+                "start": ent.start_char,
+                "end": ent.end_char,
+            }
+            for ent in doc.ents
+        ]
 
 
 class SentimentAnalyzer:
     """Sentiment analysis utilities using NLTK's VADER."""
 
-    def __init__(self) -> None:
-        _ensure_vader_loaded()
-        self._analyzer = SentimentIntensityAnalyzer()
+    SCORE_KEYS = ("neg", "neu", "pos", "compound")
+
+    def __init__(self, cache_size: Optional[int] = None) -> None:
+        """Initialize analyzer.
+
+        Args:
+            cache_size: Tickets whose scores are cached (defaults to
+                settings.SENTIMENT_CACHE_SIZE)
+        """
+        # Lexicon download and analyzer construction happen on first score()
+        self._analyzer: Any = None
+        self._model_key = model_registry.register("nltk:vader", _load_vader)
+        self.cache_size = cache_size if cache_size is not None else settings.SENTIMENT_CACHE_SIZE
+        # ticket id -> (content hash, scores); a changed ticket replaces its entry
+        self._ticket_cache: "OrderedDict[Hashable, Tuple[str, Dict[str, float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
 
     def score(self, text: str) -> Dict[str, float]:
         """Calculate sentiment scores for text."""
         if not text:
             return {"neg": 0.0, "neu": 0.0, "pos": 0.0, "compound": 0.0}
+        if self._analyzer is None:
+            self._analyzer = model_registry.get(self._model_key)
+            if self._analyzer is None:
+                raise RuntimeError("VADER sentiment analyzer is unavailable")
         return self._analyzer.polarity_scores(text)
 
+    def score_ticket(self, ticket_id: Optional[Hashable], text: str) -> Dict[str, float]:
+        """Score one ticket's text, cached by ticket id and content hash."""
+        return self.score_tickets([(ticket_id, text)])[0]
+
+    def score_tickets(self, tickets: Sequence[Tuple[Optional[Hashable], str]]) -> List[Dict[str, float]]:
+        """Score many tickets, sharing the per-ticket cache.
+
+        Args:
+            tickets: (ticket id, text) pairs; a None id caches by content only
+
+        Returns:
+            Score dicts aligned with tickets
+        """
+        results: List[Dict[str, float]] = []
+        for ticket_id, text in tickets:
+            digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+            key = ticket_id if ticket_id is not None else digest
+
+            with self._lock:
+                cached = self._ticket_cache.get(key)
+                if cached is not None and cached[0] == digest:
+                    self._ticket_cache.move_to_end(key)
+                    self.hits += 1
+                    results.append(cached[1])
+                    continue
+                self.misses += 1
+
+            scores = self.score(text)
+            with self._lock:
+                self._ticket_cache[key] = (digest, scores)
+                self._ticket_cache.move_to_end(key)
+                while len(self._ticket_cache) > self.cache_size:
+                    self._ticket_cache.popitem(last=False)
+            results.append(scores)
+        return results
+
+    @classmethod
+    def aggregate(cls, scores: Sequence[Dict[str, float]], weights: Optional[Sequence[float]] = None) -> Dict[str, float]:
+        """Weighted mean of score dicts (e.g. a profile's ticket scores).
+
+        Args:
+            scores: Per-ticket scores
+            weights: Weight per score (equal weights if None)
+
+        Returns:
+            Mean neg/neu/pos/compound, all zero if there is nothing to average
+        """
+        weights = list(weights) if weights is not None else [1.0] * len(scores)
+        total = sum(weights)
+        if not scores or total <= 0:
+            return dict.fromkeys(cls.SCORE_KEYS, 0.0)
+        return {
+            key: round(sum(score.get(key, 0.0) * weight for score, weight in zip(scores, weights)) / total, 4)
+            for key in cls.SCORE_KEYS
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get ticket score cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._ticket_cache),
+            "maxEntries": self.cache_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
 
 class EmbeddingGenerator:
     """Sentence embedding generator using sentence-transformers."""
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2") -> None:
+    DEFAULT_MODEL = "all-MiniLM-L6-v2"
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL,
+        batch_size: Optional[int] = None,
+        cache: Optional[EmbeddingCache] = None,
+    ) -> None:
         self.model_name = model_name
+        self.batch_size = batch_size or settings.EMBEDDING_BATCH_SIZE
+        self.cache = cache if cache is not None else get_embedding_cache()
         self._model: Optional[SentenceTransformer] = None
+        self._model_key = model_registry.register(
+            f"sentence-transformers:{model_name}", lambda: _load_sentence_transformer(model_name)
+        )
 
     def _load_model(self) -> Optional[SentenceTransformer]:
-        if self._model is not None:
-            return self._model
-
-        if SentenceTransformer is None:  # pragma: no cover - optional dependency
-            logger.warning("sentence-transformers not installed; embeddings disabled")
-            return None
-
-        try:
-            self._model = SentenceTransformer(self.model_name)
-        except Exception as exc:  # pragma: no cover - optional dependency
-            logger.warning("Failed to load embedding model '%s': %s", self.model_name, exc)
-            self._model = None
+        if self._model is None:
+            # None if sentence-transformers is missing; embeddings are then disabled
+            self._model = model_registry.get(self._model_key)
         return self._model
 
+    def key_for(self, text: str) -> str:
+        """Cache key (and "omit" handle) of the embedding for text."""
+        return content_key(self.model_name, text)
+
     def embed(self, text: str) -> List[float]:
         """Generate embedding vector for text."""
         if not text:
             return []
 
-        model = self._load_model()
-        if model is None:
-            return []
+        matrix = self.embed_many([text])
+        return matrix[0].tolist() if matrix.shape[1] else []
+
+    def embed_many(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed many texts, encoding only those not already cached.
+
+        Args:
+            texts: Source texts (empty texts get zero rows)
+
+        Returns:
+            C-contiguous float32 matrix of shape (len(texts), dim). When the
+            model is unavailable, cached rows are still returned and misses
+            are zero-filled; dim is 0 if nothing was cached either
+        """
+        keys = [self.key_for(text) if text else None for text in texts]
+        vectors = self.cache.get_many({key for key in keys if key is not None})
+
+        # Encode each distinct uncached text once, in batches
+        pending: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key is not None and key not in vectors:
+                pending.setdefault(key, text)
+
+        model = self._load_model() if pending else None
+        if model is not None:
+            encoded = model.encode(
+                list(pending.values()),
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+            )
+            new_vectors = dict(zip(pending, np.asarray(encoded, dtype=np.float32)))
+            self.cache.put_many(new_vectors)
+            vectors.update(new_vectors)
 
-        vector = model.encode(text, convert_to_numpy=True)
-        return vector.tolist()
+        dim = next((len(v) for v in vectors.values()), 0)
+        matrix = np.zeros((len(texts), dim), dtype=np.float32)
+        for row, key in enumerate(keys):
+            if key in vectors:
+                matrix[row] = vectors[key]
+        return matrix
 
 
 @dataclass
@@ -142,7 +349,7 @@ class StakeholderNLPResult:
 
     sentiment: Dict[str, float] = field(default_factory=dict)
     entities: List[Dict[str, Any]] = field(default_factory=list)
-    embedding: List[float] = field(default_factory=list)
+    embedding: Any = field(default_factory=list)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -160,10 +367,21 @@ class StakeholderNLPPipeline:
         ner: Optional[NERPipeline] = None,
         sentiment_analyzer: Optional[SentimentAnalyzer] = None,
         embedder: Optional[EmbeddingGenerator] = None,
+        embedding_format: Optional[str] = None,
     ) -> None:
         self.ner = ner or NERPipeline()
         self.sentiment = sentiment_analyzer or SentimentAnalyzer()
         self.embedder = embedder or EmbeddingGenerator()
+        self.embedding_format = embedding_format or settings.EMBEDDING_FORMAT
+        if self.embedding_format not in EMBEDDING_FORMATS:
+            raise ValueError(f"Unsupported embedding format: {self.embedding_format}")
+        # Handles must outlive the memory LRU, so omitted vectors need the disk tier
+        if self.embedding_format == "omit" and not self.embedder.cache.persistent:
+            raise ValueError("The 'omit' embedding format requires EMBEDDING_CACHE_PATH")
+
+    def _encode_embedding(self, vector: np.ndarray, text: str) -> Any:
+        handle = self.embedder.key_for(text) if self.embedding_format == "omit" else None
+        return encode_embedding(vector, self.embedding_format, handle)
 
     def enhance_profile(self, profile: Dict[str, Any], context: str) -> Dict[str, Any]:
         """Enhance a stakeholder profile with NLP insights."""
@@ -172,14 +390,57 @@ class StakeholderNLPPipeline:
         result.entities = self.ner.extract_entities(context)
 
         # Limit embedding length to reduce payload size
-        embedding = self.embedder.embed(context[:2000])
-        if embedding:
-            result.embedding = embedding
+        text = context[:2000]
+        embedding = self.embedder.embed_many([text])[0] if text else np.zeros(0, dtype=np.float32)
+        # Zero rows stand for texts that could not be embedded
+        if embedding.any():
+            result.embedding = self._encode_embedding(embedding, text)
 
         profile.setdefault("nlp", {})
         profile["nlp"].update(result.to_dict())
         return profile
 
+    def enhance_profiles(
+        self,
+        profiles: Sequence[Dict[str, Any]],
+        contexts: Sequence[str],
+        sentiments: Optional[Sequence[Dict[str, float]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Enhance many stakeholder profiles, running NER for all in one batch.
+
+        Args:
+            profiles: Stakeholder profiles
+            contexts: Context text per profile (aligned with profiles)
+            sentiments: Precomputed sentiment per profile (e.g. aggregated
+                ticket scores); contexts are scored when omitted
+
+        Returns:
+            The enhanced profiles, same results as enhance_profile() each
+        """
+        if len(profiles) != len(contexts) or (sentiments is not None and len(sentiments) != len(profiles)):
+            raise ValueError("profiles, contexts and sentiments must have the same length")
+
+        entities = self.ner.extract_entities_batch(contexts)
+        texts = [context[:2000] for context in contexts]
+        embeddings = self.embedder.embed_many(texts)
+        for position, (profile, context, text, profile_entities, embedding) in enumerate(
+            zip(profiles, contexts, texts, entities, embeddings)
+        ):
+            result = StakeholderNLPResult()
+            result.sentiment = sentiments[position] if sentiments is not None else self.sentiment.score(context)
+            result.entities = profile_entities
+
+            # Empty texts and cache misses without a model come back as zero rows
+            if embedding.any():
+                result.embedding = self._encode_embedding(embedding, text)
+
+            profile.setdefault("nlp", {})
+            profile["nlp"].update(result.to_dict())
+        return list(profiles)
+
     def serialize(self, data: Dict[str, Any]) -> str:
         """Serialize NLP results to JSON string for storage/logging."""
         return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+register_default_models()
@@ -5,12 +5,84 @@ Implements stakeholder extraction, power/interest assessment, and matrix buildin
 from __future__ import annotations
 
 import re
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+from config.settings import settings
+from services.entity_resolution import EntityResolver
+from services.keyword_index import KeywordScan, keyword_index
 from services.nlp_pipeline import StakeholderNLPPipeline
 
 POWER_SCORES = {"Low": 1, "Medium": 2, "High": 3}
 
+# Capitalized first + last name
+NAME_PATTERN = re.compile(r"([A-Z][a-z]+\s+[A-Z][a-z]+)")
+
+# Delimiters between names in multi-name strings
+NAME_SPLIT_PATTERN = re.compile(r"(?:,|&|\band\b|\+|/)+", re.IGNORECASE)
+
+
+class NameExtractor:
+    """Extracts name candidates for several patterns, with positions.
+
+    Case-insensitive patterns whose source has no uppercase letters are
+    recompiled case-sensitively and run over the text lowercased once, which
+    lets the regex engine skip ahead on their literal prefixes (IGNORECASE
+    disables that). Each pattern is scanned with ``finditer``, so matches
+    are exactly those of the pattern's own ``findall``.
+    """
+
+    def __init__(self, rules: List[Tuple["re.Pattern[str]", Optional[int]]], generic_names: Set[str]):
+        """Compile extraction rules.
+
+        Args:
+            rules: (pattern, max_words) pairs; group 1 (or the whole match)
+                is the name, max_words=None means no word limit
+            generic_names: Lowercase names to ignore
+        """
+        self.generic_names = generic_names
+        # (original pattern, lowercase-text pattern or None, max_words)
+        self.rules: List[Tuple["re.Pattern[str]", Optional["re.Pattern[str]"], Optional[int]]] = []
+        for pattern, max_words in rules:
+            folded = None
+            if pattern.flags & re.IGNORECASE and not re.search(r"[A-Z]", pattern.pattern):
+                folded = re.compile(pattern.pattern, pattern.flags & ~re.IGNORECASE)
+            self.rules.append((pattern, folded, max_words))
+
+    def extract(self, text: str) -> Dict[str, Tuple[int, int]]:
+        """Extract normalized names with the span of their first match.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Mapping of normalized name to (start, end) of its first occurrence
+        """
+        found: Dict[str, Tuple[int, int]] = {}
+        if not text:
+            return found
+
+        lowered = text.lower()
+        # Offsets only carry over if lowercasing kept every character in place
+        use_folded = len(lowered) == len(text)
+
+        for pattern, folded, max_words in self.rules:
+            if folded is not None and use_folded:
+                matches = folded.finditer(lowered)
+            else:
+                matches = pattern.finditer(text)
+
+            group = 1 if pattern.groups else 0
+            for match in matches:
+                normalized = match.group(group).strip().lower().replace("_", " ")
+                if normalized in self.generic_names:
+                    continue
+                if max_words is not None and len(normalized.split()) > max_words:
+                    continue
+                span = match.span(group)
+                if normalized not in found or span < found[normalized]:
+                    found[normalized] = span
+        return found
+
 
 class StakeholderService:
     """Identifies and analyzes stakeholders from tickets."""
@@ -72,6 +144,9 @@ class StakeholderService:
         ],
     }
 
+    POWER_TABLE = keyword_index.register("stakeholder.power", POWER_KEYWORDS)
+    INTEREST_TABLE = keyword_index.register("stakeholder.interest", INTEREST_KEYWORDS)
+
     # Generic names to filter out
     GENERIC_NAMES = {
         "user",
@@ -94,41 +169,78 @@ class StakeholderService:
         re.compile(r"mentioned?\s+(\w+(?:\s+\w+)*)", re.IGNORECASE),
     ]
 
-    def __init__(self, nlp_pipeline: Optional[StakeholderNLPPipeline] = None):
-        """Initialize stakeholder service."""
+    def __init__(
+        self,
+        nlp_pipeline: Optional[StakeholderNLPPipeline] = None,
+        entity_resolver: Optional[EntityResolver] = None,
+    ):
+        """Initialize stakeholder service.
+
+        Args:
+            nlp_pipeline: NLP enrichment pipeline
+            entity_resolver: Resolver merging duplicate profiles (created from
+                settings if None; disabled when ENTITY_RESOLUTION_ENABLED is off)
+        """
         self.stakeholders: Dict[str, Dict[str, Any]] = {}
         self.extraction_patterns = self.EXTRACTION_PATTERNS
+        self.name_extractor = NameExtractor(
+            [(pattern, 3) for pattern in self.extraction_patterns] + [(NAME_PATTERN, None)],
+            self.GENERIC_NAMES,
+        )
         self.nlp_pipeline = nlp_pipeline or StakeholderNLPPipeline()
+        if entity_resolver is None and settings.ENTITY_RESOLUTION_ENABLED:
+            entity_resolver = EntityResolver(embedder=getattr(self.nlp_pipeline, "embedder", None))
+        self.entity_resolver = entity_resolver
 
-    def identify_stakeholders(self, tickets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def identify_stakeholders(
+        self, tickets: List[Dict[str, Any]], include_contexts: bool = False
+    ) -> Dict[str, Any]:
         """Extract and analyze stakeholders from tickets.
 
+        Ticket contexts are kept once in the returned ``contexts`` table
+        (indexed by the mention's ``index``); mentions carry a snippet and
+        its offsets into that table, so the payload grows with the number
+        of mentions rather than mentions x ticket length. A snippet
+        surrounds the position where the name was extracted, so handles
+        like "john_smith" get their own snippet rather than the start of
+        the context. Power/interest scoring merges per-ticket keyword
+        scans, sentiment averages cached per-ticket scores, and the NLP
+        pipeline (entities, embeddings) receives the profile's joined
+        mention snippets, so none of them joins full contexts per profile.
+
         Args:
             tickets: List of ticket objects
+            include_contexts: Also put the full ticket context in each
+                mention (the same string object as in the table)
 
         Returns:
-            List of enriched stakeholder profiles
+            Dict with the enriched ``stakeholders`` profiles and the
+            ``contexts`` table their mentions index into
         """
         profiles: Dict[str, Dict[str, Any]] = {}
+        contexts: List[str] = []
 
         for idx, ticket in enumerate(tickets):
             context = self._build_ticket_context(ticket)
-            extracted_names = self._extract_names_from_text(context)
+            contexts.append(context)
+            extracted_names = self._extract_name_spans(context)
 
             # Process extracted names
-            for name in extracted_names:
+            for name, span in extracted_names.items():
                 normalized = self._normalize_name(name)
                 profile = self._get_or_create_profile(profiles, normalized, name, context)
 
-                profile["mentions"].append(
-                    {
-                        "ticketId": ticket.get("id"),
-                        "index": idx,
-                        "source": "extraction",
-                        "context": context,
-                        "snippet": self._get_snippet(context, name),
-                    }
-                )
+                start, end = self._get_snippet_span(context, name, span)
+                mention = {
+                    "ticketId": ticket.get("id"),
+                    "index": idx,
+                    "source": "extraction",
+                    "snippet": context[start:end],
+                    "snippetOffsets": [start, end],
+                }
+                if include_contexts:
+                    mention["context"] = context
+                profile["mentions"].append(mention)
                 profile["frequency"] = len(profile["mentions"]) + len(profile["assignments"])
 
             # Process ticket assignee
@@ -148,13 +260,19 @@ class StakeholderService:
                 )
                 profile["frequency"] = len(profile["mentions"]) + len(profile["assignments"])
 
+        # Merge profiles that name the same person differently
+        resolved = list(profiles.values())
+        if self.entity_resolver is not None:
+            resolved = self.entity_resolver.resolve(resolved)
+
         # Enrich profiles
         enriched_profiles = []
-        for profile in profiles.values():
-            combined_context = " ".join(m.get("context", "") for m in profile.get("mentions", []))
+        ticket_scans: Dict[int, KeywordScan] = {}
+        for profile in resolved:
+            scan = self._scan_profile(profile, contexts, ticket_scans)
 
-            profile["power"] = self._determine_power_level(profile, combined_context)
-            profile["interest"] = self._determine_interest_level(profile, combined_context)
+            profile["power"] = self._determine_power_level(profile, scan=scan)
+            profile["interest"] = self._determine_interest_level(profile, scan=scan)
             profile["quadrant"] = self._get_quadrant(profile["power"], profile["interest"])
             profile["color"] = self._get_quadrant_color(profile["power"], profile["interest"])
             profile["influenceScore"] = self._calculate_influence_score(profile)
@@ -165,13 +283,29 @@ class StakeholderService:
             if profile["roles"]:
                 profile["type"] = profile["roles"][0]
 
-            # NLP enhancement (sentiment, entities, embeddings)
-            profile = self._apply_nlp_enhancements(profile, combined_context)
-
             enriched_profiles.append(profile)
 
+        # NLP enhancement: entities and embeddings on mention snippets,
+        # sentiment aggregated from cached per-ticket scores
+        snippet_contexts = [
+            " ".join(m["snippet"] for m in profile.get("mentions", [])) for profile in enriched_profiles
+        ]
+        self._apply_nlp_enhancements_batch(enriched_profiles, snippet_contexts, contexts)
+
         self.stakeholders = {p["id"]: p for p in enriched_profiles}
-        return enriched_profiles
+        return {"stakeholders": enriched_profiles, "contexts": contexts}
+
+    def _scan_profile(
+        self, profile: Dict[str, Any], contexts: List[str], ticket_scans: Dict[int, KeywordScan]
+    ) -> KeywordScan:
+        """Keyword scan of the profile name and every ticket it is mentioned in."""
+        scans = []
+        for mention in profile.get("mentions", []):
+            index = mention["index"]
+            if index not in ticket_scans:
+                ticket_scans[index] = keyword_index.scan(contexts[index].lower())
+            scans.append(ticket_scans[index])
+        return keyword_index.scan(profile["name"].lower()).union(scans)
 
     def _apply_nlp_enhancements(self, profile: Dict[str, Any], context: str) -> Dict[str, Any]:
         """Apply NLP enrichment to a stakeholder profile."""
@@ -185,6 +319,61 @@ class StakeholderService:
             profile["nlp"]["error"] = str(exc)
         return profile
 
+    def _apply_nlp_enhancements_batch(
+        self, profiles: List[Dict[str, Any]], contexts: List[str], ticket_contexts: List[str]
+    ) -> List[Dict[str, Any]]:
+        """Apply NLP enrichment to all profiles with context in one pipeline batch.
+
+        ``ticket_contexts`` is the table mention indices refer to; sentiment
+        is scored on it.
+        """
+        if not self.nlp_pipeline:
+            return profiles
+
+        pending = [(profile, context) for profile, context in zip(profiles, contexts) if context]
+        if not pending:
+            return profiles
+
+        try:
+            pending_profiles = [p for p, _ in pending]
+            self.nlp_pipeline.enhance_profiles(
+                pending_profiles,
+                [c for _, c in pending],
+                sentiments=self._profile_sentiments(pending_profiles, ticket_contexts),
+            )
+        except Exception:  # pragma: no cover - optional dependency
+            # Fall back to per-profile enrichment so one failure is isolated
+            for profile, context in pending:
+                self._apply_nlp_enhancements(profile, context)
+        return profiles
+
+    def _profile_sentiments(
+        self, profiles: List[Dict[str, Any]], contexts: List[str]
+    ) -> List[Dict[str, float]]:
+        """Sentiment per profile as the mention-weighted mean of ticket scores.
+
+        Each ticket context is scored once (and cached by ticket id and
+        content hash across calls), however many stakeholders it mentions.
+        """
+        analyzer = self.nlp_pipeline.sentiment
+        ticket_ids: Dict[int, Any] = {}
+        weights: List[Dict[int, int]] = []
+        for profile in profiles:
+            counts: Dict[int, int] = {}
+            for mention in profile.get("mentions", []):
+                index = mention["index"]
+                ticket_ids[index] = mention.get("ticketId")
+                counts[index] = counts.get(index, 0) + 1
+            weights.append(counts)
+
+        indices = sorted(ticket_ids)
+        scores = dict(
+            zip(indices, analyzer.score_tickets([(ticket_ids[i], contexts[i]) for i in indices]))
+        )
+        return [
+            analyzer.aggregate([scores[i] for i in counts], list(counts.values())) for counts in weights
+        ]
+
     def _build_ticket_context(self, ticket: Dict[str, Any]) -> str:
         """Combine ticket fields into single context string."""
         parts = [
@@ -213,29 +402,24 @@ class StakeholderService:
         Returns:
             List of extracted names
         """
-        candidates: Set[str] = set()
+        return list(self._extract_name_spans(text))
 
-        if not text or not self.extraction_patterns:
-            return list(candidates)
-
-        for pattern in self.extraction_patterns:
-            for match in pattern.findall(text):
-                normalized = self._normalize_name(match)
-                if normalized.lower() not in self.GENERIC_NAMES and len(normalized.split()) <= 3:
-                    candidates.add(normalized)
+    def _extract_name_spans(self, text: str) -> Dict[str, Tuple[int, int]]:
+        """Extract likely personal names with the span of their first match.
 
-        # Extract capitalized words adjacent to known stakeholder terms
-        name_pattern = re.compile(r"([A-Z][a-z]+\s+[A-Z][a-z]+)")
-        for match in name_pattern.findall(text):
-            normalized = self._normalize_name(match)
-            if normalized.lower() not in self.GENERIC_NAMES:
-                candidates.add(normalized)
+        Args:
+            text: Context text to search
 
-        return list(candidates)
+        Returns:
+            Mapping of normalized name to (start, end) offsets in text
+        """
+        if not text or not self.extraction_patterns:
+            return {}
+        return self.name_extractor.extract(text)
 
     def _split_candidate_names(self, raw: str) -> List[str]:
         """Split multi-name strings by common delimiters."""
-        names = re.split(r"(?:,|&|\band\b|\+|/)+", raw, flags=re.IGNORECASE)
+        names = NAME_SPLIT_PATTERN.split(raw)
         return [n.strip() for n in names if n.strip()]
 
     def _is_likely_person_name(self, name: str) -> bool:
@@ -289,20 +473,19 @@ class StakeholderService:
     def _infer_role(self, name: str, context: str) -> str:
         """Infer stakeholder role from name and context."""
         combined = f"{name} {context}".lower()
+        return keyword_index.scan(combined).first_category(self.POWER_TABLE) or "stakeholder"
 
-        for role, keywords in self.POWER_KEYWORDS.items():
-            if any(kw in combined for kw in keywords):
-                return role
-
-        return "stakeholder"
-
-    def _determine_power_level(self, profile: Dict[str, Any], context: str) -> str:
+    def _determine_power_level(
+        self, profile: Dict[str, Any], context: str = "", scan: Optional[KeywordScan] = None
+    ) -> str:
         """Determine stakeholder power level."""
-        combined = f"{profile['name']} {context}".lower()
+        if scan is None:
+            scan = keyword_index.scan(f"{profile['name']} {context}".lower())
 
-        exec_score = sum(1 for kw in self.POWER_KEYWORDS.get("executive", []) if kw in combined)
-        manager_score = sum(1 for kw in self.POWER_KEYWORDS.get("manager", []) if kw in combined)
-        tech_score = sum(1 for kw in self.POWER_KEYWORDS.get("technical", []) if kw in combined)
+        hits = scan.count(self.POWER_TABLE)
+        exec_score = hits.get("executive", 0)
+        manager_score = hits.get("manager", 0)
+        tech_score = hits.get("technical", 0)
 
         if exec_score >= 2:
             return "High"
@@ -315,12 +498,16 @@ class StakeholderService:
 
         return "Low"
 
-    def _determine_interest_level(self, profile: Dict[str, Any], context: str) -> str:
+    def _determine_interest_level(
+        self, profile: Dict[str, Any], context: str = "", scan: Optional[KeywordScan] = None
+    ) -> str:
         """Determine stakeholder interest level."""
-        combined = f"{profile['name']} {context}".lower()
+        if scan is None:
+            scan = keyword_index.scan(f"{profile['name']} {context}".lower())
 
-        high_score = sum(1 for kw in self.INTEREST_KEYWORDS.get("high", []) if kw in combined)
-        medium_score = sum(1 for kw in self.INTEREST_KEYWORDS.get("medium", []) if kw in combined)
+        hits = scan.count(self.INTEREST_TABLE)
+        high_score = hits.get("high", 0)
+        medium_score = hits.get("medium", 0)
 
         if high_score >= 2:
             return "High"
@@ -408,13 +595,32 @@ class StakeholderService:
 
     def _get_snippet(self, context: str, name: str) -> str:
         """Extract snippet around name mention."""
-        lower_context = context.lower()
-        lower_name = name.lower()
-        idx = lower_context.find(lower_name)
+        start, end = self._get_snippet_span(context, name)
+        return context[start:end]
 
-        if idx == -1:
-            return context[:100]
+    def _get_snippet_span(
+        self, context: str, name: str, span: Optional[Tuple[int, int]] = None
+    ) -> Tuple[int, int]:
+        """Get (start, end) offsets of the snippet around a name mention.
 
-        start = max(0, idx - 30)
-        end = min(len(context), idx + len(name) + 30)
-        return context[start:end].strip()
+        Args:
+            context: Ticket context
+            name: Mentioned name
+            span: Known (start, end) of the mention; located with a
+                case-insensitive search when omitted
+        """
+        if span is None:
+            idx = context.lower().find(name.lower())
+            if idx == -1:
+                return 0, min(len(context), 100)
+            span = (idx, idx + len(name))
+
+        start = max(0, span[0] - 30)
+        end = min(len(context), span[1] + 30)
+
+        # Same as .strip() on the slice
+        while start < end and context[start].isspace():
+            start += 1
+        while end > start and context[end - 1].isspace():
+            end -= 1
+        return start, end
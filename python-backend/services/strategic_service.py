@@ -4,7 +4,11 @@ Analyzes tickets for strategic implications and provides recommendations.
 """
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from collections import Counter
+from typing import Any, Dict, FrozenSet, Iterable, List, Sequence, Tuple
+
+from services.keyword_index import KeywordMatcher, keyword_index
+
 
 class StrategicAnalysisService:
     """Provides strategic analysis on tickets and projects."""
@@ -114,6 +118,24 @@ class StrategicAnalysisService:
         "wont": ["won't have", "future", "phase 2", "deferred", "backlog"],
     }
 
+    PESTLE_TABLE = keyword_index.register("strategic.pestle", PESTLE_KEYWORDS)
+    SWOT_TABLE = keyword_index.register("strategic.swot", SWOT_KEYWORDS)
+    MOSCOW_TABLE = keyword_index.register("strategic.moscow", MOSCOW_KEYWORDS)
+
+    # Matches only the keywords the analysis depends on; batch analysis uses
+    # its hits as a memoization key, so other tables' hits are not collected
+    SIGNATURE_MATCHER = KeywordMatcher(
+        {
+            (table, category): keywords
+            for table, keyword_table in (
+                ("pestle", PESTLE_KEYWORDS),
+                ("swot", SWOT_KEYWORDS),
+                ("moscow", MOSCOW_KEYWORDS),
+            )
+            for category, keywords in keyword_table.items()
+        }
+    )
+
     def __init__(self):
         """Initialize strategic analysis service."""
         pass
@@ -127,22 +149,97 @@ class StrategicAnalysisService:
         Returns:
             Enhanced ticket with strategic metadata
         """
-        context = self._build_context(ticket)
+        return {
+            **ticket,
+            "_strategic": self._analyze_context(ticket, self._build_context(ticket)),
+        }
+
+    def analyze_tickets(self, tickets: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+        """Analyze a batch of tickets and roll results up to project level.
 
+        The analysis of a ticket depends only on which strategic keywords
+        occur in its context and on its priority, so tickets sharing that
+        signature share one (read-only) analysis dict. Input tickets are
+        neither copied nor modified.
+
+        Args:
+            tickets: Tickets to analyze
+
+        Returns:
+            Dict with per-ticket results (ticketId + strategic analysis) and
+            a project-level summary (factor histograms, MoSCoW counts)
+        """
+        # Signature -> [analysis, ticket count]
+        analyses: Dict[Tuple[FrozenSet[str], str], List[Any]] = {}
+        find = self.SIGNATURE_MATCHER.find
+        results = []
+
+        for index, ticket in enumerate(tickets):
+            context = self._build_context(ticket)
+            signature = (frozenset(find(context)), str(ticket.get("priority", "")).lower())
+
+            entry = analyses.get(signature)
+            if entry is None:
+                entry = analyses[signature] = [self._analyze_context(ticket, context), 0]
+            entry[1] += 1
+
+            ticket_id = ticket["id"] if "id" in ticket else f"ticket_{index}"
+            results.append({"ticketId": ticket_id, "strategic": entry[0]})
+
+        return {
+            "tickets": results,
+            "summary": self._summarize(analyses.values(), len(results)),
+        }
+
+    def _analyze_context(self, ticket: Dict[str, Any], context: str) -> Dict[str, Any]:
+        """Run PESTLE/SWOT/MoSCoW analysis for one ticket context."""
         pestle = self._analyze_pestle(context)
         swot = self._build_swot_matrix(pestle, context)
         moscow = self._determine_moscow_category(ticket, context)
         recommendations = self._generate_recommendations(pestle, swot, ticket)
 
         return {
-            **ticket,
-            "_strategic": {
-                "pestle": pestle,
-                "swot": swot,
-                "moscow": moscow,
-                "recommendations": recommendations,
-                "confidence": self._calculate_analysis_confidence(pestle, swot),
-            },
+            "pestle": pestle,
+            "swot": swot,
+            "moscow": moscow,
+            "recommendations": recommendations,
+            "confidence": self._calculate_analysis_confidence(pestle, swot),
+        }
+
+    def _summarize(self, analyses: Iterable[List[Any]], total: int) -> Dict[str, Any]:
+        """Build project-level rollup, weighting each distinct analysis by its ticket count."""
+        pestle = {factor: {"mentioned": 0, "averageScore": 0.0} for factor in self.PESTLE_KEYWORDS}
+        swot: Dict[str, Counter] = {factor: Counter() for factor in self.SWOT_KEYWORDS}
+        moscow = {category: 0 for category in self.MOSCOW_KEYWORDS}
+        recommendations: Counter = Counter()
+        confidence_sum = 0.0
+
+        distinct = 0
+        for analysis, count in analyses:
+            distinct += 1
+            for factor, data in analysis["pestle"].items():
+                pestle[factor]["averageScore"] += data["score"] * count
+                if data["mentioned"]:
+                    pestle[factor]["mentioned"] += count
+            for factor, items in analysis["swot"].items():
+                for item in items:
+                    swot[factor][item] += count
+            moscow[analysis["moscow"]] = moscow.get(analysis["moscow"], 0) + count
+            for recommendation in analysis["recommendations"]:
+                recommendations[recommendation["category"]] += count
+            confidence_sum += analysis["confidence"] * count
+
+        for data in pestle.values():
+            data["averageScore"] = round(data["averageScore"] / total, 4) if total else 0.0
+
+        return {
+            "totalTickets": total,
+            "distinctAnalyses": distinct,
+            "pestle": pestle,
+            "swot": {factor: dict(counter.most_common()) for factor, counter in swot.items()},
+            "moscow": moscow,
+            "recommendations": dict(recommendations.most_common()),
+            "averageConfidence": round(confidence_sum / total, 4) if total else 0.0,
         }
 
     def _build_context(self, ticket: Dict[str, Any]) -> str:
@@ -162,9 +259,10 @@ class StrategicAnalysisService:
     def _analyze_pestle(self, context: str) -> Dict[str, Any]:
         """Analyze PESTLE factors in context."""
         pestle = {}
+        hits = keyword_index.scan(context).count(self.PESTLE_TABLE)
 
         for factor, keywords in self.PESTLE_KEYWORDS.items():
-            score = sum(1 for kw in keywords if kw in context)
+            score = hits[factor]
             pestle[factor] = {"score": min(score / len(keywords) * 10, 10), "mentioned": score > 0}
 
         return pestle
@@ -178,12 +276,9 @@ class StrategicAnalysisService:
             "Threats": [],
         }
 
-        for factor, keywords in self.SWOT_KEYWORDS.items():
-            items = []
-            for keyword in keywords:
-                if keyword in context:
-                    items.append(keyword)
-
+        scan = keyword_index.scan(context)
+        for factor in self.SWOT_KEYWORDS:
+            items = scan.matched(self.SWOT_TABLE, factor)
             if items:
                 swot[factor] = items[:3]  # Limit to 3 items per category
 
@@ -194,9 +289,9 @@ class StrategicAnalysisService:
         priority = ticket.get("priority", "").lower()
 
         # Check keywords
-        for category, keywords in self.MOSCOW_KEYWORDS.items():
-            if any(kw in context for kw in keywords):
-                return category
+        category = keyword_index.scan(context).first_category(self.MOSCOW_TABLE)
+        if category:
+            return category
 
         # Map from priority
         priority_mapping = {
@@ -13,6 +13,12 @@ def client() -> TestClient:
     return TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def isolate_model_limits(monkeypatch) -> None:
+    """Give every test its own cache of provider-reported model limits."""
+    monkeypatch.setattr("models.agents.base_agent._model_limits", {})
+
+
 @pytest.fixture(autouse=True)
 def stub_model_providers(monkeypatch) -> None:
     """Stub external model provider calls to avoid network usage during tests."""
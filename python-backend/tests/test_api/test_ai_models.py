@@ -23,3 +23,14 @@ def test_ai_models_endpoint_returns_providers_and_models(client: TestClient) ->
         if model_list:
             assert model_list[0]['id'] == 'fake-model'
             assert model_list[0]['name'] == 'Fake Model'
+
+
+def test_ai_models_follows_default_provider(client: TestClient, monkeypatch) -> None:
+    monkeypatch.setattr('config.settings.settings.DEFAULT_MODEL_PROVIDER', 'local')
+    monkeypatch.setattr('config.settings.settings.LLM_COALESCE_ENABLED', False)
+
+    payload = client.get('/api/ai/models').json()
+
+    assert payload['defaultProvider'] == 'local'
+    assert payload['providers']['local']['configured'] is True
+    assert payload['models']['local'][0]['id'] == 'local-mock'
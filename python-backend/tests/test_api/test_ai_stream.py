@@ -0,0 +1,118 @@
+"""Integration tests for the streaming agent endpoint."""
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from models.providers.base import ModelProvider
+from models.providers.factory import get_model_provider
+
+REFINED = {
+    "id": "MVM-1",
+    "summary": "Refined login ticket",
+    "description": "Users can sign in with SSO credentials",
+    "priority": "High",
+    "type": "Story",
+    "acceptanceCriteria": ["SSO login works"],
+}
+
+
+class StreamingProvider(ModelProvider):
+    """Provider stand-in streaming a fixed response in small chunks."""
+
+    def __init__(self, content: str):
+        super().__init__(api_key="test")
+        self.content = content
+        self.streams = 0
+
+    async def inference(self, prompt, model, system_prompt=None, max_tokens=4000, temperature=0.7, **kwargs):
+        raise AssertionError("streaming endpoint must not use inference()")
+
+    async def stream_inference(self, prompt, model, system_prompt=None, max_tokens=4000, temperature=0.7, **kwargs):
+        self.streams += 1
+        for start in range(0, len(self.content), 16):
+            yield {"type": "delta", "text": self.content[start:start + 16]}
+        yield {"type": "done", "usage": {"input_tokens": 50, "output_tokens": 20}, "model": model}
+
+    async def list_models(self):
+        return []
+
+    async def health_check(self):
+        return True
+
+
+def parse_sse(text: str) -> List[Dict[str, Any]]:
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        event = json.loads(lines["data"])
+        assert event["type"] == lines["event"]
+        events.append(event)
+    return events
+
+
+@pytest.fixture
+def use_provider(monkeypatch):
+    monkeypatch.setattr("models.providers.response_cache._shared_cache", None)
+
+    def install(provider: ModelProvider) -> ModelProvider:
+        app.dependency_overrides[get_model_provider] = lambda: provider
+        return provider
+
+    yield install
+    app.dependency_overrides.pop(get_model_provider, None)
+
+
+def test_stream_ticket_refinement(client: TestClient, use_provider) -> None:
+    provider = use_provider(StreamingProvider(json.dumps(REFINED)))
+
+    response = client.post('/api/ai/stream', json={'ticket': {'id': 'MVM-1', 'summary': 'login'}})
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/event-stream')
+    events = parse_sse(response.text)
+    deltas = [e for e in events if e['type'] == 'delta']
+    assert len(deltas) > 1
+    assert json.loads(''.join(e['text'] for e in deltas)) == REFINED
+
+    done = events[-1]
+    assert done['type'] == 'done' and done['success'] is True
+    assert done['ticket']['summary'] == 'Refined login ticket'
+    assert done['ticket']['_refinement']['ai_enhanced'] is True
+
+    # A repeated request is replayed from the response cache as one delta
+    events = parse_sse(client.post('/api/ai/stream', json={'ticket': {'id': 'MVM-1', 'summary': 'login'}}).text)
+    assert [e['type'] for e in events] == ['delta', 'done']
+    assert events[-1]['cached'] is True
+    assert provider.streams == 1
+
+
+def test_stream_document_summary(client: TestClient, use_provider) -> None:
+    summary = {'summary': 'Short', 'risks': ['Scope'], 'recommendations': ['Plan']}
+    use_provider(StreamingProvider(json.dumps(summary)))
+
+    response = client.post('/api/ai/stream', json={'agent': 'document', 'content': 'Project charter text'})
+
+    done = parse_sse(response.text)[-1]
+    assert done['summary']['risks'] == ['Scope']
+    assert done['summary']['ai_enhanced'] is True
+
+
+def test_stream_reports_invalid_output(client: TestClient, use_provider) -> None:
+    use_provider(StreamingProvider('not json'))
+
+    done = parse_sse(client.post('/api/ai/stream', json={'ticket': {'id': 'MVM-2', 'summary': 'x'}}).text)[-1]
+
+    assert done['success'] is False
+    assert '_refinement' not in done['ticket']
+
+
+def test_stream_requires_input(client: TestClient, use_provider) -> None:
+    use_provider(StreamingProvider('{}'))
+
+    assert client.post('/api/ai/stream', json={'agent': 'ticket'}).status_code == 400
+    assert client.post('/api/ai/stream', json={'agent': 'document'}).status_code == 400
@@ -0,0 +1,36 @@
+"""Integration tests for embedding handle resolution."""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from services import embedding_cache
+from services.embedding_cache import EmbeddingCache
+from services.embedding_codec import decode_embedding
+
+
+@pytest.fixture
+def shared_cache(monkeypatch, tmp_path):
+    cache = EmbeddingCache(max_entries=10, disk_path=str(tmp_path / "embeddings.db"))
+    monkeypatch.setattr(embedding_cache, "_shared_cache", cache)
+    yield cache
+    cache.close()
+
+
+def test_resolve_handle_round_trip(client: TestClient, shared_cache: EmbeddingCache) -> None:
+    vector = np.array([0.25, -0.5, 1.0], dtype=np.float32)
+    shared_cache.put_many({"handle-1": vector})
+    shared_cache.clear()
+
+    response = client.get('/api/embeddings/handle-1', params={'format': 'float32'})
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload['dim'] == 3
+    assert np.array_equal(decode_embedding(payload['embedding']), vector)
+
+
+def test_resolve_unknown_handle(client: TestClient, shared_cache: EmbeddingCache) -> None:
+    assert client.get('/api/embeddings/missing').status_code == 404
+    assert client.get('/api/embeddings/missing', params={'format': 'omit'}).status_code == 400
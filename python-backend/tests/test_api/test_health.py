@@ -12,3 +12,29 @@ def test_health_endpoint(client: TestClient) -> None:
     payload = response.json()
     assert payload.get('status') == 'OK'
     assert payload.get('backend') == 'python'
+
+
+def test_readiness_waits_for_model_warmup(client: TestClient, monkeypatch) -> None:
+    """Readiness probe should return 503 while warm-up models are loading."""
+    import threading
+
+    from services.model_registry import ModelRegistry
+    import main
+
+    registry = ModelRegistry()
+    release = threading.Event()
+    registry.register('slow', lambda: release.wait(5) and 'model')
+    monkeypatch.setattr(main, 'model_registry', registry)
+
+    assert client.get('/api/health/ready').status_code == 200
+
+    thread = registry.warm_up()
+    response = client.get('/api/health/ready')
+    assert response.status_code == 503
+    assert client.get('/api/health').json().get('modelsReady') is False
+
+    release.set()
+    thread.join(5)
+    response = client.get('/api/health/ready')
+    assert response.status_code == 200
+    assert response.json()['models']['slow']['state'] == 'ready'
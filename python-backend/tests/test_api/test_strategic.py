@@ -0,0 +1,60 @@
+"""Integration tests for strategic analysis endpoints."""
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+TICKETS = [
+    {
+        "id": "MVM-1001",
+        "summary": "Reduce billing cost",
+        "description": "Budget review for the customer platform; risk of competitor entry",
+        "priority": "High",
+        "type": "Story",
+    },
+    {
+        "id": "MVM-1002",
+        "summary": "Reduce billing cost",
+        "description": "Budget review for the customer platform; risk of competitor entry",
+        "priority": "High",
+        "type": "Story",
+    },
+    {
+        "id": "MVM-1003",
+        "summary": "Export report",
+        "description": "Nice to have CSV export",
+        "priority": "Low",
+        "type": "Task",
+    },
+]
+
+
+def test_strategic_analyze_single(client: TestClient) -> None:
+    response = client.post('/api/strategic/analyze', json=TICKETS[0])
+    assert response.status_code == 200
+
+    payload = response.json()
+    assert payload['id'] == 'MVM-1001'
+    assert set(payload['_strategic']) >= {'pestle', 'swot', 'moscow', 'recommendations', 'confidence'}
+
+
+def test_strategic_batch_matches_single_and_rolls_up(client: TestClient) -> None:
+    response = client.post('/api/strategic/batch', json={'tickets': TICKETS})
+    assert response.status_code == 200
+
+    payload = response.json()
+    assert [t['ticketId'] for t in payload['tickets']] == ['MVM-1001', 'MVM-1002', 'MVM-1003']
+
+    single = client.post('/api/strategic/analyze', json=TICKETS[2]).json()['_strategic']
+    assert payload['tickets'][2]['strategic'] == single
+
+    summary = payload['summary']
+    assert summary['totalTickets'] == 3
+    assert summary['distinctAnalyses'] == 2
+    assert summary['moscow'] == {'must': 0, 'should': 2, 'could': 1, 'wont': 0}
+    assert summary['pestle']['Economic']['mentioned'] == 2
+    assert summary['swot']['Threats'] == {'risk': 2, 'competitor': 2}
+
+
+def test_strategic_batch_requires_tickets(client: TestClient) -> None:
+    response = client.post('/api/strategic/batch', json={'tickets': []})
+    assert response.status_code == 400
@@ -1,10 +1,28 @@
 """Integration tests for upload endpoints."""
 from __future__ import annotations
 
+import asyncio
+import json
 from io import BytesIO
 
+import openpyxl
+import pytest
 from fastapi.testclient import TestClient
 
+XLSX_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+def _workbook_file(rows: int = 5) -> BytesIO:
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(['User Story', 'Priority', 'Assignee'])
+    for i in range(rows):
+        ws.append([f'As a user I want feature {i}', 'High', 'John Doe'])
+    buffer = BytesIO()
+    wb.save(buffer)
+    buffer.seek(0)
+    return buffer
+
 
 def test_upload_requires_file(client: TestClient) -> None:
     response = client.post('/api/upload')
@@ -21,3 +39,100 @@ def test_upload_document_rejects_invalid_file_type(client: TestClient) -> None:
     assert response.status_code == 400
     payload = response.json()
     assert 'detail' in payload
+
+
+def test_upload_returns_tickets_and_metadata(client: TestClient) -> None:
+    files = {'file': ('tickets.xlsx', _workbook_file(), XLSX_TYPE)}
+
+    response = client.post('/api/upload', files=files)
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert len(payload['tickets']) == 5
+    assert payload['_metadata']['processedCount'] == 5
+
+
+def test_upload_streams_ndjson_when_requested(client: TestClient) -> None:
+    files = {'file': ('tickets.xlsx', _workbook_file(), XLSX_TYPE)}
+
+    response = client.post(
+        '/api/upload',
+        files=files,
+        headers={'Accept': 'application/x-ndjson'},
+    )
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('application/x-ndjson')
+
+    records = [json.loads(line) for line in response.text.splitlines() if line]
+    assert [r['id'] for r in records[:-1]] == [f'MVM-{1001 + i}' for i in range(5)]
+    assert records[-1]['_metadata']['processedCount'] == 5
+    assert records[-1]['_metadata']['totalRows'] == 5
+
+
+def test_upload_stream_query_flag_rejects_invalid_workbook(client: TestClient) -> None:
+    files = {'file': ('tickets.xlsx', BytesIO(b'not a workbook'), XLSX_TYPE)}
+
+    response = client.post('/api/upload?stream=true', files=files)
+
+    assert response.status_code == 400
+
+
+def _ndjson_request():
+    from starlette.datastructures import Headers, UploadFile
+    from starlette.requests import Request
+
+    request = Request({'type': 'http', 'headers': [(b'accept', b'application/x-ndjson')]})
+    file = UploadFile(_workbook_file(), filename='tickets.xlsx', headers=Headers({'content-type': XLSX_TYPE}))
+    return request, file
+
+
+def test_closed_stream_releases_job_slot() -> None:
+    from api.routes import upload
+
+    async def run():
+        response = await upload.upload_excel(*_ndjson_request(), False)
+        held = upload.upload_executor.get_stats()['pendingJobs']
+        # Client went away before the rest of the body was iterated
+        await response.body_iterator.aclose()
+        return response, held
+
+    response, held = asyncio.run(run())
+
+    assert response.media_type == 'application/x-ndjson'
+    assert held == 1
+    assert upload.upload_executor.get_stats()['pendingJobs'] == 0
+
+
+def test_stream_rejected_when_queue_full(monkeypatch) -> None:
+    from fastapi import HTTPException
+
+    from api.routes import upload
+
+    monkeypatch.setattr(upload.upload_executor, 'max_pending_jobs', 0)
+
+    with pytest.raises(HTTPException) as caught:
+        asyncio.run(upload.upload_excel(*_ndjson_request(), False))
+
+    assert caught.value.status_code == 503
+    assert upload.upload_executor.get_stats()['pendingJobs'] == 0
+
+
+def test_stream_parses_workbook_once(client: TestClient, monkeypatch) -> None:
+    from workers import upload_executor
+
+    opened = []
+    real_stream = upload_executor.ExcelTicketStream
+
+    def counting_stream(*args, **kwargs):
+        opened.append(1)
+        return real_stream(*args, **kwargs)
+
+    monkeypatch.setattr(upload_executor, 'ExcelTicketStream', counting_stream)
+    files = {'file': ('tickets.xlsx', _workbook_file(), XLSX_TYPE)}
+
+    response = client.post('/api/upload?stream=true', files=files)
+
+    assert response.status_code == 200
+    assert json.loads(response.text.splitlines()[-1])['_metadata']['columnIndices']['User Story'] == 0
+    assert opened == [1]
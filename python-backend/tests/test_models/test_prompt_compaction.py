@@ -0,0 +1,68 @@
+"""Unit tests for agent prompt compaction."""
+import json
+
+from models.agents.prompt_compaction import TRUNCATION_MARKER, compact_json, fit_to_budget, prune, serialize
+from models.providers.rate_limit import estimate_tokens
+
+
+class TestPrune:
+    """Test removal of empty fields, metadata noise and omitted paths."""
+
+    def test_drops_empty_values_and_metadata_noise(self):
+        ticket = {
+            "id": "MVM-1",
+            "assignee": None,
+            "epic": "",
+            "labels": [],
+            "_grounding": {"confidence": 0.6, "timestamp": "2024-01-01T00:00:00", "version": "1.0.0"},
+            "timestamp": "kept outside metadata",
+        }
+
+        assert prune(ticket) == {
+            "id": "MVM-1",
+            "_grounding": {"confidence": 0.6},
+            "timestamp": "kept outside metadata",
+        }
+
+    def test_omits_dotted_paths_through_lists(self):
+        validation = {
+            "issues": ["x"],
+            "compliance": {
+                "score": 20.0,
+                "areas": {"risk": {"coverage": 0.0}},
+                "recommendations": [{"recommendation": "Add criteria", "impact": "Clarity"}],
+            },
+        }
+
+        pruned = prune(validation, ("issues", "compliance.areas", "compliance.recommendations.impact"))
+
+        assert pruned == {"compliance": {"score": 20.0, "recommendations": [{"recommendation": "Add criteria"}]}}
+        assert "areas" in validation["compliance"]
+
+    def test_serialize_is_compact(self):
+        assert serialize({"a": [1, 2], "b": "é"}) == '{"a":[1,2],"b":"é"}'
+        assert serialize({"a": None}) is None
+        assert serialize("") is None
+        assert serialize(3) == "3"
+        assert json.loads(compact_json({"when": 1.5})) == {"when": 1.5}
+
+
+class TestFitToBudget:
+    """Test trimming context sections to a token budget."""
+
+    def test_within_budget_is_unchanged(self):
+        sections = {"a": "short", "b": "text"}
+        assert fit_to_budget(sections, 100) == sections
+
+    def test_trims_longest_section_first(self):
+        sections = {"id": "MVM-1", "document": "x" * 4000}
+
+        trimmed = fit_to_budget(sections, 200)
+
+        assert trimmed["id"] == "MVM-1"
+        assert trimmed["document"].endswith(TRUNCATION_MARKER)
+        assert sum(estimate_tokens(f"{k}: {v}\n") for k, v in trimmed.items()) <= 200
+        assert list(trimmed) == ["id", "document"]
+
+    def test_drops_sections_that_cannot_fit(self):
+        assert fit_to_budget({"a": "y" * 400, "b": "z" * 400}, 0) == {}
@@ -0,0 +1,231 @@
+"""Unit tests for model provider HTTP pooling."""
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+import pytest
+from models.providers import http_pool
+from models.providers.anthropic_provider import AnthropicProvider
+from models.providers.base import ModelProvider
+from models.providers.http_pool import ProviderClientPool
+from models.providers.openrouter_provider import OpenRouterProvider
+
+
+def anthropic_handler(request):
+    body = json.loads(request.content)
+    return httpx.Response(
+        200,
+        json={
+            "content": [{"text": f"echo: {body['messages'][0]['content']}"}],
+            "usage": {"input_tokens": 3, "output_tokens": 2},
+            "stop_reason": "end_turn",
+        },
+    )
+
+
+@pytest.fixture
+def mock_pool(monkeypatch):
+    """Shared pool whose clients answer through a mock transport."""
+    pool = ProviderClientPool()
+    requests = []
+
+    def get(name):
+        client = pool._clients.get(name, (None, None))[0]
+        if client is None or client.is_closed:
+            def handler(request):
+                requests.append((name, request.url.path))
+                return anthropic_handler(request)
+
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            pool._clients[name] = (client, asyncio.get_running_loop())
+            pool._created += 1
+        return client
+
+    monkeypatch.setattr(pool, "get", get)
+    monkeypatch.setattr("models.providers.base.provider_client_pool", pool)
+    return pool, requests
+
+
+class TestProviderClientPool:
+    """Test client reuse and lifecycle."""
+
+    def test_reuses_client_per_provider(self):
+        async def run():
+            pool = ProviderClientPool(max_connections=5, max_keepalive_connections=2)
+            first = pool.get("anthropic")
+            assert pool.get("anthropic") is first
+            assert pool.get("openrouter") is not first
+            stats = pool.get_stats()
+            await pool.aclose()
+            return first, stats
+
+        client, stats = asyncio.run(run())
+        assert client.is_closed
+        assert stats["clients"] == ["anthropic", "openrouter"]
+        assert stats["maxConnections"] == 5
+
+    def test_new_event_loop_gets_new_client(self):
+        pool = ProviderClientPool()
+        first = asyncio.run(self._get(pool))
+        second = asyncio.run(self._get(pool))
+        assert first is not second
+        assert pool.get_stats()["clientsCreated"] == 2
+        assert pool.get_stats()["clientsReplaced"] == 1
+
+    def test_replaced_client_is_closed_on_its_loop(self):
+        pool = ProviderClientPool()
+        owner = asyncio.new_event_loop()
+        thread = threading.Thread(target=owner.run_forever, daemon=True)
+        thread.start()
+        try:
+            first = asyncio.run_coroutine_threadsafe(self._get(pool), owner).result(timeout=5)
+            second = asyncio.run(self._get(pool))
+
+            deadline = time.monotonic() + 5
+            while not first.is_closed and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert first.is_closed
+            assert not second.is_closed
+        finally:
+            owner.call_soon_threadsafe(owner.stop)
+            thread.join(timeout=5)
+            owner.close()
+
+    def test_closed_client_replaced_on_same_loop(self):
+        async def run():
+            pool = ProviderClientPool()
+            first = pool.get("anthropic")
+            await first.aclose()
+            second = pool.get("anthropic")
+            stats = pool.get_stats()
+            await pool.aclose()
+            return first, second, stats
+
+        first, second, stats = asyncio.run(run())
+        assert first is not second
+        assert second.is_closed
+        assert stats["clientsReplaced"] == 0
+
+    def test_http2_requires_h2(self, monkeypatch):
+        monkeypatch.setattr(http_pool, "HAS_H2", False)
+        assert ProviderClientPool(http2=True).http2 is False
+
+    @staticmethod
+    async def _get(pool):
+        return pool.get("anthropic")
+
+
+def test_providers_share_pooled_client(mock_pool):
+    pool, requests = mock_pool
+
+    async def run():
+        first = await AnthropicProvider(api_key="k").inference("hello")
+        second = await AnthropicProvider(api_key="k").inference("again")
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first["content"] == "echo: hello"
+    assert second["usage"] == {"input_tokens": 3, "output_tokens": 2}
+    assert requests == [("anthropic", "/v1/messages")] * 2
+    assert pool.get_stats()["clientsCreated"] == 1
+    assert OpenRouterProvider.pool_name == "openrouter"
+
+
+def sse_body(events):
+    """Encode (event, data) pairs as a server-sent events body."""
+    lines = []
+    for event, data in events:
+        if isinstance(data, str) and data.startswith(":"):
+            lines.extend([data, ""])
+            continue
+        if event:
+            lines.append(f"event: {event}")
+        lines.append(f"data: {data if isinstance(data, str) else json.dumps(data)}")
+        lines.append("")
+    return ("\n".join(lines) + "\n").encode()
+
+
+def streaming_provider(provider, status, body):
+    """Point a provider's client at a mock transport answering with body."""
+    seen = []
+
+    def handler(request):
+        seen.append(json.loads(request.content))
+        return httpx.Response(status, content=body, headers={"content-type": "text/event-stream"})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    provider._client = lambda: client
+    return provider, seen
+
+
+async def collect(stream):
+    return [event async for event in stream]
+
+
+class TestStreamInference:
+    """Test native streaming of both providers."""
+
+    def test_anthropic_stream(self):
+        body = sse_body([
+            ("message_start", {"type": "message_start", "message": {"usage": {"input_tokens": 12}}}),
+            (None, ": ping"),
+            ("content_block_delta", {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "Hel"}}),
+            ("ping", {"type": "ping"}),
+            ("content_block_delta", {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "lo"}}),
+            ("message_delta", {"type": "message_delta", "delta": {"stop_reason": "max_tokens"}, "usage": {"output_tokens": 2}}),
+            ("message_stop", {"type": "message_stop"}),
+        ])
+        provider, seen = streaming_provider(AnthropicProvider(api_key="k"), 200, body)
+
+        events = asyncio.run(collect(provider.stream_inference("hi", system_prompt="sys")))
+
+        assert [e["text"] for e in events if e["type"] == "delta"] == ["Hel", "lo"]
+        done = events[-1]
+        assert done["type"] == "done"
+        assert done["usage"] == {"input_tokens": 12, "output_tokens": 2}
+        assert done["finish_reason"] == "max_tokens"
+        assert seen[0]["stream"] is True and seen[0]["system"] == "sys"
+        assert provider.get_stats()["total_requests"] == 1
+
+    def test_anthropic_stream_error_event(self):
+        body = sse_body([("error", {"type": "error", "error": {"message": "Overloaded"}})])
+        provider, _ = streaming_provider(AnthropicProvider(api_key="k"), 200, body)
+
+        with pytest.raises(ValueError, match="Overloaded"):
+            asyncio.run(collect(provider.stream_inference("hi")))
+        assert provider.get_stats()["total_errors"] == 1
+
+    def test_openrouter_stream(self):
+        body = sse_body([
+            (None, ": OPENROUTER PROCESSING"),
+            (None, {"model": "meta/llama", "choices": [{"delta": {"role": "assistant", "content": "Hel"}}]}),
+            (None, {"choices": [{"delta": {"content": "lo"}, "finish_reason": "stop"}]}),
+            (None, {"choices": [], "usage": {"prompt_tokens": 9, "completion_tokens": 2, "total_tokens": 11}}),
+            (None, "[DONE]"),
+        ])
+        provider, seen = streaming_provider(OpenRouterProvider(api_key="k"), 200, body)
+
+        events = asyncio.run(collect(provider.stream_inference("hi", top_p=0.9)))
+
+        assert "".join(e["text"] for e in events if e["type"] == "delta") == "Hello"
+        assert events[-1]["usage"] == {"input_tokens": 9, "output_tokens": 2, "total_tokens": 11}
+        assert events[-1]["model"] == "meta/llama"
+        assert seen[0]["stream"] is True and seen[0]["top_p"] == 0.9
+
+    def test_openrouter_http_error(self):
+        provider, _ = streaming_provider(OpenRouterProvider(api_key="k"), 429, b'{"error": "rate limited"}')
+
+        with pytest.raises(ValueError, match="429 - .*rate limited"):
+            asyncio.run(collect(provider.stream_inference("hi")))
+
+    def test_default_stream_wraps_inference(self, mock_pool):
+        class BufferedProvider(AnthropicProvider):
+            stream_inference = ModelProvider.stream_inference
+
+        events = asyncio.run(collect(BufferedProvider(api_key="k").stream_inference("hi", "model")))
+
+        assert events[0] == {"type": "delta", "text": "echo: hi"}
+        assert events[1]["type"] == "done"
+        assert events[1]["usage"] == {"input_tokens": 3, "output_tokens": 2}
@@ -0,0 +1,95 @@
+"""Unit tests for the model response cache."""
+import pytest
+from models.providers.response_cache import ResponseCache, response_key
+
+RESPONSE = {"content": "{}", "usage": {"input_tokens": 10, "output_tokens": 5}}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class TestResponseKey:
+    """Test request fingerprints."""
+
+    def test_every_field_changes_key(self):
+        base = ("anthropic", "model", "system", "prompt", 0.5, 2000)
+        variants = [
+            ("openrouter", "model", "system", "prompt", 0.5, 2000),
+            ("anthropic", "other", "system", "prompt", 0.5, 2000),
+            ("anthropic", "model", "other", "prompt", 0.5, 2000),
+            ("anthropic", "model", "system", "other", 0.5, 2000),
+            ("anthropic", "model", "system", "prompt", 0.7, 2000),
+            ("anthropic", "model", "system", "prompt", 0.5, 1000),
+        ]
+        assert response_key(*base) == response_key(*base)
+        assert len({response_key(*v) for v in variants} | {response_key(*base)}) == 7
+
+
+class TestResponseCache:
+    """Test LRU, TTL and disk tiers."""
+
+    def test_hit_returns_copy(self, clock):
+        cache = ResponseCache(max_entries=10, ttl_seconds=60, clock=clock)
+        cache.put("k", RESPONSE)
+
+        hit = cache.get("k")
+        hit["content"] = "changed"
+
+        assert cache.get("k") == RESPONSE
+        assert cache.get("missing") is None
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"]) == (2, 1)
+        assert stats["hitRate"] == pytest.approx(2 / 3, abs=1e-4)
+
+    def test_entries_expire_after_ttl(self, clock):
+        cache = ResponseCache(max_entries=10, ttl_seconds=60, clock=clock)
+        cache.put("k", RESPONSE)
+
+        clock.now += 59
+        assert cache.get("k") == RESPONSE
+        clock.now += 2
+        assert cache.get("k") is None
+        assert cache.get_stats()["expired"] == 1
+
+    def test_zero_ttl_never_expires(self, clock):
+        cache = ResponseCache(max_entries=10, ttl_seconds=0, clock=clock)
+        cache.put("k", RESPONSE)
+        clock.now += 10**9
+        assert cache.get("k") == RESPONSE
+
+    def test_lru_eviction(self, clock):
+        cache = ResponseCache(max_entries=2, ttl_seconds=60, clock=clock)
+        cache.put("a", RESPONSE)
+        cache.put("b", RESPONSE)
+        cache.get("a")
+        cache.put("c", RESPONSE)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == cache.get("c") == RESPONSE
+
+    def test_disk_tier_survives_restart(self, clock, tmp_path):
+        path = str(tmp_path / "responses.db")
+        cache = ResponseCache(max_entries=10, ttl_seconds=60, disk_path=path, clock=clock)
+        cache.put("k", RESPONSE)
+        cache.close()
+
+        reopened = ResponseCache(max_entries=10, ttl_seconds=60, disk_path=path, clock=clock)
+        assert reopened.get("k") == RESPONSE
+        assert reopened.get("k") == RESPONSE
+        stats = reopened.get_stats()
+        assert (stats["diskHits"], stats["hits"]) == (1, 1)
+
+        clock.now += 120
+        restarted = ResponseCache(max_entries=10, ttl_seconds=60, disk_path=path, clock=clock)
+        assert restarted.get("k") is None
+        assert restarted.get_stats()["expired"] == 1
@@ -0,0 +1,247 @@
+"""Unit tests for latency-aware provider routing."""
+import asyncio
+import time
+
+import pytest
+from models.providers import factory
+from models.providers.base import ModelProvider
+from models.providers.rate_limit import RateLimiter
+from models.providers.router_provider import RouterProvider, RouteTarget
+
+
+class Backend(ModelProvider):
+    """Provider stand-in with scripted latencies and failures."""
+
+    def __init__(self, name, delay=0.0, fail=False):
+        super().__init__(api_key="test")
+        self.pool_name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = []
+        self.cancelled = 0
+
+    async def inference(self, prompt, model, system_prompt=None, max_tokens=4000, temperature=0.7, **kwargs):
+        self.calls.append(model)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise ValueError(f"{self.pool_name} down")
+        return {"content": f"from {self.pool_name}", "usage": {}, "model": model}
+
+    async def stream_inference(self, prompt, model, system_prompt=None, max_tokens=4000, temperature=0.7, **kwargs):
+        self.calls.append(model)
+        if self.fail:
+            raise ValueError(f"{self.pool_name} down")
+        yield {"type": "delta", "text": self.pool_name}
+        await asyncio.sleep(self.delay)
+        yield {"type": "done", "usage": {}, "model": model}
+
+    async def list_models(self):
+        return [{"id": f"{self.pool_name}-model"}, {"id": "shared"}]
+
+    async def health_check(self):
+        return not self.fail
+
+
+def seed(target, latency, count=20):
+    for _ in range(count):
+        target.record_success(latency)
+
+
+def run(router, **kwargs):
+    return asyncio.run(router.inference("hi", "requested", **kwargs))
+
+
+class TestRouting:
+    """Test backend selection and failover."""
+
+    def test_routes_to_fastest_backend(self):
+        slow, fast = Backend("slow", delay=0.03), Backend("fast", delay=0.005)
+        router = RouterProvider([RouteTarget(slow), RouteTarget(fast)], hedge=False)
+
+        results = [run(router)["provider"] for _ in range(6)]
+
+        # Each backend is measured once, then the faster one takes the traffic
+        assert results[:2] == ["slow", "fast"]
+        assert results[2:] == ["fast"] * 4
+        stats = router.get_stats()["targets"]
+        assert stats["fast"]["wins"] == 5
+        assert stats["slow"]["p50Ms"] > stats["fast"]["p50Ms"]
+
+    def test_pinned_model_overrides_requested(self):
+        backend = Backend("openrouter")
+        router = RouterProvider([RouteTarget(backend, model="anthropic/claude")], hedge=False)
+
+        result = run(router)
+
+        assert backend.calls == ["anthropic/claude"]
+        assert result["provider"] == "openrouter:anthropic/claude"
+
+    def test_fails_over_on_error(self):
+        broken, backup = Backend("broken", fail=True), Backend("backup")
+        router = RouterProvider([RouteTarget(broken), RouteTarget(backup)], hedge=False)
+
+        result = run(router)
+
+        assert result["content"] == "from backup"
+        stats = router.get_stats()
+        assert stats["failovers"] == 1
+        assert stats["targets"]["broken"]["errors"] == 1
+        assert stats["total_requests"] == 1 and stats["total_errors"] == 0
+
+    def test_failing_backend_cools_down(self, monkeypatch):
+        monkeypatch.setattr("models.providers.router_provider.settings.LLM_ROUTER_MAX_FAILURES", 2)
+        monkeypatch.setattr("models.providers.router_provider.settings.LLM_ROUTER_COOLDOWN", 30.0)
+        now = [0.0]
+        broken, backup = Backend("broken", fail=True), Backend("backup")
+        router = RouterProvider([RouteTarget(broken), RouteTarget(backup)], hedge=False, clock=lambda: now[0])
+
+        for _ in range(4):
+            run(router)
+        assert len(broken.calls) == 2
+        assert router.get_stats()["targets"]["broken"]["healthy"] is False
+
+        now[0] = 31.0
+        broken.fail = False
+        run(router)
+        assert len(broken.calls) == 3
+
+    def test_all_backends_failing(self):
+        router = RouterProvider([RouteTarget(Backend("a", fail=True)), RouteTarget(Backend("b", fail=True))])
+
+        with pytest.raises(ValueError, match="a down; b: b down"):
+            run(router)
+        assert router.get_stats()["total_errors"] == 1
+
+
+class TestHedging:
+    """Test hedged duplicates after the p95 latency."""
+
+    def test_slow_call_is_hedged(self):
+        primary, runner_up = Backend("primary", delay=0.5), Backend("runner_up", delay=0.01)
+        targets = [RouteTarget(primary), RouteTarget(runner_up)]
+        seed(targets[0], 0.01)
+        seed(targets[1], 0.02)
+        router = RouterProvider(targets, hedge=True, hedge_quantile=0.95)
+
+        started = time.perf_counter()
+        result = run(router)
+        elapsed = time.perf_counter() - started
+
+        assert result["provider"] == "runner_up"
+        assert elapsed < 0.25
+        assert primary.cancelled == 1
+        stats = router.get_stats()
+        assert (stats["hedges"], stats["hedge_wins"]) == (1, 1)
+        # Losing the race is not an error
+        assert stats["targets"]["primary"]["errors"] == 0
+        assert stats["targets"]["primary"]["cancelled"] == 1
+
+    def test_no_hedge_without_enough_samples(self):
+        primary, runner_up = Backend("primary", delay=0.05), Backend("runner_up")
+        router = RouterProvider([RouteTarget(primary), RouteTarget(runner_up)], hedge=True, hedge_min_samples=20)
+
+        assert run(router)["provider"] == "primary"
+        assert runner_up.calls == []
+
+    def test_calls_are_charged_to_each_backends_limiter(self):
+        primary, runner_up = Backend("primary", delay=0.5), Backend("runner_up", delay=0.01)
+        limiters = [RateLimiter(requests_per_minute=60, tokens_per_minute=100000) for _ in range(2)]
+        targets = [RouteTarget(primary, rate_limiter=limiters[0]), RouteTarget(runner_up, rate_limiter=limiters[1])]
+        seed(targets[0], 0.01)
+        seed(targets[1], 0.02)
+        router = RouterProvider(targets, hedge=True)
+
+        assert run(router, max_tokens=100)["provider"] == "runner_up"
+        assert [limiter.acquired for limiter in limiters] == [1, 1]
+        assert limiters[0]._tokens <= 100000 - 100
+        assert router.rate_limits_upstream is True
+
+    def test_hedge_survives_primary_failure(self):
+        primary, runner_up = Backend("primary", delay=0.05, fail=True), Backend("runner_up", delay=0.1)
+        targets = [RouteTarget(primary), RouteTarget(runner_up)]
+        seed(targets[0], 0.01)
+        seed(targets[1], 0.02)
+        router = RouterProvider(targets, hedge=True)
+
+        assert run(router)["provider"] == "runner_up"
+        assert router.get_stats()["failovers"] == 0
+
+
+class TestRouterStreaming:
+    """Test streaming failover."""
+
+    def test_stream_fails_over_before_first_delta(self):
+        router = RouterProvider([RouteTarget(Backend("broken", fail=True)), RouteTarget(Backend("backup"))])
+
+        async def collect():
+            return [e async for e in router.stream_inference("hi", "requested")]
+
+        events = asyncio.run(collect())
+
+        assert events[0] == {"type": "delta", "text": "backup"}
+        assert events[-1]["provider"] == "backup"
+        assert router.get_stats()["failovers"] == 1
+
+    def test_stream_records_time_to_first_chunk(self):
+        long_answer = RouteTarget(Backend("long", delay=0.2))
+        router = RouterProvider([long_answer], hedge=False)
+
+        async def collect():
+            return [e async for e in router.stream_inference("hi", "requested")]
+
+        asyncio.run(collect())
+
+        # The stream's length must not feed the latency window used for hedging
+        assert list(long_answer.latencies) == []
+        assert long_answer.quantile(0.5, stream=True) < 0.1
+        assert router.get_stats()["targets"]["long"]["firstChunkP50Ms"] < 100
+
+    def test_stream_is_charged_to_serving_backend(self):
+        limiters = [RateLimiter(requests_per_minute=60) for _ in range(2)]
+        router = RouterProvider([
+            RouteTarget(Backend("broken", fail=True), rate_limiter=limiters[0]),
+            RouteTarget(Backend("backup"), rate_limiter=limiters[1]),
+        ])
+
+        async def collect():
+            return [e async for e in router.stream_inference("hi", "requested")]
+
+        asyncio.run(collect())
+
+        assert [limiter.acquired for limiter in limiters] == [1, 1]
+
+    def test_models_and_health_merge_backends(self):
+        router = RouterProvider([RouteTarget(Backend("a", fail=True)), RouteTarget(Backend("b"))])
+
+        models = asyncio.run(router.list_models())
+
+        assert [m["id"] for m in models] == ["a-model", "shared", "b-model"]
+        assert asyncio.run(router.health_check()) is True
+
+
+def test_factory_builds_shared_router(monkeypatch):
+    monkeypatch.setattr(factory.settings, "DEFAULT_MODEL_PROVIDER", "router")
+    monkeypatch.setattr(factory.settings, "LLM_ROUTER_BACKENDS", ["anthropic", "openrouter:anthropic/claude-3.5-sonnet"])
+    monkeypatch.setattr(factory, "_shared_router", None)
+
+    monkeypatch.setattr(factory.settings, "LLM_COALESCE_ENABLED", False)
+
+    router = factory.get_model_provider()
+
+    assert router is factory.get_model_provider()
+    assert [t.name for t in router.targets] == ["anthropic", "openrouter:anthropic/claude-3.5-sonnet"]
+    with pytest.raises(ValueError):
+        factory.create_provider("unknown")
+
+
+def test_agent_does_not_charge_router_twice():
+    from models.agents.document_agent import DocumentAgent
+
+    router = RouterProvider([RouteTarget(Backend("a"))])
+    agent = DocumentAgent(router)
+
+    assert agent.rate_limiter.enabled is False
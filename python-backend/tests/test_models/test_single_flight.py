@@ -0,0 +1,199 @@
+"""Unit tests for single-flight coalescing of model calls."""
+import asyncio
+
+import pytest
+from models.providers import factory
+from models.providers.base import ModelProvider
+from models.providers.single_flight import CoalescingProvider, SingleFlight
+
+
+class CountingProvider(ModelProvider):
+    """Provider stand-in that blocks until released."""
+
+    pool_name = "counting"
+
+    def __init__(self, fail=False):
+        super().__init__(api_key="test")
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+        self.release = None
+
+    async def inference(self, prompt, model, system_prompt=None, max_tokens=4000, temperature=0.7, **kwargs):
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise ValueError("upstream error")
+        return {"content": f"answer to {prompt}", "usage": {"input_tokens": 1, "output_tokens": 1}}
+
+    async def list_models(self):
+        return [{"id": "m"}]
+
+    async def health_check(self):
+        return True
+
+
+@pytest.fixture
+def provider():
+    return CountingProvider()
+
+
+def coalescing(provider):
+    return CoalescingProvider(provider, SingleFlight())
+
+
+async def settle():
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+class TestCoalescing:
+    """Test sharing of identical in-flight calls."""
+
+    def test_identical_calls_share_one_request(self, provider):
+        wrapped = coalescing(provider)
+
+        async def run():
+            provider.release = asyncio.Event()
+            calls = [asyncio.ensure_future(wrapped.inference("p", "m")) for _ in range(5)]
+            await settle()
+            provider.release.set()
+            return await asyncio.gather(*calls)
+
+        results = asyncio.run(run())
+
+        assert provider.calls == 1
+        assert all(r["content"] == "answer to p" for r in results)
+        # Each caller gets its own copy
+        assert len({id(r) for r in results}) == 5
+        stats = wrapped.get_stats()["coalescing"]
+        assert (stats["upstreamCalls"], stats["coalesced"], stats["inFlight"]) == (1, 4, 0)
+        assert stats["coalescedRate"] == 0.8
+
+    def test_different_requests_are_not_shared(self, provider):
+        wrapped = coalescing(provider)
+
+        async def run():
+            provider.release = asyncio.Event()
+            calls = [
+                asyncio.ensure_future(wrapped.inference("p", "m")),
+                asyncio.ensure_future(wrapped.inference("q", "m")),
+                asyncio.ensure_future(wrapped.inference("p", "m", temperature=0.2)),
+                asyncio.ensure_future(wrapped.inference("p", "m", top_p=0.9)),
+            ]
+            await settle()
+            provider.release.set()
+            await asyncio.gather(*calls)
+
+        asyncio.run(run())
+        assert provider.calls == 4
+
+    def test_completed_calls_are_not_reused(self, provider):
+        wrapped = coalescing(provider)
+
+        async def run():
+            provider.release = asyncio.Event()
+            provider.release.set()
+            await wrapped.inference("p", "m")
+            await wrapped.inference("p", "m")
+
+        asyncio.run(run())
+        assert provider.calls == 2
+
+    def test_error_is_shared(self):
+        provider = CountingProvider(fail=True)
+        wrapped = coalescing(provider)
+
+        async def run():
+            provider.release = asyncio.Event()
+            calls = [asyncio.ensure_future(wrapped.inference("p", "m")) for _ in range(3)]
+            await settle()
+            provider.release.set()
+            return await asyncio.gather(*calls, return_exceptions=True)
+
+        results = asyncio.run(run())
+        assert provider.calls == 1
+        assert all(isinstance(r, ValueError) for r in results)
+
+
+class TestCancellation:
+    """Test that cancelling callers never strands the others."""
+
+    def test_cancelled_leader_does_not_cancel_followers(self, provider):
+        wrapped = coalescing(provider)
+
+        async def run():
+            provider.release = asyncio.Event()
+            leader = asyncio.ensure_future(wrapped.inference("p", "m"))
+            await settle()
+            follower = asyncio.ensure_future(wrapped.inference("p", "m"))
+            await settle()
+            leader.cancel()
+            await settle()
+            provider.release.set()
+            return leader, await follower
+
+        leader, result = asyncio.run(run())
+
+        assert leader.cancelled()
+        assert result["content"] == "answer to p"
+        assert (provider.calls, provider.cancelled) == (1, 0)
+
+    def test_upstream_cancelled_when_every_caller_leaves(self, provider):
+        group = SingleFlight()
+        wrapped = CoalescingProvider(provider, group)
+
+        async def run():
+            provider.release = asyncio.Event()
+            calls = [asyncio.ensure_future(wrapped.inference("p", "m")) for _ in range(2)]
+            await settle()
+            for call in calls:
+                call.cancel()
+            await settle()
+            # A new caller starts a fresh upstream request
+            provider.release.set()
+            return await wrapped.inference("p", "m")
+
+        result = asyncio.run(run())
+
+        assert result["content"] == "answer to p"
+        assert (provider.calls, provider.cancelled) == (2, 1)
+        assert group.get_stats()["abandoned"] == 1
+        assert group.get_stats()["inFlight"] == 0
+
+    def test_caller_timeout_leaves_flight_running(self, provider):
+        wrapped = coalescing(provider)
+
+        async def run():
+            provider.release = asyncio.Event()
+            patient = asyncio.ensure_future(wrapped.inference("p", "m"))
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(wrapped.inference("p", "m"), timeout=0.01)
+            provider.release.set()
+            return await patient
+
+        assert asyncio.run(run())["content"] == "answer to p"
+        assert provider.calls == 1
+
+
+def test_wrapper_keeps_provider_identity(provider):
+    wrapped = coalescing(provider)
+
+    assert wrapped.pool_name == "counting"
+    assert asyncio.run(wrapped.list_models()) == [{"id": "m"}]
+    assert "total_requests" in wrapped.get_stats()
+
+
+def test_factory_wraps_default_provider(monkeypatch):
+    monkeypatch.setattr(factory.settings, "DEFAULT_MODEL_PROVIDER", "anthropic")
+    monkeypatch.setattr(factory.settings, "LLM_COALESCE_ENABLED", True)
+
+    first, second = factory.get_model_provider(), factory.get_model_provider()
+
+    assert isinstance(first, CoalescingProvider)
+    assert first.group is second.group
+    assert first.pool_name == "anthropic"
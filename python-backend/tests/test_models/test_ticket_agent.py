@@ -0,0 +1,420 @@
+"""Unit tests for TicketAgent batch refinement."""
+import asyncio
+import json
+import re
+
+import pytest
+from models.agents.base_agent import DEFAULT_CONTEXT_WINDOW
+from models.agents.ticket_agent import TicketAgent
+from models.providers.base import ModelProvider
+from models.providers.rate_limit import RateLimiter, estimate_tokens
+from services.grounding_service import GroundingService
+
+
+class FakeProvider(ModelProvider):
+    """Provider stand-in returning a refined ticket after a short delay."""
+
+    def __init__(self, delay=0.01, fail_ids=()):
+        super().__init__(api_key="test")
+        self.delay = delay
+        self.fail_ids = set(fail_ids)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+        self.prompt_chars = 0
+        self.prompts = []
+
+    async def inference(self, prompt, model, system_prompt=None, max_tokens=4000, temperature=0.7, **kwargs):
+        ticket_id = re.search(r'"id": ?"([^"]+)"', prompt).group(1)
+        self.calls += 1
+        self.prompts.append(prompt)
+        self.prompt_chars += len(prompt) + len(system_prompt or "")
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if ticket_id in self.fail_ids:
+            raise ValueError("provider error")
+        refined = {
+            "id": ticket_id,
+            "summary": f"Refined {ticket_id}",
+            "description": "Refined description with business context",
+            "priority": "High",
+            "type": "Story",
+            "assignee": "Unassigned",
+            "acceptanceCriteria": ["Works"],
+        }
+        return {"content": json.dumps(refined), "usage": {"input_tokens": 100, "output_tokens": 50}}
+
+    async def list_models(self):
+        return []
+
+    async def health_check(self):
+        return True
+
+
+def make_tickets(count):
+    return [{"id": f"MVM-{i}", "summary": f"Ticket {i}", "priority": "Low", "type": "Task"} for i in range(count)]
+
+
+@pytest.fixture
+def grounding_service():
+    return GroundingService()
+
+
+@pytest.fixture(autouse=True)
+def fresh_response_cache(monkeypatch):
+    """Give each test its own shared response cache."""
+    monkeypatch.setattr("models.providers.response_cache._shared_cache", None)
+
+
+class TestBatchProcessTickets:
+    """Test bounded-concurrency batch refinement."""
+
+    def test_bounded_concurrency_preserves_order(self, grounding_service):
+        provider = FakeProvider()
+        agent = TicketAgent(provider, grounding_service, rate_limiter=RateLimiter())
+
+        result = asyncio.run(agent.batch_process_tickets(make_tickets(12), max_concurrency=4))
+
+        assert provider.max_in_flight == 4
+        assert [t["id"] for t in result["tickets"]] == [f"MVM-{i}" for i in range(12)]
+        assert result["processed"] == result["enhanced"] == 12
+        assert result["failed"] == 0
+
+    def test_failed_model_call_falls_back_per_ticket(self, grounding_service):
+        provider = FakeProvider(fail_ids={"MVM-2"})
+        agent = TicketAgent(provider, grounding_service, rate_limiter=RateLimiter())
+
+        result = asyncio.run(agent.batch_process_tickets(make_tickets(5), max_concurrency=3))
+
+        tickets = result["tickets"]
+        assert [t["id"] for t in tickets] == [f"MVM-{i}" for i in range(5)]
+        assert "_refinement" not in tickets[2]
+        assert result["enhanced"] == 4
+
+    def test_exception_isolated_to_ticket(self, grounding_service, monkeypatch):
+        agent = TicketAgent(FakeProvider(), grounding_service, rate_limiter=RateLimiter())
+        original = agent.process_ticket
+
+        async def flaky(ticket, source_data=None, enhance=True):
+            if ticket["id"] == "MVM-1":
+                raise RuntimeError("boom")
+            return await original(ticket, source_data, enhance)
+
+        monkeypatch.setattr(agent, "process_ticket", flaky)
+        result = asyncio.run(agent.batch_process_tickets(make_tickets(3)))
+
+        assert result["failed"] == 1
+        assert result["tickets"][1] == {"id": "MVM-1", "error": "boom", "status": "failed"}
+        assert result["processed"] == 2
+
+
+class TestRateLimiter:
+    """Test request and token budgets with a simulated clock."""
+
+    @staticmethod
+    def fake_time():
+        now = [0.0]
+
+        async def sleep(seconds):
+            now[0] += seconds
+
+        return now, (lambda: now[0]), sleep
+
+    def test_requests_per_minute(self):
+        now, clock, sleep = self.fake_time()
+        limiter = RateLimiter(requests_per_minute=60, clock=clock, sleep=sleep)
+
+        async def run():
+            for _ in range(65):
+                await limiter.acquire()
+
+        asyncio.run(run())
+        assert now[0] == pytest.approx(5.0)
+        assert limiter.get_stats()["waits"] == 5
+
+    def test_tokens_per_minute_with_actual_usage(self):
+        now, clock, sleep = self.fake_time()
+        limiter = RateLimiter(tokens_per_minute=6000, clock=clock, sleep=sleep)
+
+        async def run():
+            await limiter.acquire(3000)
+            limiter.record(3000, 6000)
+            await limiter.acquire(1000)
+
+        asyncio.run(run())
+        # The correction charges 3000 more tokens, leaving 0; 1000 refill in 10s
+        assert now[0] == pytest.approx(10.0)
+
+    def test_disabled_limiter_never_waits(self):
+        assert asyncio.run(RateLimiter().acquire(10**9)) == 0.0
+
+    def test_agent_calls_respect_limiter(self, grounding_service):
+        now, clock, sleep = self.fake_time()
+        limiter = RateLimiter(requests_per_minute=6, clock=clock, sleep=sleep)
+        agent = TicketAgent(FakeProvider(delay=0), grounding_service, rate_limiter=limiter)
+
+        asyncio.run(agent.batch_process_tickets(make_tickets(8), max_concurrency=8))
+
+        assert limiter.acquired == 8
+        assert now[0] == pytest.approx(20.0)
+        assert agent.get_stats()["rate_limiter"]["acquired"] == 8
+
+
+class PackedFakeProvider(FakeProvider):
+    """Provider stand-in answering packed prompts with one JSON array."""
+
+    def __init__(self, context_window=200000, max_output_tokens=4096, bad_ids=(), **kwargs):
+        super().__init__(**kwargs)
+        self.context_window = context_window
+        self.max_output_tokens = max_output_tokens
+        self.bad_ids = set(bad_ids)
+        self.pack_sizes = []
+
+    async def inference(self, prompt, model, system_prompt=None, max_tokens=4000, temperature=0.7, **kwargs):
+        entries = json.loads(re.search(r"Tickets:\n(\[.*\])\n\nRespond", prompt, re.S).group(1))
+        self.calls += 1
+        self.pack_sizes.append(len(entries))
+        self.prompt_chars += len(prompt) + len(system_prompt or "")
+        slots = []
+        for entry in entries:
+            ticket_id = entry["ticket"]["id"]
+            slot = {
+                "ref": entry["ref"],
+                "id": ticket_id,
+                "summary": f"Refined {ticket_id}",
+                "description": "Refined description with business context",
+                "priority": "High",
+                "type": "Story",
+                "acceptanceCriteria": ["Works"],
+            }
+            # A bad slot fails validation whenever it shares a pack
+            if ticket_id in self.bad_ids and (len(entries) > 1 or ticket_id in self.fail_ids):
+                del slot["summary"]
+            slots.append(slot)
+        return {"content": json.dumps(list(reversed(slots))), "usage": {"input_tokens": 100, "output_tokens": 50}}
+
+    async def list_models(self):
+        return [{
+            "id": "claude-3-5-sonnet-20241022",
+            "context_window": self.context_window,
+            "max_output_tokens": self.max_output_tokens,
+        }]
+
+
+class TestPackedBatch:
+    """Test refining several tickets per model call."""
+
+    def test_packs_map_results_back_by_ref(self, grounding_service, monkeypatch):
+        monkeypatch.setattr("models.agents.ticket_agent.settings.TICKET_AGENT_MAX_PACK", 10)
+        provider = PackedFakeProvider()
+        agent = TicketAgent(provider, grounding_service, rate_limiter=RateLimiter())
+
+        result = asyncio.run(agent.batch_process_tickets(make_tickets(25), packed=True))
+
+        assert provider.pack_sizes == [10, 10, 5]
+        assert [t["id"] for t in result["tickets"]] == [f"MVM-{i}" for i in range(25)]
+        assert [t["summary"] for t in result["tickets"]] == [f"Refined MVM-{i}" for i in range(25)]
+        assert result["enhanced"] == 25
+
+    def test_pack_size_adapts_to_output_limit(self, grounding_service, monkeypatch):
+        monkeypatch.setattr("models.agents.ticket_agent.settings.TICKET_AGENT_PACK_OUTPUT_TOKENS", 400)
+        provider = PackedFakeProvider(max_output_tokens=1200)
+        agent = TicketAgent(provider, grounding_service, rate_limiter=RateLimiter())
+
+        asyncio.run(agent.batch_process_tickets(make_tickets(7), packed=True))
+
+        assert provider.pack_sizes == [3, 3, 1]
+
+    def test_pack_size_adapts_to_context_window(self, grounding_service):
+        small = PackedFakeProvider(context_window=4000)
+        large = PackedFakeProvider(context_window=200000)
+        small.pool_name, large.pool_name = "small", "large"
+        for provider in (small, large):
+            agent = TicketAgent(provider, grounding_service, rate_limiter=RateLimiter())
+            asyncio.run(agent.batch_process_tickets(make_tickets(20), packed=True))
+
+        assert max(small.pack_sizes) < max(large.pack_sizes)
+        assert sum(small.pack_sizes) == 20
+
+    def test_invalid_slot_is_resplit_and_retried(self, grounding_service, monkeypatch):
+        monkeypatch.setattr("models.agents.ticket_agent.settings.TICKET_AGENT_MAX_PACK", 8)
+        provider = PackedFakeProvider(bad_ids={"MVM-3"})
+        agent = TicketAgent(provider, grounding_service, rate_limiter=RateLimiter())
+
+        result = asyncio.run(agent.batch_process_tickets(make_tickets(8), packed=True))
+
+        # 8 -> retry MVM-3 alone; the other seven are accepted from the first pack
+        assert provider.pack_sizes == [8, 1]
+        assert result["tickets"][3]["summary"] == "Refined MVM-3"
+        assert result["enhanced"] == 8
+
+    def test_ticket_failing_alone_keeps_rule_based_result(self, grounding_service, monkeypatch):
+        monkeypatch.setattr("models.agents.ticket_agent.settings.TICKET_AGENT_MAX_PACK", 4)
+        provider = PackedFakeProvider(bad_ids={"MVM-1", "MVM-2"}, fail_ids={"MVM-1"})
+        agent = TicketAgent(provider, grounding_service, rate_limiter=RateLimiter())
+
+        result = asyncio.run(agent.batch_process_tickets(make_tickets(4), packed=True))
+
+        assert sorted(provider.pack_sizes) == [1, 1, 4]
+        tickets = result["tickets"]
+        assert "_refinement" not in tickets[1]
+        assert tickets[2]["summary"] == "Refined MVM-2"
+        assert result["enhanced"] == 3
+        assert result["failed"] == 0
+
+    def test_packing_cuts_requests_and_prompt_size(self, grounding_service):
+        packed = PackedFakeProvider()
+        single = FakeProvider()
+        for provider, packed_mode in ((packed, True), (single, False)):
+            agent = TicketAgent(provider, grounding_service, rate_limiter=RateLimiter())
+            asyncio.run(agent.batch_process_tickets(make_tickets(20), packed=packed_mode))
+
+        # 4096 output tokens / 400 per ticket -> packs of 10
+        assert packed.calls == 2
+        assert single.calls == 20
+        assert packed.prompt_chars < single.prompt_chars / 2
+
+
+class TestResponseCaching:
+    """Test that repeated refinements are served from the response cache."""
+
+    def test_reupload_is_not_rebilled(self, grounding_service):
+        provider = FakeProvider()
+        agent = TicketAgent(provider, grounding_service, rate_limiter=RateLimiter())
+
+        first = asyncio.run(agent.batch_process_tickets(make_tickets(6)))
+        second = asyncio.run(agent.batch_process_tickets(make_tickets(6)))
+
+        assert provider.calls == 6
+        assert [t["summary"] for t in second["tickets"]] == [t["summary"] for t in first["tickets"]]
+        stats = agent.get_stats()["response_cache"]
+        assert stats["agentHits"] == 6
+        assert stats["agentHitRate"] == 0.5
+        assert stats["cache"]["hitRate"] == 0.5
+
+    def test_cache_shared_between_agents(self, grounding_service):
+        provider = FakeProvider()
+        for _ in range(2):
+            agent = TicketAgent(provider, grounding_service, rate_limiter=RateLimiter())
+            asyncio.run(agent.batch_process_tickets(make_tickets(3)))
+
+        assert provider.calls == 3
+
+    def test_bypass_forces_fresh_call(self, grounding_service):
+        provider = FakeProvider()
+        agent = TicketAgent(provider, grounding_service, rate_limiter=RateLimiter())
+        asyncio.run(agent.batch_process_tickets(make_tickets(2)))
+
+        agent.use_cache = False
+        asyncio.run(agent.batch_process_tickets(make_tickets(2)))
+        result = asyncio.run(agent.execute_task("Refine {\"id\": \"MVM-9\"}", use_cache=False))
+
+        assert provider.calls == 5
+        assert result["cached"] is False
+
+    def test_invalid_response_is_not_cached(self, grounding_service):
+        provider = PackedFakeProvider(bad_ids={"MVM-0"}, fail_ids={"MVM-0"})
+        agent = TicketAgent(provider, grounding_service, rate_limiter=RateLimiter())
+
+        for _ in range(2):
+            asyncio.run(agent.batch_process_tickets(make_tickets(1), packed=True))
+
+        assert provider.calls == 2
+
+    def test_cache_disabled(self, grounding_service, monkeypatch):
+        monkeypatch.setattr("models.providers.response_cache.settings.LLM_CACHE_ENABLED", False)
+        provider = FakeProvider()
+        agent = TicketAgent(provider, grounding_service, rate_limiter=RateLimiter())
+
+        for _ in range(2):
+            asyncio.run(agent.batch_process_tickets(make_tickets(2)))
+
+        assert provider.calls == 4
+        assert agent.get_stats()["response_cache"]["enabled"] is False
+
+
+class TestPromptCompaction:
+    """Test that refinement prompts carry each fact once, compactly."""
+
+    def grounded_ticket(self, grounding_service):
+        ticket = {"id": "MVM-12", "summary": "Fix login", "priority": "Low", "assignee": ""}
+        return grounding_service.enhance_with_grounding(ticket, {})
+
+    def test_ticket_sent_once_without_metadata_noise(self, grounding_service):
+        provider = FakeProvider()
+        agent = TicketAgent(provider, grounding_service, rate_limiter=RateLimiter(), use_cache=False)
+
+        result = asyncio.run(agent.process_ticket(self.grounded_ticket(grounding_service)))
+
+        prompt = provider.prompts[0]
+        assert result["_refinement"]["ai_enhanced"] is True
+        assert prompt.count('"id":"MVM-12"') == 1
+        assert "original_ticket:" not in prompt
+        assert "timestamp" not in prompt and '"assignee":""' not in prompt
+        assert "\n  " not in prompt.split("Please provide")[0]
+        feedback = json.loads(re.search(r"^validation_feedback: (.*)$", prompt, re.M).group(1))
+        assert "issues" not in feedback and "areas" not in feedback["compliance"]
+        assert feedback["confidence"] < 0.85
+
+    def test_context_trimmed_to_model_budget(self, grounding_service):
+        class SmallWindowProvider(FakeProvider):
+            async def list_models(self):
+                return [{"id": "claude-3-5-sonnet-20241022", "context_window": 3000}]
+
+        provider = SmallWindowProvider()
+        agent = TicketAgent(provider, grounding_service, rate_limiter=RateLimiter(), use_cache=False)
+        notes = "Long stakeholder notes. " * 2000
+
+        asyncio.run(agent.execute_task('Refine {"id": "MVM-1"}', notes=notes))
+
+        assert provider.calls == 1
+        prompt = provider.prompts[0]
+        assert "…[truncated]" in prompt
+        assert estimate_tokens(agent._get_system_prompt(), prompt) <= 3000 - agent.max_tokens
+
+    def test_model_limits_shared_across_agents(self, grounding_service, monkeypatch):
+        now = [0.0]
+        monkeypatch.setattr("models.agents.base_agent.time.monotonic", lambda: now[0])
+        monkeypatch.setattr("models.agents.base_agent.settings.LLM_MODEL_INFO_TTL", 60.0)
+        lookups = []
+
+        class CountingProvider(PackedFakeProvider):
+            async def get_model_info(self, model):
+                lookups.append(model)
+                return await super().get_model_info(model)
+
+        def limits():
+            agent = TicketAgent(CountingProvider(context_window=4000), grounding_service, rate_limiter=RateLimiter())
+            return asyncio.run(agent._model_limits())
+
+        # Agents (and providers) are created per request but share one lookup
+        assert limits() == limits() == (4000, 4096)
+        assert len(lookups) == 1
+
+        now[0] = 61.0
+        limits()
+        assert len(lookups) == 2
+
+    def test_failed_model_lookup_not_cached(self, grounding_service):
+        class FlakyProvider(PackedFakeProvider):
+            async def list_models(self):
+                raise ValueError("models endpoint down")
+
+        agent = TicketAgent(FlakyProvider(), grounding_service, rate_limiter=RateLimiter())
+        assert asyncio.run(agent._model_limits()) == (DEFAULT_CONTEXT_WINDOW, agent.max_tokens)
+
+        healthy = TicketAgent(PackedFakeProvider(context_window=4000), grounding_service, rate_limiter=RateLimiter())
+        assert asyncio.run(healthy._model_limits()) == (4000, 4096)
+
+    def test_context_cap_setting(self, grounding_service, monkeypatch):
+        monkeypatch.setattr("models.agents.base_agent.settings.AGENT_CONTEXT_MAX_TOKENS", 100)
+        provider = FakeProvider()
+        agent = TicketAgent(provider, grounding_service, rate_limiter=RateLimiter(), use_cache=False)
+
+        asyncio.run(agent.execute_task('Refine {"id": "MVM-1"}', notes="x" * 4000))
+
+        assert len(provider.prompts[0]) < 600
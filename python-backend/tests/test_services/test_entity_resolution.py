@@ -0,0 +1,139 @@
+"""Unit tests for stakeholder entity resolution."""
+import numpy as np
+import pytest
+from services.entity_resolution import (
+    EntityResolver,
+    LSHIndex,
+    name_match_strength,
+    name_tokens,
+    name_vectors,
+)
+
+
+def make_profile(name, index, ticket_id=None, snippet="x"):
+    profile = {
+        "id": name.strip().lower().replace("_", " "),
+        "name": name,
+        "originalNames": [name],
+        "mentions": [{"ticketId": ticket_id, "index": index, "snippet": snippet, "snippetOffsets": [0, len(snippet)]}],
+        "assignments": [],
+        "roles": ["stakeholder"],
+    }
+    return profile
+
+
+def cluster_names(resolver, names):
+    profiles = [make_profile(name, i) for i, name in enumerate(names)]
+    return [[names[i] for i in cluster] for cluster in resolver.find_clusters(profiles)]
+
+
+class ContextEncoder:
+    """Embedder stand-in: texts mentioning billing vs. security point apart."""
+
+    def embed_many(self, texts):
+        return np.asarray(
+            [[1.0, 0.0] if "billing" in text else [0.0, 1.0] if text else [0.0, 0.0] for text in texts],
+            dtype=np.float32,
+        )
+
+
+class TestNameMatching:
+    """Test name canonicalization and compatibility."""
+
+    def test_tokens(self):
+        assert name_tokens("J. Smith") == ["j", "smith"]
+        assert name_tokens("jsmith@corp") == ["jsmith"]
+        assert name_tokens("john_smith") == ["john", "smith"]
+
+    @pytest.mark.parametrize(
+        "a,b,strength",
+        [
+            ("John Smith", "john.smith@corp", 2),
+            ("John Smith", "johnsmith", 2),
+            ("John Smith", "J. Smith", 1),
+            ("John Smith", "jsmith@corp", 1),
+            ("John Smith", "Jane Smith", 0),
+            ("John Smith", "John Nagy", 0),
+            ("Smith", "Nagy", 0),
+        ],
+    )
+    def test_strength(self, a, b, strength):
+        assert name_match_strength(name_tokens(a), name_tokens(b)) == strength
+
+    def test_variants_embed_close(self):
+        vectors = name_vectors(["Anna Kovacs", "A. Kovacs", "akovacs@corp", "Peter Nagy"])
+        similarity = vectors @ vectors.T
+        assert similarity[0, 1] > 0.9 and similarity[0, 2] > 0.9
+        assert similarity[0, 3] < 0.2
+
+
+class TestEntityResolver:
+    """Test clustering and merging."""
+
+    @pytest.mark.parametrize("exact_limit", [0, 1000])
+    def test_merges_variants(self, exact_limit):
+        resolver = EntityResolver(exact_limit=exact_limit)
+        clusters = cluster_names(resolver, ["J. Smith", "John Smith", "jsmith@corp", "Anna Kovacs", "a.kovacs", "Peter Nagy"])
+
+        assert clusters == [["J. Smith", "John Smith", "jsmith@corp"], ["Anna Kovacs", "a.kovacs"], ["Peter Nagy"]]
+        assert resolver.last_stats["mode"] == ("lsh" if exact_limit == 0 else "exact")
+
+    def test_ambiguous_initial_not_merged(self):
+        clusters = cluster_names(EntityResolver(), ["J. Smith", "John Smith", "Jane Smith", "john.smith@corp"])
+        assert clusters == [["J. Smith"], ["John Smith", "john.smith@corp"], ["Jane Smith"]]
+
+    def test_context_threshold_blocks_merge(self):
+        resolver = EntityResolver(embedder=ContextEncoder(), context_threshold=0.5)
+        profiles = [make_profile("John Smith", 0, snippet="billing"), make_profile("J. Smith", 1, snippet="security")]
+        assert resolver.find_clusters(profiles) == [[0], [1]]
+
+        profiles[1]["mentions"][0]["snippet"] = "billing export"
+        assert resolver.find_clusters(profiles) == [[0, 1]]
+
+    def test_merge_mentions_and_assignments(self):
+        john = make_profile("J. Smith", 0, "MVM-1")
+        full = make_profile("John Smith", 1, "MVM-2")
+        full["mentions"].append(dict(john["mentions"][0]))
+        full["assignments"] = [{"ticketId": "MVM-1"}, {"ticketId": "MVM-3"}]
+        john["assignments"] = [{"ticketId": "MVM-1"}, {"ticketId": "MVM-4"}]
+
+        (merged,) = EntityResolver().resolve([john, full])
+
+        assert merged["id"] == "john smith"
+        assert merged["aliases"] == ["j. smith"]
+        assert [m["index"] for m in merged["mentions"]] == [0, 1]
+        assert [a["ticketId"] for a in merged["assignments"]] == ["MVM-1", "MVM-3", "MVM-4"]
+        assert merged["frequency"] == 5
+        assert sorted(merged["originalNames"]) == ["J. Smith", "John Smith"]
+
+    def test_merge_keeps_roles_unique_in_order(self):
+        john = make_profile("J. Smith", 0)
+        full = make_profile("John Smith", 1)
+        full["roles"] = ["stakeholder", "assignee"]
+        john["roles"] = ["reporter", "stakeholder"]
+
+        (merged,) = EntityResolver().resolve([john, full])
+
+        assert merged["roles"] == ["reporter", "stakeholder", "assignee"]
+
+    def test_exact_blocks_match_full_matrix(self, monkeypatch):
+        monkeypatch.setattr("services.entity_resolution.EXACT_BLOCK_ROWS", 2)
+        names = ["J. Smith", "John Smith", "jsmith@corp", "Anna Kovacs", "a.kovacs", "Peter Nagy", "P. Nagy"]
+        expected = cluster_names(EntityResolver(exact_limit=0), names)
+
+        resolver = EntityResolver(exact_limit=1000)
+        assert cluster_names(resolver, names) == expected
+        assert resolver.last_stats["mode"] == "exact"
+
+
+def test_lsh_finds_near_duplicates():
+    rng = np.random.default_rng(0)
+    base = rng.normal(size=(200, 32)).astype(np.float32)
+    noisy = base + 0.05 * rng.normal(size=base.shape).astype(np.float32)
+    vectors = np.vstack([base, noisy])
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    pairs = {tuple(pair) for pair in LSHIndex(num_tables=16, num_bits=12).build(vectors).candidate_pairs().tolist()}
+
+    assert sum((i, i + 200) in pairs for i in range(200)) >= 195
+    assert len(pairs) < 400 * 399 // 2 // 10
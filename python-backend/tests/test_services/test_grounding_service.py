@@ -69,6 +69,82 @@ class TestGroundingServiceValidation:
         assert "timestamp" in enhanced["_grounding"]
 
 
+class TestBatchValidation:
+    """Test column-oriented batch validation."""
+
+    @staticmethod
+    def _tickets():
+        return [
+            {
+                "id": f"MVM-{1000 + i}" if i % 7 else f"X-{i}",
+                "summary": "Implement smart meter dashboard" if i % 5 else "Short",
+                "description": "Add hourly consumption breakdown with CSV export for customers",
+                "priority": ["High", "Magas", "Low", "Critical"][i % 4],
+                "type": "Story" if i % 6 else "Chore",
+                "assignee": ["John Doe", "j.doe@corp.com", "Unassigned", "Nagy János!"][i % 4],
+                "epic": ["No Epic", "MVM-12", "Smart Meter", "Epic #3"][i % 4],
+                "acceptanceCriteria": ["AC1", "AC2"] if i % 3 else [],
+            }
+            for i in range(40)
+        ]
+
+    @staticmethod
+    def _without_timestamps(result):
+        return {
+            **result,
+            "sources": [{k: v for k, v in src.items() if k != "timestamp"} for src in result["sources"]],
+        }
+
+    def test_batch_matches_per_ticket(self, grounding_service):
+        tickets = self._tickets()
+        sources = [{"rowIndex": i} if i % 2 else None for i in range(len(tickets))]
+
+        batch = grounding_service.validate_tickets(tickets, sources)
+        single = [grounding_service.validate_ticket(t, s) for t, s in zip(tickets, sources)]
+
+        assert [self._without_timestamps(r) for r in batch] == [
+            self._without_timestamps(r) for r in single
+        ]
+
+    def test_batch_uses_single_timestamp(self, grounding_service):
+        tickets = self._tickets()
+        sources = [{"rowIndex": i} for i in range(len(tickets))]
+
+        batch = grounding_service.validate_tickets(tickets, sources)
+
+        assert len({r["sources"][0]["timestamp"] for r in batch}) == 1
+
+    def test_compliance_evaluated_once_per_normalized_context(self, grounding_service, monkeypatch):
+        tickets = [
+            {**ticket, "summary": f"Export report number {i} for review"}
+            for i, ticket in enumerate(self._tickets()[:1] * 3)
+        ]
+        tickets.append({**tickets[0], "acceptanceCriteria": ["AC1", 2]})
+        evaluated = []
+        evaluate = grounding_service.compliance_service._evaluate
+        monkeypatch.setattr(
+            grounding_service.compliance_service,
+            "_evaluate",
+            lambda ticket, context: evaluated.append(context) or evaluate(ticket, context),
+        )
+
+        batch = grounding_service.validate_tickets(tickets)
+
+        assert len(evaluated) == 1
+        assert batch[0]["compliance"] is batch[2]["compliance"]
+        assert [r["compliance"] for r in batch[:3]] == [
+            grounding_service.compliance_service.evaluate_ticket(t) for t in tickets[:3]
+        ]
+        assert batch[3]["warnings"][-1].startswith("Compliance evaluation failed")
+
+    def test_empty_batch(self, grounding_service):
+        assert grounding_service.validate_tickets([]) == []
+
+    def test_misaligned_sources_rejected(self, grounding_service):
+        with pytest.raises(ValueError):
+            grounding_service.validate_tickets(self._tickets(), [None])
+
+
 class TestHallucinationDetection:
     """Test hallucination detection functionality."""
 
@@ -159,4 +235,35 @@ class TestGroundingStatistics:
         assert "knowledgeBaseSize" in stats
         assert "validationRulesCount" in stats
         assert "supportedFormats" in stats
+        assert "formatCache" in stats
         assert "lastUpdated" in stats
+
+    def test_format_cache_shared_across_instances(self):
+        """Repeated assignee/epic values hit the class-level format cache."""
+        GroundingService.clear_format_cache()
+        ticket = {
+            "priority": "High",
+            "type": "Story",
+            "summary": "Implement user authentication system",
+            "description": "Add login and registration functionality for users",
+            "assignee": "John Doe",
+            "epic": "PROJ-42",
+        }
+
+        GroundingService().validate_ticket(ticket)
+        GroundingService().validate_tickets([ticket, dict(ticket)])
+
+        stats = GroundingService().get_grounding_stats()["formatCache"]
+        assert stats["assignee"]["misses"] == 1
+        assert stats["assignee"]["hits"] >= 1
+        assert stats["epic"]["misses"] == 1
+        assert stats["epic"]["size"] == 1
+
+    def test_format_cache_preserves_results(self, grounding_service):
+        """Cached checks return the same verdicts as the raw patterns."""
+        GroundingService.clear_format_cache()
+        for _ in range(2):
+            assert grounding_service._is_valid_assignee("Team Alpha") is True
+            assert grounding_service._is_valid_assignee("bad!value#") is False
+            assert grounding_service._is_valid_epic("No Epic") is True
+            assert grounding_service._is_valid_epic("proj_1!") is False
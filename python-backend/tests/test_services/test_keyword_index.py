@@ -0,0 +1,139 @@
+"""Unit tests for the compiled keyword matcher."""
+import pytest
+from services.compliance_service import ComplianceService
+from services.keyword_index import KeywordMatcher
+
+TEXTS = [
+    "",
+    "documentation of the reporting timeline and risk mitigation",
+    "undocumented issues; notify stakeholders before the deadline!",
+    "ÁRAM számla report — acceptance criteria: scope inclusion/exclusion",
+    "no keywords here at all",
+]
+
+
+def reference_counts(table, text):
+    return {category: sum(1 for kw in keywords if kw in text) for category, keywords in table.items()}
+
+
+@pytest.fixture(params=["automaton", "scan"])
+def matcher(request):
+    """Matcher over the compliance areas, with and without the C automaton."""
+    matcher = KeywordMatcher(ComplianceService.COMPLIANCE_AREAS)
+    if request.param == "scan":
+        matcher._automaton = None
+    return matcher
+
+
+class TestKeywordMatcher:
+    """Test KeywordMatcher equivalence with substring scans."""
+
+    @pytest.mark.parametrize("text", TEXTS)
+    def test_counts_match_substring_scans(self, matcher, text):
+        """Per-category counts equal the `kw in text` loop."""
+        assert matcher.count(text) == reference_counts(ComplianceService.COMPLIANCE_AREAS, text)
+
+    def test_overlapping_and_shared_keywords(self, matcher):
+        """Nested keywords and keywords listed in several categories all count."""
+        found = matcher.find("documentation report")
+        assert {"document", "documentation", "report"} <= found
+
+        counts = matcher.count("report")
+        assert counts["documentation"] == 1
+        assert counts["communication"] == 1
+
+    def test_duplicate_keyword_in_category(self):
+        """A keyword listed twice in one category counts twice, as before."""
+        table = {"a": ["risk", "risk"], "b": ["issue"]}
+        assert KeywordMatcher(table).count("risk issue") == reference_counts(table, "risk issue")
+
+
+class TestComplianceAreas:
+    """Compliance scores computed via the matcher."""
+
+    def test_area_coverage(self):
+        ticket = {
+            "summary": "Monthly consumption report",
+            "description": "Provide documentation and review of risk mitigation before the deadline",
+            "priority": "High",
+            "type": "Story",
+            "acceptanceCriteria": ["Acceptance criteria reviewed by stakeholder"],
+        }
+        service = ComplianceService()
+        context = service._build_context(ticket)
+        expected = reference_counts(ComplianceService.COMPLIANCE_AREAS, context)
+
+        areas = service.evaluate_ticket(ticket)["areas"]
+        for area, keywords in ComplianceService.COMPLIANCE_AREAS.items():
+            assert areas[area]["coverage"] == expected[area] / len(keywords)
+
+
+class TestKeywordIndex:
+    """Shared index over several registered tables."""
+
+    def test_scan_answers_every_table(self):
+        from services.keyword_index import KeywordIndex
+
+        index = KeywordIndex(cache_size=8)
+        index.register("priority", {"must": ["must have", "critical"], "could": ["nice to have"]})
+        index.register("risk", {"risk": ["risk", "issue"], "threat": ["risk", "barrier"]})
+
+        scan = index.scan("a critical risk, must have before the barrier")
+        assert scan.count("priority") == {"must": 2, "could": 0}
+        assert scan.count("risk") == {"risk": 1, "threat": 2}
+        assert scan.matched("risk", "threat") == ["risk", "barrier"]
+        assert scan.first_category("priority") == "must"
+
+    def test_repeated_text_served_from_cache(self):
+        from services.keyword_index import KeywordIndex
+
+        index = KeywordIndex(cache_size=8)
+        index.register("areas", ComplianceService.COMPLIANCE_AREAS)
+        first = index.scan("risk review")
+        assert index.scan("risk review") is first
+        assert index.get_stats()["cacheHits"] == 1
+
+        # Registering a table recompiles and invalidates cached scans
+        index.register("extra", {"x": ["review"]})
+        assert index.scan("risk review").count("extra") == {"x": 1}
+
+
+class TestStrategicAndStakeholderScores:
+    """Scores computed via the shared index match the original loops."""
+
+    TEXT = (
+        "critical gdpr compliance for the customer platform api; risk of competitor "
+        "growth and market expansion, must have before phase 2. the cfo and director "
+        "asked the product owner and lead engineer; urgent and required, impacted teams"
+    )
+
+    def test_strategic_scores(self):
+        from services.strategic_service import StrategicAnalysisService as S
+
+        service = S()
+        pestle = service._analyze_pestle(self.TEXT)
+        for factor, keywords in S.PESTLE_KEYWORDS.items():
+            score = sum(1 for kw in keywords if kw in self.TEXT)
+            assert pestle[factor] == {"score": min(score / len(keywords) * 10, 10), "mentioned": score > 0}
+
+        swot = service._build_swot_matrix(pestle, self.TEXT)
+        for factor, keywords in S.SWOT_KEYWORDS.items():
+            assert swot[factor] == [kw for kw in keywords if kw in self.TEXT][:3]
+
+        assert service._determine_moscow_category({"priority": "Low"}, self.TEXT) == "must"
+        assert service._determine_moscow_category({"priority": "Low"}, "plain text") == "wont"
+
+    def test_stakeholder_scores(self):
+        from services.nlp_pipeline import StakeholderNLPPipeline
+        from services.stakeholder_service import StakeholderService as S
+
+        class StaticSentiment:
+            def score(self, text):
+                return {}
+
+        service = S(nlp_pipeline=StakeholderNLPPipeline(sentiment_analyzer=StaticSentiment()))
+        assert service._infer_role("Anna", self.TEXT) == "executive"
+        assert service._infer_role("Anna", "nothing relevant") == "stakeholder"
+        profile = {"name": "Anna", "frequency": 0}
+        assert service._determine_power_level(profile, self.TEXT) == "High"
+        assert service._determine_interest_level(profile, self.TEXT) == "High"
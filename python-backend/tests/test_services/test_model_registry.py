@@ -0,0 +1,97 @@
+"""Unit tests for the lazy NLP model registry."""
+import threading
+
+import pytest
+from services.model_registry import FAILED, PENDING, READY, UNAVAILABLE, ModelRegistry
+from services.nlp_pipeline import SentimentAnalyzer
+
+
+class TestModelRegistry:
+    """Test lazy loading and warm-up."""
+
+    def test_loads_once_on_first_get(self):
+        registry = ModelRegistry()
+        calls = []
+        registry.register("model", lambda: calls.append(1) or "loaded")
+
+        assert registry.get_status()["models"]["model"]["state"] == PENDING
+        assert registry.get("model") == "loaded"
+        assert registry.get("model") == "loaded"
+        assert calls == [1]
+
+    def test_register_keeps_first_loader(self):
+        registry = ModelRegistry()
+        registry.register("model", lambda: "first")
+        registry.register("model", lambda: "second")
+        assert registry.get("model") == "first"
+
+    def test_concurrent_gets_load_once(self):
+        registry = ModelRegistry()
+        calls = []
+        gate = threading.Event()
+
+        def loader():
+            calls.append(1)
+            gate.wait(1)
+            return "loaded"
+
+        registry.register("model", loader)
+        threads = [threading.Thread(target=registry.get, args=("model",)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        gate.set()
+        for thread in threads:
+            thread.join()
+        assert calls == [1]
+
+    def test_missing_dependency_and_failure_are_settled(self):
+        registry = ModelRegistry()
+
+        def missing():
+            raise ImportError("no module")
+
+        def broken():
+            raise OSError("bad weights")
+
+        registry.register("missing", missing)
+        registry.register("broken", broken)
+        registry.warm_up(background=False)
+
+        status = registry.get_status()
+        assert registry.get("missing") is None
+        assert status["models"]["missing"]["state"] == UNAVAILABLE
+        assert status["models"]["broken"]["state"] == FAILED
+        assert status["models"]["broken"]["error"] == "bad weights"
+
+    def test_ready_after_background_warmup(self):
+        registry = ModelRegistry()
+        registry.register("model", lambda: "loaded")
+        registry.register("cold", lambda: "loaded", warm=False)
+
+        registry.warm_up().join(5)
+
+        status = registry.get_status()
+        assert status["ready"] is True
+        assert status["models"]["model"]["state"] == READY
+        assert status["models"]["cold"]["state"] == PENDING
+
+    def test_late_registration_does_not_block_readiness(self):
+        registry = ModelRegistry()
+        registry.register("model", lambda: "loaded")
+        registry.warm_up().join(5)
+
+        registry.register("late", lambda: "loaded")
+
+        assert registry.is_ready() is True
+        assert registry.get_status()["models"]["late"]["state"] == PENDING
+        assert registry.get("late") == "loaded"
+
+    def test_unknown_model(self):
+        with pytest.raises(KeyError):
+            ModelRegistry().get("missing")
+
+
+def test_sentiment_analyzer_construction_is_lazy():
+    analyzer = SentimentAnalyzer()
+    assert analyzer._analyzer is None
+    assert analyzer.score("")["compound"] == 0.0
@@ -0,0 +1,239 @@
+"""Unit tests for the stakeholder NLP pipeline."""
+import hashlib
+import json
+
+import numpy as np
+import pytest
+from services.embedding_cache import EmbeddingCache
+from services.embedding_codec import decode_embedding, decode_embeddings, encode_embedding
+from services.nlp_pipeline import EmbeddingGenerator, NERPipeline, SentimentAnalyzer, StakeholderNLPPipeline
+
+
+class StaticSentiment(SentimentAnalyzer):
+    """Sentiment analyzer stand-in (VADER lexicon needs a download)."""
+
+    def score(self, text):
+        return {"neg": 0.0, "neu": 1.0, "pos": float(len(text) % 3), "compound": 0.0}
+
+
+@pytest.fixture
+def ner_pipeline():
+    """NERPipeline over a blank spaCy model with an entity ruler."""
+    spacy = pytest.importorskip("spacy")
+
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    ruler = nlp.add_pipe("entity_ruler")
+    ruler.add_patterns(
+        [
+            {"label": "PERSON", "pattern": "Anna Kovacs"},
+            {"label": "ORG", "pattern": "MVM"},
+        ]
+    )
+
+    pipeline = NERPipeline(batch_size=2)
+    pipeline._nlp = nlp
+    return pipeline
+
+
+TEXTS = [
+    "Anna Kovacs approved the MVM billing change",
+    "",
+    "No entities here",
+    "MVM asked Anna Kovacs again",
+]
+
+
+class TestBatchNER:
+    """Test nlp.pipe based batch extraction."""
+
+    def test_unused_components_skipped_without_changing_shared_model(self, ner_pipeline):
+        nlp = ner_pipeline._nlp
+        assert NERPipeline._unused_components(nlp) == ["sentencizer"]
+
+        ner_pipeline.extract_entities(TEXTS[0])
+        ner_pipeline.extract_entities_batch(TEXTS)
+
+        assert nlp.pipe_names == ["sentencizer", "entity_ruler"]
+        assert nlp.disabled == []
+
+    def test_batch_matches_single_calls(self, ner_pipeline):
+        batch = ner_pipeline.extract_entities_batch(TEXTS)
+        assert batch == [ner_pipeline.extract_entities(text) for text in TEXTS]
+        assert batch[1] == []
+        assert [e["text"] for e in batch[3]] == ["MVM", "Anna Kovacs"]
+
+
+class TestEnhanceProfiles:
+    """Test batch profile enrichment."""
+
+    def test_matches_enhance_profile(self, ner_pipeline):
+        pipeline = StakeholderNLPPipeline(ner=ner_pipeline, sentiment_analyzer=StaticSentiment())
+        contexts = [text for text in TEXTS if text]
+
+        single = [pipeline.enhance_profile({"id": str(i)}, c) for i, c in enumerate(contexts)]
+        batch = pipeline.enhance_profiles([{"id": str(i)} for i in range(len(contexts))], contexts)
+        assert batch == single
+
+    def test_empty_context_matches_enhance_profile(self, ner_pipeline, embedder):
+        pipeline = StakeholderNLPPipeline(
+            ner=ner_pipeline, sentiment_analyzer=StaticSentiment(), embedder=embedder, embedding_format="list"
+        )
+
+        single = [pipeline.enhance_profile({"id": str(i)}, c) for i, c in enumerate(TEXTS)]
+        batch = pipeline.enhance_profiles([{"id": str(i)} for i in range(len(TEXTS))], TEXTS)
+
+        assert batch == single
+        assert batch[1]["nlp"]["embedding"] == []
+        assert len(batch[0]["nlp"]["embedding"]) == CountingEncoder.dim
+
+    def test_misaligned_contexts(self):
+        pipeline = StakeholderNLPPipeline(sentiment_analyzer=StaticSentiment())
+        with pytest.raises(ValueError):
+            pipeline.enhance_profiles([{"id": "a"}], [])
+
+
+class CountingEncoder:
+    """Deterministic sentence encoder stand-in that records encoded texts."""
+
+    dim = 8
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True):
+        self.encoded.extend(texts)
+        rows = [np.frombuffer(hashlib.sha256(t.encode()).digest()[: self.dim], dtype=np.uint8) for t in texts]
+        return np.asarray(rows, dtype=np.float64) / 255.0
+
+
+@pytest.fixture
+def embedder():
+    generator = EmbeddingGenerator(cache=EmbeddingCache(max_entries=100))
+    generator._model = CountingEncoder()
+    return generator
+
+
+class TestEmbedMany:
+    """Test batched, cached embedding."""
+
+    def test_returns_contiguous_float32_matrix(self, embedder):
+        matrix = embedder.embed_many(["alpha", "", "beta", "alpha"])
+
+        assert matrix.shape == (4, CountingEncoder.dim)
+        assert matrix.dtype == np.float32
+        assert matrix.flags["C_CONTIGUOUS"]
+        assert not matrix[1].any()
+        assert np.array_equal(matrix[0], matrix[3])
+        assert embedder._model.encoded == ["alpha", "beta"]
+
+    def test_cached_texts_not_reencoded(self, embedder):
+        first = embedder.embed_many(["alpha", "beta"])
+        second = embedder.embed_many(["beta", "alpha", "gamma"])
+
+        assert embedder._model.encoded == ["alpha", "beta", "gamma"]
+        assert np.array_equal(first[0], second[1])
+        assert embedder.embed("alpha") == first[0].tolist()
+        assert embedder.cache.get_stats()["hits"] >= 3
+
+    def test_disk_tier_survives_new_cache(self, tmp_path):
+        path = str(tmp_path / "embeddings.sqlite")
+        generator = EmbeddingGenerator(cache=EmbeddingCache(max_entries=1, disk_path=path))
+        generator._model = CountingEncoder()
+        expected = generator.embed_many(["alpha", "beta"])
+        generator.cache.close()
+
+        fresh = EmbeddingGenerator(cache=EmbeddingCache(max_entries=10, disk_path=path))
+        fresh._model = CountingEncoder()
+        assert np.array_equal(fresh.embed_many(["alpha", "beta"]), expected)
+        assert fresh._model.encoded == []
+        assert fresh.cache.get_stats()["diskHits"] == 2
+
+    def test_cached_rows_kept_when_model_unavailable(self, embedder, monkeypatch):
+        cached = embedder.embed_many(["alpha"])
+        embedder._model = None
+        monkeypatch.setattr("services.nlp_pipeline.model_registry.get", lambda key: None)
+
+        matrix = embedder.embed_many(["alpha", "beta", ""])
+
+        assert matrix.shape == (3, CountingEncoder.dim)
+        assert np.array_equal(matrix[0], cached[0])
+        assert not matrix[1:].any()
+        assert embedder.embed_many(["gamma"]).shape == (1, 0)
+
+    def test_lru_eviction(self):
+        cache = EmbeddingCache(max_entries=2)
+        cache.put_many({"a": np.ones(2), "b": np.ones(2), "c": np.ones(2)})
+        assert set(cache.get_many(["a", "b", "c"])) == {"b", "c"}
+
+
+class TestEmbeddingFormats:
+    """Test compact embedding encodings."""
+
+    VECTOR = np.random.default_rng(3).normal(size=384).astype(np.float32)
+
+    def test_float32_round_trip_is_lossless(self):
+        payload = encode_embedding(self.VECTOR, "float32")
+        assert np.array_equal(decode_embedding(payload), self.VECTOR)
+
+    @pytest.mark.parametrize("fmt,tolerance", [("float16", 1e-2), ("int8", 2e-2)])
+    def test_quantized_round_trip_preserves_similarity(self, fmt, tolerance):
+        decoded = decode_embedding(encode_embedding(self.VECTOR, fmt))
+        cosine = decoded @ self.VECTOR / (np.linalg.norm(decoded) * np.linalg.norm(self.VECTOR))
+
+        assert decoded.dtype == np.float32
+        assert np.abs(decoded - self.VECTOR).max() < np.abs(self.VECTOR).max() * tolerance
+        assert cosine > 0.999
+
+    def test_compact_payloads_are_smaller(self):
+        legacy = len(json.dumps(encode_embedding(self.VECTOR, "list")))
+        sizes = {fmt: len(json.dumps(encode_embedding(self.VECTOR, fmt))) for fmt in ("float32", "float16", "int8")}
+
+        assert sizes["int8"] < sizes["float16"] < sizes["float32"] < legacy
+        assert sizes["int8"] * 10 < legacy
+
+    def test_zero_vector_int8(self):
+        assert not decode_embedding(encode_embedding(np.zeros(4), "int8")).any()
+
+    def test_unknown_format_rejected(self):
+        with pytest.raises(ValueError):
+            encode_embedding(self.VECTOR, "bfloat16")
+        with pytest.raises(ValueError):
+            encode_embedding(self.VECTOR, "omit")  # no handle
+
+    def test_pipeline_payloads_decode_to_embeddings(self, ner_pipeline, embedder):
+        pipeline = StakeholderNLPPipeline(
+            ner=ner_pipeline, sentiment_analyzer=StaticSentiment(), embedder=embedder, embedding_format="float32"
+        )
+        profiles = pipeline.enhance_profiles([{"name": "a"}, {"name": "b"}], ["alpha", "beta"])
+
+        matrix = decode_embeddings([profile["nlp"]["embedding"] for profile in profiles])
+        assert np.array_equal(matrix, embedder.embed_many(["alpha", "beta"]))
+
+    def test_omit_handles_survive_eviction(self, ner_pipeline, tmp_path):
+        cache = EmbeddingCache(max_entries=1, disk_path=str(tmp_path / "embeddings.db"))
+        embedder = EmbeddingGenerator(cache=cache)
+        embedder._model = CountingEncoder()
+        pipeline = StakeholderNLPPipeline(
+            ner=ner_pipeline, sentiment_analyzer=StaticSentiment(), embedder=embedder, embedding_format="omit"
+        )
+        profiles = pipeline.enhance_profiles([{"name": "a"}, {"name": "b"}], ["alpha", "beta"])
+
+        payloads = [profile["nlp"]["embedding"] for profile in profiles]
+        assert all(set(payload) == {"format", "dim", "handle"} for payload in payloads)
+        expected = embedder.embed_many(["alpha", "beta"])
+        cache.clear()
+        assert np.array_equal(decode_embeddings(payloads, cache=cache), expected)
+        cache.close()
+
+    def test_unknown_handle_raises(self, embedder):
+        with pytest.raises(KeyError):
+            decode_embedding({"format": "omit", "dim": 8, "handle": "missing"}, cache=embedder.cache)
+
+    def test_pipeline_rejects_unknown_format(self, embedder):
+        with pytest.raises(ValueError):
+            StakeholderNLPPipeline(sentiment_analyzer=StaticSentiment(), embedder=embedder, embedding_format="csv")
+
+    def test_omit_requires_persistent_cache(self, embedder):
+        with pytest.raises(ValueError):
+            StakeholderNLPPipeline(sentiment_analyzer=StaticSentiment(), embedder=embedder, embedding_format="omit")
@@ -0,0 +1,246 @@
+"""Unit tests for StakeholderService."""
+import json
+import re
+
+import pytest
+from services.nlp_pipeline import SentimentAnalyzer, StakeholderNLPPipeline
+from services.stakeholder_service import StakeholderService
+
+
+class StaticSentiment(SentimentAnalyzer):
+    """Sentiment analyzer stand-in (VADER lexicon needs a download)."""
+
+    def score(self, text):
+        return {"neg": 0.0, "neu": 1.0, "pos": 0.0, "compound": 0.0}
+
+
+@pytest.fixture
+def stakeholder_service():
+    """Create a StakeholderService with an offline NLP pipeline."""
+    return StakeholderService(nlp_pipeline=StakeholderNLPPipeline(sentiment_analyzer=StaticSentiment()))
+
+
+def build_tickets(count=20):
+    return [
+        {
+            "id": f"MVM-{1001 + i}",
+            "summary": f"Billing export {i} reviewed by: Anna Kovacs",
+            "description": "The CFO and director require this; critical and urgent. " * 5,
+            "acceptanceCriteria": ["Approved by: Peter Nagy"],
+            "assignee": "Team Alpha",
+        }
+        for i in range(count)
+    ]
+
+
+class TestCompactContexts:
+    """Test shared context table and snippet offsets."""
+
+    def test_mentions_reference_context_table(self, stakeholder_service):
+        tickets = build_tickets(3)
+        result = stakeholder_service.identify_stakeholders(tickets)
+
+        anna = next(p for p in result["stakeholders"] if p["id"] == "anna kovacs")
+        assert len(anna["mentions"]) == 3
+        for mention in anna["mentions"]:
+            assert "context" not in mention
+            context = result["contexts"][mention["index"]]
+            start, end = mention["snippetOffsets"]
+            assert mention["snippet"] == context[start:end]
+            assert "Anna Kovacs" in mention["snippet"]
+
+    def test_include_contexts_shares_table_strings(self, stakeholder_service):
+        tickets = build_tickets(3)
+        compact = stakeholder_service.identify_stakeholders(tickets)
+        full = stakeholder_service.identify_stakeholders(tickets, include_contexts=True)
+
+        for mention in (m for p in full["stakeholders"] for m in p["mentions"]):
+            assert mention["context"] is full["contexts"][mention["index"]]
+        assert len(json.dumps(compact)) < len(json.dumps(full))
+
+    def test_snippet_taken_at_extracted_match(self, stakeholder_service):
+        tickets = [{"id": "MVM-1", "summary": "x " * 60 + "OWNER: john_smith; mentioned Eva Szabo", "assignee": "Unassigned"}]
+        result = stakeholder_service.identify_stakeholders(tickets)
+        profiles = {p["id"]: p for p in result["stakeholders"]}
+
+        (mention,) = profiles["john smith"]["mentions"]
+        assert mention["snippet"] == "x x x x x x x x x x x OWNER: john_smith; mentioned Eva Szabo Assignee"
+        # A plain search for the normalized name misses the handle
+        context = result["contexts"][0]
+        assert stakeholder_service._get_snippet(context, "john smith") == context[:100]
+
+    def test_nlp_receives_joined_snippets(self):
+        calls = []
+        scored = []
+
+        class RecordingSentiment(StaticSentiment):
+            def score(self, text):
+                scored.append(text)
+                return super().score(text)
+
+        class RecordingPipeline(StakeholderNLPPipeline):
+            def enhance_profiles(self, profiles, contexts, sentiments=None):
+                calls.append(({p["id"]: c for p, c in zip(profiles, contexts)}, sentiments))
+                return super().enhance_profiles(profiles, contexts, sentiments=sentiments)
+
+        service = StakeholderService(nlp_pipeline=RecordingPipeline(sentiment_analyzer=RecordingSentiment()))
+        tickets = build_tickets(2)
+        for ticket in tickets:
+            ticket["summary"] = ticket["summary"].replace("Billing export", "Snippet pinning export")
+        result = service.identify_stakeholders(tickets)
+
+        ((contexts, sentiments),) = calls
+        # Entities and embeddings see the mention snippets, not whole tickets
+        assert contexts["anna kovacs"] == (
+            "pinning export 0 reviewed by: Anna Kovacs The CFO and director require "
+            "pinning export 1 reviewed by: Anna Kovacs The CFO and director require"
+        )
+        # Sentiment is scored once per full ticket context and passed in
+        assert sorted(scored) == sorted(result["contexts"])
+        assert len(sentiments) == len(contexts)
+
+    def test_scores_match_joined_context(self, stakeholder_service):
+        result = stakeholder_service.identify_stakeholders(build_tickets(5))
+
+        for profile in result["stakeholders"]:
+            joined = " ".join(result["contexts"][m["index"]] for m in profile["mentions"])
+            assert profile["power"] == stakeholder_service._determine_power_level(profile, joined)
+            assert profile["interest"] == stakeholder_service._determine_interest_level(profile, joined)
+
+    @pytest.mark.parametrize(
+        "context,name",
+        [
+            ("  short   Anna  ", "anna"),
+            ("x" * 50 + "  Anna Kovacs  " + "y" * 50, "Anna Kovacs"),
+            ("no mention here", "Peter"),
+        ],
+    )
+    def test_snippet_span_matches_strip(self, stakeholder_service, context, name):
+        idx = context.lower().find(name.lower())
+        if idx == -1:
+            expected = context[:100]
+        else:
+            expected = context[max(0, idx - 30):min(len(context), idx + len(name) + 30)].strip()
+
+        start, end = stakeholder_service._get_snippet_span(context, name)
+        assert context[start:end] == expected
+
+
+class TestNameExtraction:
+    """Test the precompiled name extractor."""
+
+    TEXTS = [
+        "Assigned to: Anna Kovacs. Reviewed by: Peter Nagy and the Billing Team",
+        "OWNER: john_smith; mentioned Eva Szabo in the Steering Committee",
+        "İstanbul office: approved by: Maria Toth",
+        "nothing to see here",
+        "Anna Maria Kovacs met Manager Team",
+    ]
+
+    @staticmethod
+    def findall_names(service, text):
+        names = set()
+        for pattern in service.extraction_patterns:
+            for match in pattern.findall(text):
+                normalized = service._normalize_name(match)
+                if normalized not in service.GENERIC_NAMES and len(normalized.split()) <= 3:
+                    names.add(normalized)
+        for match in re.findall(r"([A-Z][a-z]+\s+[A-Z][a-z]+)", text):
+            normalized = service._normalize_name(match)
+            if normalized not in service.GENERIC_NAMES:
+                names.add(normalized)
+        return names
+
+    @pytest.mark.parametrize("text", TEXTS)
+    def test_matches_per_pattern_findall(self, stakeholder_service, text):
+        assert set(stakeholder_service._extract_names_from_text(text)) == self.findall_names(
+            stakeholder_service, text
+        )
+
+    @pytest.mark.parametrize("text", TEXTS)
+    def test_spans_point_at_names(self, stakeholder_service, text):
+        for name, (start, end) in stakeholder_service._extract_name_spans(text).items():
+            assert stakeholder_service._normalize_name(text[start:end]) == name
+
+    def test_snippet_uses_extracted_position(self, stakeholder_service):
+        text = "Owner: john_smith. " + "x" * 80
+        spans = stakeholder_service._extract_name_spans(text)
+        start, end = stakeholder_service._get_snippet_span(text, "john smith", spans["john smith"])
+        assert text[start:end].startswith("Owner: john_smith")
+
+
+class TestEntityResolution:
+    """Test merging of stakeholder name variants."""
+
+    def test_assignee_handle_merged_with_mentioned_name(self, stakeholder_service):
+        tickets = [
+            {"id": "MVM-1", "summary": "Export reviewed by: John Smith.", "assignee": "john.smith@corp"},
+            {"id": "MVM-2", "summary": "Tariff update reviewed by: Anna Kovacs.", "assignee": "jsmith@corp"},
+        ]
+        profiles = {p["id"]: p for p in stakeholder_service.identify_stakeholders(tickets)["stakeholders"]}
+
+        john = profiles["john smith"]
+        assert "john.smith@corp" in john["aliases"]
+        assert "jsmith@corp" in john["aliases"]
+        assert [a["ticketId"] for a in john["assignments"]] == ["MVM-1", "MVM-2"]
+        assert john["frequency"] == len(john["mentions"]) + 2
+        assert "anna kovacs" in profiles
+
+    def test_resolution_can_be_disabled(self):
+        service = StakeholderService(nlp_pipeline=StakeholderNLPPipeline(sentiment_analyzer=StaticSentiment()))
+        service.entity_resolver = None
+        tickets = [{"id": "MVM-1", "summary": "Export reviewed by: John Smith.", "assignee": "john.smith@corp"}]
+        ids = {p["id"] for p in service.identify_stakeholders(tickets)["stakeholders"]}
+        assert {"john smith", "john.smith@corp"} <= ids
+
+
+class CountingSentiment(SentimentAnalyzer):
+    """Sentiment stand-in scoring by keyword, counting analyzer calls."""
+
+    def __init__(self):
+        super().__init__(cache_size=100)
+        self.scored = []
+
+    def score(self, text):
+        self.scored.append(text)
+        compound = 0.5 if "great" in text.lower() else -0.5 if "broken" in text.lower() else 0.0
+        return {"neg": float(compound < 0), "neu": float(compound == 0), "pos": float(compound > 0), "compound": compound}
+
+
+class TestTicketSentiment:
+    """Test per-ticket sentiment caching and aggregation."""
+
+    TICKETS = [
+        {"id": "MVM-1", "summary": "Great export, reviewed by: Anna Kovacs and Peter Nagy."},
+        {"id": "MVM-2", "summary": "Export broken, reviewed by: Anna Kovacs."},
+        {"id": "MVM-3", "summary": "Import broken, reviewed by: Anna Kovacs."},
+    ]
+
+    def test_profiles_aggregate_cached_ticket_scores(self):
+        sentiment = CountingSentiment()
+        service = StakeholderService(nlp_pipeline=StakeholderNLPPipeline(sentiment_analyzer=sentiment))
+
+        profiles = {p["id"]: p for p in service.identify_stakeholders(self.TICKETS)["stakeholders"]}
+
+        assert len(sentiment.scored) == 3
+        assert profiles["anna kovacs"]["nlp"]["sentiment"]["compound"] == pytest.approx(-1 / 6, abs=1e-4)
+        assert profiles["peter nagy"]["nlp"]["sentiment"]["compound"] == 0.5
+
+        service.identify_stakeholders(self.TICKETS)
+        assert len(sentiment.scored) == 3
+        assert sentiment.get_stats()["hits"] == 3
+
+    def test_changed_ticket_is_rescored(self):
+        sentiment = CountingSentiment()
+        first = sentiment.score_tickets([("MVM-1", "great"), ("MVM-2", "broken")])
+        second = sentiment.score_tickets([("MVM-1", "broken now"), ("MVM-2", "broken")])
+
+        assert sentiment.scored == ["great", "broken", "broken now"]
+        assert first[1] is second[1]
+        assert second[0]["compound"] == -0.5
+        assert sentiment.get_stats()["entries"] == 2
+
+    def test_aggregate_weights(self):
+        scores = [{"neg": 0.0, "neu": 0.0, "pos": 1.0, "compound": 1.0}, {"neg": 1.0, "neu": 0.0, "pos": 0.0, "compound": -1.0}]
+        assert SentimentAnalyzer.aggregate(scores, [3, 1])["compound"] == 0.5
+        assert SentimentAnalyzer.aggregate([])["compound"] == 0.0
@@ -0,0 +1,59 @@
+"""Unit tests for Excel file handling utilities."""
+from io import BytesIO
+
+import openpyxl
+import pytest
+
+from utils.file_handlers import ExcelTicketStream, process_excel_to_tickets
+
+
+def _build_workbook(rows):
+    """Serialize rows (header first) into an .xlsx buffer."""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    for row in rows:
+        ws.append(row)
+    buffer = BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def workbook_bytes():
+    rows = [["User Story", "Priority", "Assignee", "Epic", "Acceptance Criteria"]]
+    for i in range(25):
+        rows.append([f"Story number {i}", "Magas", f"User {i % 3}", "Smart Meter", "AC1"])
+    rows.append(["", "Low", "", "", ""])  # empty story is filtered out
+    return _build_workbook(rows)
+
+
+class TestExcelStreaming:
+    """Test read-only streaming ingestion."""
+
+    def test_streaming_matches_full_parse(self, workbook_bytes):
+        full = process_excel_to_tickets(workbook_bytes)
+        streamed = process_excel_to_tickets(workbook_bytes, streaming=True, window=4)
+
+        assert streamed["tickets"] == full["tickets"]
+        assert streamed["total_rows"] == full["total_rows"] == 26
+        assert streamed["processed_count"] == full["processed_count"] == 25
+        assert streamed["column_indices"] == full["column_indices"]
+
+    def test_batches_are_bounded_by_window(self, workbook_bytes):
+        with ExcelTicketStream(workbook_bytes, window=10) as stream:
+            sizes = [len(batch) for batch in stream.iter_batches()]
+
+        assert max(sizes) <= 10
+        assert sum(sizes) == 25
+
+    def test_missing_story_column_raises(self):
+        buffer = _build_workbook([["Priority", "Assignee"], ["High", "John"]])
+
+        with pytest.raises(ValueError, match="User Story"):
+            ExcelTicketStream(buffer)
+
+    def test_header_only_raises(self):
+        buffer = _build_workbook([["User Story", "Priority"]])
+
+        with pytest.raises(ValueError, match="no data rows"):
+            ExcelTicketStream(buffer)
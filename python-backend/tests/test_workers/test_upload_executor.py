@@ -0,0 +1,132 @@
+"""Unit tests for the upload executor."""
+import asyncio
+from io import BytesIO
+
+import openpyxl
+import pytest
+
+from services.grounding_service import GroundingService
+from utils.file_handlers import process_excel_to_tickets
+from workers import upload_executor
+from workers.upload_executor import UploadExecutor, UploadQueueFullError
+
+
+@pytest.fixture
+def workbook_bytes():
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["User Story", "Priority", "Assignee"])
+    for i in range(53):
+        ws.append([f"As a user I want feature {i}", "High", "John Doe"])
+    buffer = BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def _summary(tickets):
+    return [(t["id"], t["_grounding"]["confidence"]) for t in tickets]
+
+
+async def _collect(shards):
+    return [shard async for shard in shards]
+
+
+class TestSharding:
+    """Test cutting one pass over the sheet into row shards."""
+
+    def test_small_sheet_is_single_shard(self, workbook_bytes):
+        executor = UploadExecutor(mode="thread", shard_rows=100, grounding_service=GroundingService())
+        try:
+            shards = asyncio.run(_collect(executor.iter_shards(workbook_bytes)))
+        finally:
+            executor.shutdown()
+
+        assert [(s["start"], s["stop"]) for s in shards] == [(0, 53)]
+
+    def test_first_shard_can_be_smaller(self, workbook_bytes):
+        executor = UploadExecutor(mode="thread", shard_rows=20, grounding_service=GroundingService())
+        try:
+            shards = asyncio.run(_collect(executor.iter_shards(workbook_bytes, first_shard_rows=5)))
+        finally:
+            executor.shutdown()
+
+        assert [(s["start"], s["stop"]) for s in shards] == [(0, 5), (5, 25), (25, 45), (45, 53)]
+        assert [t["id"] for t in shards[1]["tickets"]][:1] == ["MVM-1006"]
+
+    def test_shards_are_submitted_as_results_are_consumed(self, workbook_bytes, monkeypatch):
+        started = []
+        real_ground_rows = upload_executor.ground_rows
+
+        def counting_ground_rows(rows, start, *args):
+            started.append(start)
+            return real_ground_rows(rows, start, *args)
+
+        monkeypatch.setattr("workers.upload_executor.ground_rows", counting_ground_rows)
+        executor = UploadExecutor(mode="thread", max_workers=2, shard_rows=5, grounding_service=GroundingService())
+
+        async def consume_one():
+            shards = executor.iter_shards(workbook_bytes)
+            first = await shards.__anext__()
+            # A slow consumer: nothing more may be read meanwhile
+            await asyncio.sleep(0.05)
+            submitted = len(started)
+            await shards.aclose()
+            return first, submitted
+
+        try:
+            first, submitted = asyncio.run(consume_one())
+        finally:
+            executor.shutdown()
+
+        assert first["start"] == 0
+        assert submitted <= 2
+
+
+class TestUploadExecutor:
+    """Test pooled upload processing."""
+
+    def test_sharded_result_matches_single_pass(self, workbook_bytes):
+        grounding_service = GroundingService()
+        executor = UploadExecutor(
+            mode="thread", max_workers=3, shard_rows=10, grounding_service=grounding_service
+        )
+        try:
+            result = asyncio.run(executor.process(workbook_bytes))
+        finally:
+            executor.shutdown()
+
+        expected = process_excel_to_tickets(workbook_bytes, grounding_service)
+        assert _summary(result["tickets"]) == _summary(expected["tickets"])
+        assert result["total_rows"] == expected["total_rows"] == 53
+        assert result["processed_count"] == 53
+
+    def test_process_pool_mode(self, workbook_bytes):
+        executor = UploadExecutor(mode="process", max_workers=2, shard_rows=30)
+        try:
+            result = asyncio.run(executor.process(workbook_bytes, encode=True))
+        finally:
+            executor.shutdown()
+
+        assert len(result["lines"]) == 53
+        assert result["lines"][0].startswith('{"id": "MVM-1001"')
+
+    def test_rejects_jobs_beyond_pending_limit(self):
+        executor = UploadExecutor(mode="thread", max_pending_jobs=1)
+        executor.acquire()
+
+        with pytest.raises(UploadQueueFullError):
+            executor.acquire()
+
+        executor.release()
+        executor.acquire()
+        assert executor.get_stats()["rejectedJobs"] == 1
+
+    def test_invalid_workbook_raises_value_error(self):
+        executor = UploadExecutor(mode="thread")
+        try:
+            with pytest.raises(ValueError):
+                asyncio.run(executor.process(b"not a workbook"))
+        finally:
+            executor.shutdown()
+
+        assert executor.get_stats()["pendingJobs"] == 0
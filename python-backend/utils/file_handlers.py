@@ -2,7 +2,10 @@
 from __future__ import annotations
 
 import io
-from typing import Any, Dict, List
+from itertools import chain, islice
+from typing import Any, Dict, Iterator, List, Optional
+
+from config.settings import settings
 
 try:
     import openpyxl
@@ -55,8 +58,7 @@ def parse_excel_file(buffer: bytes) -> tuple[List[List[str]], Dict[str, int]]:
 
         rows: List[List[str]] = []
         for row in ws.iter_rows(values_only=True):
-            row_data = [str(cell or "") for cell in row]
-            rows.append(row_data)
+            rows.append(_row_to_strings(row))
 
         if not rows or len(rows) < 2:
             raise ValueError("Excel file is empty or has no data rows")
@@ -77,6 +79,137 @@ def parse_excel_file(buffer: bytes) -> tuple[List[List[str]], Dict[str, int]]:
         raise ValueError(f"Failed to parse Excel file: {str(e)}")
 
 
+def _row_to_strings(row: tuple) -> List[str]:
+    """Convert a raw openpyxl row tuple into a list of cell strings."""
+    return [str(cell or "") for cell in row]
+
+
+class ExcelTicketStream:
+    """Lazily parse an Excel workbook into grounded tickets.
+
+    The workbook is opened in openpyxl's read-only mode, so rows are pulled
+    from the sheet XML on demand instead of loading the whole sheet. At most
+    ``window`` rows are materialized at a time, which keeps peak memory
+    bounded by the window rather than by the sheet size.
+
+    The header row is read and validated on construction, so format errors
+    surface before any ticket is produced. ``total_rows`` and
+    ``processed_count`` are updated as the stream is consumed.
+
+    read_rows() hands out raw row windows instead, so one reader can parse
+    the sheet once and several workers can ground the windows in parallel.
+    (openpyxl parses a read-only sheet from the top to reach any row, so
+    opening the workbook once per row range would cost O(rows * ranges).)
+    """
+
+    def __init__(
+        self,
+        buffer: bytes,
+        grounding_service: Any = None,
+        window: Optional[int] = None,
+    ):
+        """Open workbook and validate the header row.
+
+        Args:
+            buffer: Excel file buffer
+            grounding_service: GroundingService instance for validation
+            window: Maximum rows materialized at once (defaults to settings)
+
+        Raises:
+            ValueError: If file is invalid or empty
+        """
+        if not HAS_OPENPYXL:
+            raise RuntimeError("openpyxl is not installed")
+
+        self.grounding_service = grounding_service
+        self.window = max(1, window or settings.EXCEL_STREAM_WINDOW)
+        self.ticket_counter = 1001
+        self.total_rows = 0
+        self.processed_count = 0
+        self._workbook = None
+
+        try:
+            self._workbook = openpyxl.load_workbook(
+                io.BytesIO(buffer), read_only=True, data_only=True
+            )
+            ws = self._workbook.active
+
+            # Row count from the sheet dimension; may be missing or stale
+            self.data_rows = ws.max_row - 1 if ws.max_row else None
+
+            rows = ws.iter_rows(values_only=True)
+            header = next(rows, None)
+            first_row = next(rows, None)
+            if header is None or first_row is None:
+                raise ValueError("Excel file is empty or has no data rows")
+
+            self.headers = _row_to_strings(header)
+            self.column_indices = detect_column_indices(self.headers)
+
+            if "User Story" not in self.column_indices:
+                raise ValueError(
+                    f"Missing required 'User Story' column. Found headers: {', '.join(self.headers)}"
+                )
+
+            self._rows = chain((first_row,), rows)
+
+        except Exception as e:
+            self.close()
+            raise ValueError(f"Failed to parse Excel file: {str(e)}")
+
+    def __enter__(self) -> "ExcelTicketStream":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for batch in self.iter_batches():
+            yield from batch
+
+    def iter_batches(self) -> Iterator[List[Dict[str, Any]]]:
+        """Yield grounded tickets one window of rows at a time.
+
+        Returns:
+            Iterator of ticket lists (empty rows are filtered out)
+        """
+        try:
+            while True:
+                rows = self.read_rows(self.window)
+                if not rows:
+                    break
+
+                batch = build_grounded_tickets(
+                    rows,
+                    self.total_rows,
+                    self.column_indices,
+                    self.ticket_counter,
+                    self.grounding_service,
+                )
+                self.total_rows += len(rows)
+                self.processed_count += len(batch)
+                yield batch
+        finally:
+            self.close()
+
+    def read_rows(self, limit: int) -> List[List[str]]:
+        """Read the next raw data rows without grounding them.
+
+        Args:
+            limit: Maximum rows to read
+
+        Returns:
+            Up to limit rows as cell strings (empty once the sheet is exhausted)
+        """
+        return [_row_to_strings(row) for row in islice(self._rows, limit)]
+
+    def close(self) -> None:
+        """Release the underlying read-only workbook handle."""
+        if self._workbook is not None:
+            self._workbook.close()
+            self._workbook = None
+
+
 def detect_column_indices(headers: List[str]) -> Dict[str, int]:
     """Detect column indices by keyword matching.
 
@@ -180,19 +313,129 @@ def build_ticket_from_row(
     return ticket
 
 
+def build_grounded_ticket(
+    row: List[str],
+    row_index: int,
+    column_indices: Dict[str, int],
+    ticket_counter: int,
+    grounding_service: Any = None,
+) -> Optional[Dict[str, Any]]:
+    """Build ticket from row and attach grounding metadata.
+
+    Args:
+        row: Excel row data
+        row_index: Index of data row (header excluded)
+        column_indices: Column index mapping
+        ticket_counter: Counter for ticket ID generation
+        grounding_service: GroundingService instance for validation
+
+    Returns:
+        Grounded ticket, or None if the row has no user story
+    """
+    ticket = build_ticket_from_row(row, row_index, column_indices, ticket_counter)
+
+    # Apply grounding validation if available
+    if grounding_service:
+        source_data = {"rowIndex": row_index, "originalRow": row}
+        ticket = grounding_service.enhance_with_grounding(ticket, source_data)
+    else:
+        _attach_grounding_stub(ticket)
+
+    return ticket if _has_user_story(ticket) else None
+
+
+def build_grounded_tickets(
+    rows: List[List[str]],
+    start_index: int,
+    column_indices: Dict[str, int],
+    ticket_counter: int,
+    grounding_service: Any = None,
+) -> List[Dict[str, Any]]:
+    """Build and ground a window of consecutive rows in one batch.
+
+    Uses GroundingService.enhance_tickets_with_grounding() so the window is
+    validated column-wise instead of ticket by ticket.
+
+    Args:
+        rows: Consecutive Excel data rows
+        start_index: Data row index of the first row
+        column_indices: Column index mapping
+        ticket_counter: Counter for ticket ID generation
+        grounding_service: GroundingService instance for validation
+
+    Returns:
+        Grounded tickets for rows with a user story
+    """
+    tickets = [
+        build_ticket_from_row(row, start_index + offset, column_indices, ticket_counter)
+        for offset, row in enumerate(rows)
+    ]
+
+    if grounding_service:
+        sources = [
+            {"rowIndex": start_index + offset, "originalRow": row}
+            for offset, row in enumerate(rows)
+        ]
+        tickets = grounding_service.enhance_tickets_with_grounding(tickets, sources)
+    else:
+        for ticket in tickets:
+            _attach_grounding_stub(ticket)
+
+    return [ticket for ticket in tickets if _has_user_story(ticket)]
+
+
+def _attach_grounding_stub(ticket: Dict[str, Any]) -> None:
+    """Attach minimal grounding metadata when no service is available."""
+    ticket["_grounding"] = {
+        "validated": True,
+        "confidence": 0.8,
+        "issues": [],
+        "warnings": [],
+        "timestamp": "",
+    }
+
+
+def _has_user_story(ticket: Dict[str, Any]) -> bool:
+    """Filter out tickets built from rows without a user story."""
+    return bool(ticket.get("summary", "").strip()) and ticket.get("summary") != "Untitled"
+
+
 def process_excel_to_tickets(
-    buffer: bytes, grounding_service: Any = None, monitoring_service: Any = None
+    buffer: bytes,
+    grounding_service: Any = None,
+    monitoring_service: Any = None,
+    streaming: bool = False,
+    window: Optional[int] = None,
 ) -> Dict[str, Any]:
     """Process entire Excel file to tickets with validation.
 
+    Streaming mode only bounds raw-row buffering: the sheet is read in
+    read-only mode ``window`` rows at a time, but the returned ticket list
+    still holds every ticket. Callers that need bounded memory should iterate
+    ExcelTicketStream (or its iter_batches()) directly.
+
     Args:
         buffer: Excel file buffer
         grounding_service: GroundingService instance for validation
         monitoring_service: MonitoringService instance for tracking
+        streaming: Read rows through ExcelTicketStream instead of loading the
+            full sheet into cells first
+        window: Rows materialized at once in streaming mode
 
     Returns:
         Dict with tickets and metadata
     """
+    if streaming:
+        stream = ExcelTicketStream(buffer, grounding_service, window=window)
+        tickets = list(stream)
+        return {
+            "tickets": tickets,
+            "column_indices": stream.column_indices,
+            "headers": stream.headers,
+            "total_rows": stream.total_rows,
+            "processed_count": stream.processed_count,
+        }
+
     rows, column_indices = parse_excel_file(buffer)
 
     tickets = []
@@ -200,24 +443,8 @@ def process_excel_to_tickets(
 
     # Process data rows (skip header)
     for idx, row in enumerate(rows[1:]):
-        ticket = build_ticket_from_row(row, idx, column_indices, ticket_counter)
-
-        # Apply grounding validation if available
-        if grounding_service:
-            source_data = {"rowIndex": idx, "originalRow": row}
-            ticket = grounding_service.enhance_with_grounding(ticket, source_data)
-        else:
-            # Minimal grounding stub
-            ticket["_grounding"] = {
-                "validated": True,
-                "confidence": 0.8,
-                "issues": [],
-                "warnings": [],
-                "timestamp": "",
-            }
-
-        # Filter empty tickets
-        if ticket.get("summary", "").strip() and ticket.get("summary") != "Untitled":
+        ticket = build_grounded_ticket(row, idx, column_indices, ticket_counter, grounding_service)
+        if ticket is not None:
             tickets.append(ticket)
 
     return {
@@ -0,0 +1,279 @@
+"""Executor layer for CPU-bound upload processing.
+
+Excel parsing and grounding are synchronous and CPU-heavy, so running them
+inside an ``async def`` route stalls every other request on the worker. This
+module moves that work into a configurable process (or thread) pool. Each
+sheet is parsed once by a reader thread, which hands windows of raw rows
+(shards) to the pool to be grounded in parallel; the number of uploads
+admitted at once is bounded.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+from config.settings import settings
+from utils.file_handlers import ExcelTicketStream, build_grounded_tickets
+
+
+class UploadQueueFullError(RuntimeError):
+    """Raised when the executor already holds the maximum number of upload jobs."""
+
+
+# Grounding service owned by each pool worker process (created on first shard)
+_worker_grounding_service: Any = None
+
+
+def _get_worker_grounding_service() -> Any:
+    global _worker_grounding_service
+    if _worker_grounding_service is None:
+        from services.grounding_service import GroundingService
+
+        _worker_grounding_service = GroundingService()
+    return _worker_grounding_service
+
+
+def ground_rows(
+    rows: List[List[str]],
+    start: int,
+    column_indices: Dict[str, int],
+    ticket_counter: int,
+    encode: bool = False,
+    grounding_service: Any = None,
+) -> Dict[str, Any]:
+    """Ground one shard of raw data rows.
+
+    Runs inside a pool worker; only the shard's rows are sent to it, not the
+    workbook. Tickets can be returned pre-encoded as JSON lines so that
+    serialization also stays off the event loop.
+
+    Args:
+        rows: Consecutive data rows as cell strings
+        start: Data row index of the first row
+        column_indices: Column index mapping
+        ticket_counter: Counter for ticket ID generation
+        encode: Return JSON-encoded ticket lines instead of dicts
+        grounding_service: GroundingService to use (worker-local if None)
+
+    Returns:
+        Shard result with tickets (or lines), row counts and confidence sum
+    """
+    service = grounding_service or _get_worker_grounding_service()
+    tickets = build_grounded_tickets(rows, start, column_indices, ticket_counter, service)
+
+    return {
+        "start": start,
+        "stop": start + len(rows),
+        "total_rows": len(rows),
+        "processed_count": len(tickets),
+        "confidence_sum": sum(t.get("_grounding", {}).get("confidence", 0.8) for t in tickets),
+        "lines" if encode else "tickets": (
+            [json.dumps(t, ensure_ascii=False) for t in tickets] if encode else tickets
+        ),
+    }
+
+
+class UploadExecutor:
+    """Runs Excel upload processing off the event loop in a worker pool."""
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        shard_rows: Optional[int] = None,
+        max_pending_jobs: Optional[int] = None,
+        grounding_service: Any = None,
+    ):
+        """Initialize executor (the pool itself is created lazily).
+
+        Args:
+            mode: "process" or "thread" (defaults to settings.UPLOAD_EXECUTOR_MODE)
+            max_workers: Pool size (defaults to settings, 0 means CPU count)
+            shard_rows: Data rows per shard (defaults to settings.UPLOAD_SHARD_ROWS)
+            max_pending_jobs: Uploads admitted at once before rejecting new ones
+            grounding_service: GroundingService shared with thread-mode workers
+        """
+        self.mode = mode or settings.UPLOAD_EXECUTOR_MODE
+        if self.mode not in {"process", "thread"}:
+            raise ValueError(f"Unsupported upload executor mode: {self.mode}")
+
+        self.max_workers = max_workers or settings.UPLOAD_EXECUTOR_WORKERS or os.cpu_count() or 1
+        self.shard_rows = max(1, shard_rows or settings.UPLOAD_SHARD_ROWS)
+        self.max_pending_jobs = max_pending_jobs or settings.UPLOAD_MAX_PENDING_JOBS
+        self.grounding_service = grounding_service
+
+        self._executor: Optional[Executor] = None
+        self._pending_jobs = 0
+        self._rejected_jobs = 0
+        self._completed_jobs = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="upload-worker",
+                )
+        return self._executor
+
+    async def _run(self, func: Any, *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), func, *args)
+
+    def acquire(self) -> None:
+        """Admit one upload job.
+
+        Raises:
+            UploadQueueFullError: If max_pending_jobs uploads are already running
+        """
+        if self._pending_jobs >= self.max_pending_jobs:
+            self._rejected_jobs += 1
+            raise UploadQueueFullError(
+                f"Upload queue is full ({self._pending_jobs} jobs in progress)"
+            )
+        self._pending_jobs += 1
+
+    def release(self) -> None:
+        """Release a job slot taken with acquire()."""
+        if self._pending_jobs > 0:
+            self._pending_jobs -= 1
+            self._completed_jobs += 1
+
+    async def iter_shards(
+        self,
+        buffer: bytes,
+        encode: bool = False,
+        first_shard_rows: Optional[int] = None,
+        header: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Ground the sheet shard by shard in parallel and yield results in row order.
+
+        A reader thread makes one read-only pass over the workbook and cuts
+        it into shards of shard_rows raw rows. At most max_workers shards
+        are in flight: the next one is read and submitted only after the
+        caller has consumed a result, so a slow consumer (e.g. an NDJSON
+        client) throttles parsing instead of letting results pile up.
+
+        Args:
+            buffer: Excel file buffer
+            encode: Return JSON-encoded ticket lines
+            first_shard_rows: Optional smaller size for the first shard, so
+                streaming clients get their first tickets early
+            header: Dict filled with the sheet's headers and column_indices
+                once it is opened, so callers need no separate parse
+
+        Yields:
+            Shard results ordered by start row
+
+        Raises:
+            ValueError: If file is invalid or empty
+        """
+        grounding_service = self.grounding_service if self.mode == "thread" else None
+        first_size = min(first_shard_rows or self.shard_rows, self.shard_rows)
+        loop = asyncio.get_running_loop()
+        # One thread owns the workbook, so reads and close() never overlap
+        reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="upload-reader")
+        stream: Optional[ExcelTicketStream] = None
+        pending: Deque["asyncio.Future[Dict[str, Any]]"] = deque()
+        next_start = 0
+        exhausted = False
+
+        async def submit_next() -> None:
+            nonlocal next_start, exhausted
+            size = first_size if next_start == 0 else self.shard_rows
+            rows = await loop.run_in_executor(reader, stream.read_rows, size)
+            if not rows:
+                exhausted = True
+                return
+            pending.append(asyncio.ensure_future(self._run(
+                ground_rows,
+                rows,
+                next_start,
+                stream.column_indices,
+                stream.ticket_counter,
+                encode,
+                grounding_service,
+            )))
+            next_start += len(rows)
+
+        try:
+            stream = await loop.run_in_executor(reader, ExcelTicketStream, buffer)
+            if header is not None:
+                header.update(headers=stream.headers, column_indices=stream.column_indices)
+            while True:
+                # Fill the window, but hand out the head shard as soon as it is done
+                while not exhausted and len(pending) < self.max_workers and not (pending and pending[0].done()):
+                    await submit_next()
+                if not pending:
+                    break
+                yield await pending.popleft()
+        finally:
+            for future in pending:
+                future.cancel()
+            if stream is not None:
+                reader.submit(stream.close)
+            reader.shutdown(wait=False)
+
+    async def process(self, buffer: bytes, encode: bool = False) -> Dict[str, Any]:
+        """Process a whole workbook, mirroring process_excel_to_tickets().
+
+        Args:
+            buffer: Excel file buffer
+            encode: Return JSON-encoded ticket lines instead of ticket dicts
+
+        Returns:
+            Dict with tickets (or lines), confidence sum and metadata
+
+        Raises:
+            UploadQueueFullError: If the executor is saturated
+            ValueError: If file is invalid or empty
+        """
+        self.acquire()
+        try:
+            header: Dict[str, Any] = {}
+            items: List[Any] = []
+            total_rows = 0
+            confidence_sum = 0.0
+            async for shard in self.iter_shards(buffer, encode=encode, header=header):
+                items.extend(shard["lines"] if encode else shard["tickets"])
+                total_rows += shard["total_rows"]
+                confidence_sum += shard["confidence_sum"]
+
+            return {
+                "lines" if encode else "tickets": items,
+                "column_indices": header["column_indices"],
+                "headers": header["headers"],
+                "total_rows": total_rows,
+                "processed_count": len(items),
+                "confidence_sum": confidence_sum,
+            }
+        finally:
+            self.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get executor statistics."""
+        return {
+            "mode": self.mode,
+            "maxWorkers": self.max_workers,
+            "shardRows": self.shard_rows,
+            "pendingJobs": self._pending_jobs,
+            "maxPendingJobs": self.max_pending_jobs,
+            "completedJobs": self._completed_jobs,
+            "rejectedJobs": self._rejected_jobs,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None